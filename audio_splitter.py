@@ -1,73 +1,284 @@
 import os
+import json
+import shutil
+import struct
+import subprocess
+import threading
 from pydub import AudioSegment
 from mutagen import File
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+from split_planner import SplitPlanner
+
+# Homebrewのインストール先
+FFMPEG_FALLBACK_PATH = '/opt/homebrew/bin/ffmpeg'
+FFPROBE_FALLBACK_PATH = '/opt/homebrew/bin/ffprobe'
 
 class AudioSplitter:
     MAX_DURATION_MINUTES = 55  # 余裕を持って55分に設定
 
+    # (パス, サイズ, 更新時刻) -> 長さ（秒）
+    _probe_cache: Dict[Tuple[str, int, int], float] = {}
+    _probe_lock = threading.Lock()
+
+    @staticmethod
+    def _probe_wav_header(file_path: str) -> Optional[float]:
+        """WAVのfmt/dataチャンクのヘッダーから長さ（秒）を計算"""
+        with open(file_path, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+                return None
+            byte_rate = None
+            while True:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    return None
+                chunk_id = chunk_header[:4]
+                chunk_size = struct.unpack('<I', chunk_header[4:])[0]
+                if chunk_id == b'fmt ':
+                    fmt = f.read(chunk_size)
+                    # WAVEFORMAT: フォーマット(2) チャンネル数(2) サンプルレート(4) バイトレート(4)
+                    byte_rate = struct.unpack('<I', fmt[8:12])[0]
+                    if chunk_size % 2:
+                        f.seek(1, os.SEEK_CUR)
+                elif chunk_id == b'data':
+                    if not byte_rate:
+                        return None
+                    # 書き込み途中のファイルではサイズが実際より大きいことがある
+                    data_size = min(chunk_size, os.path.getsize(file_path) - f.tell())
+                    return data_size / byte_rate
+                else:
+                    f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+    @staticmethod
+    def _probe_ffprobe(file_path: str) -> Optional[float]:
+        """ffprobeでコンテナ情報から長さ（秒）を取得"""
+        ffprobe = AudioSplitter.find_ffprobe()
+        if not ffprobe:
+            return None
+        result = subprocess.run([
+            ffprobe,
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            file_path
+        ], capture_output=True, text=True)
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            return None
+
+    @staticmethod
+    def probe_duration(file_path: str) -> float:
+        """音声ファイルの長さを秒単位で取得（サンプルはデコードしない）"""
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with AudioSplitter._probe_lock:
+            if key in AudioSplitter._probe_cache:
+                return AudioSplitter._probe_cache[key]
+
+        duration = None
+        try:
+            audio = File(file_path)
+            if audio is not None and getattr(audio.info, 'length', None):
+                duration = audio.info.length
+        except Exception:
+            pass
+
+        # mutagenで読めないWAVの派生形式や動画コンテナはヘッダーから取得
+        if duration is None:
+            try:
+                duration = AudioSplitter._probe_wav_header(file_path)
+            except (OSError, struct.error):
+                duration = None
+        if duration is None:
+            duration = AudioSplitter._probe_ffprobe(file_path)
+        if duration is None:
+            raise ValueError(f"音声の長さを取得できませんでした: {file_path}")
+
+        with AudioSplitter._probe_lock:
+            AudioSplitter._probe_cache[key] = duration
+        return duration
+
     @staticmethod
     def get_audio_duration(file_path: str) -> float:
         """音声ファイルの長さを分単位で取得（メタデータから高速に取得）"""
+        return AudioSplitter.probe_duration(file_path) / 60
+
+    @staticmethod
+    def find_ffprobe() -> Optional[str]:
+        """ffprobeの実行ファイルを探す"""
+        path = shutil.which('ffprobe')
+        if path:
+            return path
+        if os.path.exists(FFPROBE_FALLBACK_PATH):
+            return FFPROBE_FALLBACK_PATH
+        return None
+
+    @staticmethod
+    def find_ffmpeg() -> Optional[str]:
+        """ffmpegの実行ファイルを探す"""
+        path = shutil.which('ffmpeg')
+        if path:
+            return path
+        if os.path.exists(FFMPEG_FALLBACK_PATH):
+            return FFMPEG_FALLBACK_PATH
+        return None
+
+    @staticmethod
+    def plan_chunks(total_seconds: float, max_seconds: float) -> List[Tuple[float, float]]:
+        """分割位置（開始秒, 終了秒）のリストを作成"""
+        plan = []
+        start = 0.0
+        while start < total_seconds:
+            end = min(start + max_seconds, total_seconds)
+            plan.append((start, end))
+            start = end
+        return plan
+
+    @staticmethod
+    def _probe_packet_start(ffprobe: str, file_path: str, seconds: float) -> Optional[float]:
+        """入力側でその位置にシークした時に切り出しが始まる音声パケットの時刻（秒）を取得
+
+        ffmpegは指定位置以前で最も近いパケットにシークするため、その前後のパケットを読んで同じ位置を求める。
+        """
+        result = subprocess.run([
+            ffprobe,
+            '-v', 'error',
+            '-select_streams', 'a:0',
+            '-read_intervals', f'{max(seconds - 5.0, 0.0):.3f}%{seconds + 1.0:.3f}',
+            '-show_entries', 'packet=pts_time:format=start_time',
+            '-of', 'json',
+            file_path
+        ], capture_output=True, text=True)
         try:
-            audio = File(file_path)
-            if audio is None:
-                # mutagenで読めない場合はpydubにフォールバック
-                audio_segment = AudioSegment.from_file(file_path)
-                return len(audio_segment) / (1000 * 60)
-            
-            if hasattr(audio.info, 'length'):
-                return audio.info.length / 60  # 秒から分に変換
-            
-            # pydubにフォールバック
-            audio_segment = AudioSegment.from_file(file_path)
-            return len(audio_segment) / (1000 * 60)
-        except Exception as e:
-            # エラーが発生した場合はpydubにフォールバック
-            audio_segment = AudioSegment.from_file(file_path)
-            return len(audio_segment) / (1000 * 60)
+            info = json.loads(result.stdout)
+            offset = float(info.get('format', {}).get('start_time') or 0.0)
+            times = [float(packet['pts_time']) - offset for packet in info.get('packets', []) if 'pts_time' in packet]
+        except (ValueError, TypeError, KeyError):
+            return None
+        before = [t for t in times if t <= seconds + 1e-6]
+        return max(before) if before else None
 
     @staticmethod
-    def split_audio(file_path: str, output_dir: str = None) -> List[Tuple[str, float]]:
-        """音声ファイルを指定された長さで分割"""
-        if output_dir is None:
-            output_dir = os.path.dirname(file_path)
+    def _split_with_ffmpeg(ffmpeg: str, file_path: str, plan: List[Tuple[float, float]],
+                           output_dir: str) -> List[Tuple[str, float, float]]:
+        """ffmpegのストリームコピーで分割し、(パス, 開始秒, 終了秒) のリストを返す（デコード・再エンコードなし）
 
-        # 入力ファイルを読み込み
-        audio = AudioSegment.from_file(file_path)
-        total_duration = len(audio)
-        max_duration_ms = AudioSplitter.MAX_DURATION_MINUTES * 60 * 1000
+        ストリームコピーはパケット単位でしか切り出せないため、
+        ffprobeで各チャンクの実際の開始位置と長さを調べて返す。
+        """
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        ext = os.path.splitext(file_path)[1]
+        ffprobe = AudioSplitter.find_ffprobe()
 
-        # 分割が必要ない場合は元のファイルを返す
-        if total_duration <= max_duration_ms:
-            return [(file_path, total_duration / (1000 * 60))]
+        chunks = []
+        for chunk_number, (start, end) in enumerate(plan, 1):
+            chunk_path = os.path.join(output_dir, f"{base_name}_part{chunk_number}{ext}")
+            # 入力側でシークし、パケット単位で切り出す
+            subprocess.run([
+                ffmpeg,
+                '-hide_banner',
+                '-loglevel', 'error',
+                '-ss', f'{start:.3f}',
+                '-i', file_path,
+                '-t', f'{end - start:.3f}',
+                '-map', '0:a:0',  # 最初の音声ストリームのみ
+                '-c', 'copy',
+                '-y',
+                chunk_path
+            ], capture_output=True, check=True)
+
+            # 調べられない場合は指定した範囲のままとする
+            actual_start = start
+            if ffprobe and start > 0:
+                packet_start = AudioSplitter._probe_packet_start(ffprobe, file_path, start)
+                if packet_start is not None:
+                    actual_start = packet_start
+            duration = AudioSplitter._probe_ffprobe(chunk_path)
+            actual_end = actual_start + duration if duration else end
+            chunks.append((chunk_path, actual_start, actual_end))
+        return chunks
 
-        # ファイル名の生成
+    @staticmethod
+    def _split_with_pydub(file_path: str, plan: List[Tuple[float, float]],
+                          output_dir: str) -> List[Tuple[str, float, float]]:
+        """pydubでデコードして分割（ストリームコピーできない場合のフォールバック）"""
+        audio = AudioSegment.from_file(file_path)
         base_name = os.path.splitext(os.path.basename(file_path))[0]
         ext = os.path.splitext(file_path)[1]
 
-        # 分割処理
         chunks = []
-        start = 0
-        chunk_number = 1
-
-        while start < total_duration:
-            end = min(start + max_duration_ms, total_duration)
-            chunk = audio[start:end]
-            
-            # 分割ファイルの保存
+        for chunk_number, (start, end) in enumerate(plan, 1):
+            start_ms = int(start * 1000)
+            chunk = audio[start_ms:int(end * 1000)]
             chunk_path = os.path.join(output_dir, f"{base_name}_part{chunk_number}{ext}")
             chunk.export(chunk_path, format=ext.lstrip('.'))
-            
-            # 結果を記録
-            chunk_duration = len(chunk) / (1000 * 60)  # 分単位
-            chunks.append((chunk_path, chunk_duration))
-            
-            start = end
-            chunk_number += 1
+            chunks.append((chunk_path, start_ms / 1000, (start_ms + len(chunk)) / 1000))
+        return chunks
+
+    @staticmethod
+    def split_audio_ranges(file_path: str, output_dir: str = None, target_minutes: Optional[float] = None,
+                           overlap_seconds: float = 0.0) -> List[Tuple[str, float, float]]:
+        """音声ファイルを無音に近い位置で分割し、(パス, 開始秒, 終了秒) のリストを返す
+
+        overlap_seconds を指定すると、2つ目以降のチャンクは直前のチャンクの末尾と
+        その秒数だけ重なるように切り出す（境界付近の文脈を失わないため）。
+        """
+        if output_dir is None:
+            output_dir = os.path.dirname(file_path)
+
+        max_minutes = AudioSplitter.MAX_DURATION_MINUTES
+        target_minutes = min(target_minutes or max_minutes, max_minutes)
+
+        # 全体をデコードせずに長さを取得
+        total_seconds = AudioSplitter.probe_duration(file_path)
+
+        # 分割が必要ない場合は元のファイルを返す
+        if total_seconds <= target_minutes * 60:
+            return [(file_path, 0.0, total_seconds)]
+
+        # 重複区間を足してもAPIの上限を超えないようにする
+        max_seconds = max_minutes * 60 - overlap_seconds
+        target_seconds = min(target_minutes * 60, max_seconds)
+
+        ffmpeg = AudioSplitter.find_ffmpeg()
+        plan = None
+        if ffmpeg:
+            try:
+                plan = SplitPlanner.plan(ffmpeg, file_path, total_seconds, target_seconds, max_seconds)
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"Warning: 無音位置の解析に失敗したため一定間隔で分割します: {e}")
+        if not plan:
+            plan = AudioSplitter.plan_chunks(total_seconds, target_seconds)
+
+        if len(plan) == 1:
+            return [(file_path, 0.0, total_seconds)]
+
+        # 2つ目以降は開始位置を重複区間の分だけ前にずらす
+        cut_plan = [
+            (max(start - overlap_seconds, 0.0) if index else start, end)
+            for index, (start, end) in enumerate(plan)
+        ]
+
+        chunks = None
+        if ffmpeg:
+            try:
+                chunks = AudioSplitter._split_with_ffmpeg(ffmpeg, file_path, cut_plan, output_dir)
+            except subprocess.CalledProcessError as e:
+                stderr = e.stderr.decode('utf-8', errors='replace') if e.stderr else ''
+                print(f"Warning: ストリームコピーでの分割に失敗したためpydubで分割します: {stderr.strip()}")
+        if chunks is None:
+            chunks = AudioSplitter._split_with_pydub(file_path, cut_plan, output_dir)
 
         return chunks
 
+    @staticmethod
+    def split_audio(file_path: str, output_dir: str = None,
+                    target_minutes: Optional[float] = None) -> List[Tuple[str, float]]:
+        """音声ファイルを指定された長さで分割（無音に近い位置で区切る）"""
+        chunks = AudioSplitter.split_audio_ranges(file_path, output_dir, target_minutes)
+        return [(chunk_path, (end - start) / 60) for chunk_path, start, end in chunks]
+
     @staticmethod
     def cleanup_chunks(chunk_files: List[str]) -> None:
         """分割ファイルを削除"""
@@ -0,0 +1,241 @@
+"""
+文字起こし結果の一括分析（Qtを使わないコマンドライン版）
+
+フォルダやglobで指定した文字起こし結果のJSONを複数プロセスで分析し、
+ファイルごと・話者ごとの集計表をCSVまたはJSONで出力する。
+
+    python batch_analysis.py archive/ "meetings/**/*.json" -o reports --format csv --jobs 8
+"""
+import os
+import sys
+import csv
+import glob
+import json
+import fnmatch
+import argparse
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from transcript_model import Transcript
+from conversation_stats import ConversationStats
+
+# フォルダを指定した場合に分析するファイル名のパターン
+TRANSCRIPT_PATTERNS = ('*.json', '*_transcript.txt')
+
+FILE_COLUMNS = [
+    'file', 'utterances', 'speakers', 'duration_seconds', 'speech_seconds', 'overlap_seconds',
+    'overlap_ratio', 'speaker_changes', 'interruptions', 'backchannels', 'median_latency_seconds', 'error'
+]
+SPEAKER_COLUMNS = [
+    'file', 'speaker', 'utterances', 'speaking_seconds', 'speaking_share', 'characters',
+    'speech_rate_cps', 'interruptions_made', 'interruptions_received', 'backchannels_made',
+    'median_latency_seconds'
+]
+
+class BatchAnalysis:
+    """文字起こし結果の一括分析"""
+    DECIMALS = 3  # 出力する小数の桁数（実行環境によらず同じ出力にする）
+
+    @staticmethod
+    def _is_under(path: str, directory: str) -> bool:
+        """path が directory 自体またはその中にあるか（絶対パスで比較）"""
+        return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+    @staticmethod
+    def _glob_base(pattern: str) -> str:
+        """globパターンのうちワイルドカードを含まない先頭のフォルダ"""
+        parts = []
+        for part in pattern.split(os.sep):
+            if glob.has_magic(part):
+                break
+            parts.append(part)
+        return os.sep.join(parts) or '.'
+
+    @staticmethod
+    def find_files(inputs: Iterable[str], patterns: Iterable[str] = TRANSCRIPT_PATTERNS,
+                   exclude: Iterable[str] = ()) -> List[str]:
+        """フォルダ・glob・ファイルの指定から分析するファイルを集める（重複を除いてパス順）
+
+        exclude に指定したファイルとフォルダ以下は、フォルダ・globの探索から除く
+        （出力先を入力フォルダの中にしても、前回の出力を分析しないようにするため）。
+        探索を始めるフォルダ自体やその親を指定した場合は、そのフォルダは除かない。
+        """
+        patterns = tuple(patterns)
+        excluded = [os.path.abspath(path) for path in exclude]
+        is_under = BatchAnalysis._is_under
+
+        def exclusions_for(base: str) -> List[str]:
+            base = os.path.abspath(base)
+            return [item for item in excluded if not is_under(base, item)]
+
+        found = set()
+        for spec in inputs:
+            if os.path.isdir(spec):
+                active = exclusions_for(spec)
+                for root, dirs, files in os.walk(spec):
+                    dirs[:] = [
+                        name for name in dirs
+                        if not any(is_under(os.path.abspath(os.path.join(root, name)), item) for item in active)
+                    ]
+                    found.update(
+                        os.path.join(root, name) for name in files
+                        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+                        and os.path.abspath(os.path.join(root, name)) not in active
+                    )
+            elif glob.has_magic(spec):
+                active = exclusions_for(BatchAnalysis._glob_base(spec))
+                found.update(
+                    path for path in glob.glob(spec, recursive=True)
+                    if os.path.isfile(path)
+                    and not any(is_under(os.path.abspath(path), item) for item in active)
+                )
+            elif os.path.isfile(spec):
+                found.add(spec)
+            else:
+                print(f"見つかりません: {spec}", file=sys.stderr)
+        return sorted(os.path.abspath(path) for path in found)
+
+    @staticmethod
+    def _round(value: float) -> Optional[float]:
+        """小数を丸める（NaNはNone）"""
+        value = float(value)
+        return None if np.isnan(value) else round(value, BatchAnalysis.DECIMALS)
+
+    @staticmethod
+    def analyze_transcript(transcript: Transcript, name: str = '') -> Tuple[Dict, List[Dict]]:
+        """1つの文字起こし結果を分析し、(ファイルの行, 話者ごとの行) を返す"""
+        n_speakers = len(transcript.speaker_names)
+        starts, ends, speaker_ids = transcript.starts, transcript.ends, transcript.speaker_ids
+        text_lengths = np.fromiter(map(len, transcript.texts), dtype=np.int64, count=len(transcript))
+        totals, counts = ConversationStats.speaker_totals(starts, ends, speaker_ids, n_speakers)
+        characters = np.bincount(speaker_ids, weights=text_lengths, minlength=n_speakers)
+        metrics = ConversationStats.interval_metrics(starts, ends, speaker_ids, n_speakers, text_lengths)
+        transitions = ConversationStats.transition_matrix(speaker_ids, n_speakers)
+        latencies = metrics['latencies']
+        rnd = BatchAnalysis._round
+
+        file_row = {
+            'file': name,
+            'utterances': len(transcript),
+            'speakers': int(np.count_nonzero(counts)),
+            'duration_seconds': rnd(transcript.total_duration),
+            'speech_seconds': rnd(metrics['speech_seconds']),
+            'overlap_seconds': rnd(metrics['overlap_seconds']),
+            'overlap_ratio': rnd(metrics['overlap_seconds'] / metrics['speech_seconds'] if metrics['speech_seconds'] else 0.0),
+            'speaker_changes': int(transitions.sum() - np.trace(transitions)),
+            'interruptions': int(metrics['interruptions'].sum()),
+            'backchannels': int(metrics['backchannels'].sum()),
+            'median_latency_seconds': rnd(np.median(latencies)) if len(latencies) else None,
+            'error': '',
+        }
+
+        total_speaking = float(totals.sum())
+        speaker_rows = []
+        # 話者は名前順に並べる（話者IDの割り当て順に依存しない）
+        for speaker in transcript.speakers:
+            i = transcript.speaker_names.index(speaker)
+            speaker_rows.append({
+                'file': name,
+                'speaker': speaker,
+                'utterances': int(counts[i]),
+                'speaking_seconds': rnd(totals[i]),
+                'speaking_share': rnd(totals[i] / total_speaking if total_speaking else 0.0),
+                'characters': int(characters[i]),
+                'speech_rate_cps': rnd(metrics['speech_rate'][i]),
+                'interruptions_made': int(metrics['interruptions'][i].sum()),
+                'interruptions_received': int(metrics['interruptions'][:, i].sum()),
+                'backchannels_made': int(metrics['backchannels'][i].sum()),
+                'median_latency_seconds': rnd(metrics['median_latency'][i]),
+            })
+        return file_row, speaker_rows
+
+    @staticmethod
+    def analyze_file(path: str) -> Tuple[Dict, List[Dict]]:
+        """ファイルを読み込んで分析（読み込めない場合はエラーを記録した行を返す）"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                transcript = Transcript.from_json(f.read())
+        except (OSError, ValueError) as e:
+            row = {column: None for column in FILE_COLUMNS}
+            row.update(file=path, error=str(e))
+            return row, []
+        return BatchAnalysis.analyze_transcript(transcript, path)
+
+    @staticmethod
+    def run(paths: List[str], jobs: int = 1, progress: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """ファイルを並列に分析し、入力順の (ファイルの表, 話者の表) を返す"""
+        file_rows, speaker_rows = [], []
+        total = len(paths)
+
+        def collect(results):
+            for done, (file_row, rows) in enumerate(results, 1):
+                file_rows.append(file_row)
+                speaker_rows.extend(rows)
+                if progress:
+                    status = f"エラー: {file_row['error']}" if file_row['error'] else "OK"
+                    print(f"[{done}/{total}] {file_row['file']} {status}", file=sys.stderr)
+
+        if jobs <= 1 or total <= 1:
+            collect(map(BatchAnalysis.analyze_file, paths))
+        else:
+            # imap は入力順に結果を返すため、出力はプロセス数によらず同じになる
+            chunksize = max(1, min(16, total // (jobs * 4)))
+            with Pool(processes=jobs) as pool:
+                collect(pool.imap(BatchAnalysis.analyze_file, paths, chunksize=chunksize))
+        return file_rows, speaker_rows
+
+    @staticmethod
+    def write_csv(path: str, columns: List[str], rows: List[Dict]):
+        """表をCSVに出力"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, lineterminator='\n')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: '' if value is None else value for key, value in row.items()})
+
+    @staticmethod
+    def write_json(path: str, file_rows: List[Dict], speaker_rows: List[Dict]):
+        """表をJSONに出力"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'files': file_rows, 'speakers': speaker_rows}, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="文字起こし結果のJSONを一括で分析し、集計表を出力します")
+    parser.add_argument('inputs', nargs='+', help="フォルダ・globパターン・ファイル")
+    parser.add_argument('-o', '--output-dir', default='.', help="出力先のフォルダ（既定: カレントフォルダ）")
+    parser.add_argument('--format', choices=('csv', 'json'), default='csv',
+                        help="csv: files.csv と speakers.csv、json: analysis.json")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="並列に実行するプロセス数")
+    parser.add_argument('-q', '--quiet', action='store_true', help="進捗を表示しない")
+    args = parser.parse_args(argv)
+
+    # 出力先のフォルダと出力ファイルは分析の対象にしない
+    outputs = {
+        'csv': [os.path.join(args.output_dir, 'files.csv'), os.path.join(args.output_dir, 'speakers.csv')],
+        'json': [os.path.join(args.output_dir, 'analysis.json')],
+    }
+    paths = BatchAnalysis.find_files(
+        args.inputs, exclude=[args.output_dir] + outputs['csv'] + outputs['json']
+    )
+    if not paths:
+        print("分析するファイルがありません", file=sys.stderr)
+        return 1
+
+    file_rows, speaker_rows = BatchAnalysis.run(paths, jobs=args.jobs, progress=not args.quiet)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    outputs = outputs[args.format]
+    if args.format == 'csv':
+        BatchAnalysis.write_csv(outputs[0], FILE_COLUMNS, file_rows)
+        BatchAnalysis.write_csv(outputs[1], SPEAKER_COLUMNS, speaker_rows)
+    else:
+        BatchAnalysis.write_json(outputs[0], file_rows, speaker_rows)
+
+    failed = sum(1 for row in file_rows if row['error'])
+    print(f"{len(file_rows) - failed}件を分析しました（失敗 {failed}件）: {', '.join(outputs)}", file=sys.stderr)
+    return 0 if not failed else 2
+
+if __name__ == '__main__':
+    sys.exit(main())
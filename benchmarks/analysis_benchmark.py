@@ -0,0 +1,103 @@
+"""
+会話分析の集計処理のベンチマーク
+
+従来の発話ごとのループによる集計と ConversationStats の配列演算による集計の
+処理時間を比較し、結果が一致することも確認する。
+
+    python benchmarks/analysis_benchmark.py --utterances 100000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conversation_stats import ConversationStats
+
+def generate(n_utterances: int, n_speakers: int, seed: int = 0):
+    """ランダムな文字起こし結果（開始・終了時刻と話者ID）を生成"""
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1.0, n_utterances)
+    durations = rng.gamma(2.0, 3.0, n_utterances)
+    # 一部の発話は複数の時間枠にまたがる長さにする
+    long = rng.random(n_utterances) < 0.01
+    durations[long] += rng.uniform(60, 200, long.sum())
+    starts = np.cumsum(gaps + np.concatenate(([0.0], durations[:-1]))) * 0.5
+    ends = starts + durations
+    speaker_ids = rng.integers(0, n_speakers, n_utterances).astype(np.int32)
+    return starts, ends, speaker_ids
+
+def loop_timeline(starts, ends, speaker_ids, n_speakers, n_slots, slot_seconds=60.0):
+    """従来の発話ごと・時間枠ごとのループによるタイムライン集計"""
+    result = np.zeros((n_speakers, n_slots))
+    for start, end, speaker in zip(starts.tolist(), ends.tolist(), speaker_ids.tolist()):
+        start_slot = int(start // slot_seconds)
+        end_slot = max(int(np.ceil(end / slot_seconds)) - 1, start_slot)
+        if start_slot == end_slot:
+            result[speaker][start_slot] += end - start
+            continue
+        for slot in range(start_slot, end_slot + 1):
+            if slot == start_slot:
+                result[speaker][slot] += (slot + 1) * slot_seconds - start
+            elif slot == end_slot:
+                result[speaker][slot] += end - slot * slot_seconds
+            else:
+                result[speaker][slot] += slot_seconds
+    return result
+
+def loop_totals(starts, ends, speaker_ids, n_speakers):
+    """従来のループによる話者ごとの総発話時間"""
+    totals = [0.0] * n_speakers
+    for start, end, speaker in zip(starts.tolist(), ends.tolist(), speaker_ids.tolist()):
+        totals[speaker] += end - start
+    return np.array(totals)
+
+def loop_transitions(speaker_ids, n_speakers):
+    """従来のループによる話者遷移回数"""
+    matrix = [[0] * n_speakers for _ in range(n_speakers)]
+    ids = speaker_ids.tolist()
+    for current_id, next_id in zip(ids, ids[1:]):
+        matrix[current_id][next_id] += 1
+    return np.array(matrix)
+
+def measure(func, repeat: int):
+    """最短の実行時間（秒）と結果を返す"""
+    best = float('inf')
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="会話分析の集計処理のベンチマーク")
+    parser.add_argument('--utterances', type=int, default=100000, help="発話数")
+    parser.add_argument('--speakers', type=int, default=6, help="話者数")
+    parser.add_argument('--repeat', type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    starts, ends, speaker_ids = generate(args.utterances, args.speakers)
+    n_slots = ConversationStats.slot_count(float(ends.max()))
+    print(f"発話数: {args.utterances} / 話者数: {args.speakers} / 時間枠: {n_slots}（{ends.max() / 3600:.1f}時間）")
+
+    cases = [
+        ("タイムライン",
+         lambda: loop_timeline(starts, ends, speaker_ids, args.speakers, n_slots),
+         lambda: ConversationStats.timeline(starts, ends, speaker_ids, args.speakers, n_slots=n_slots)),
+        ("話者ごとの総発話時間",
+         lambda: loop_totals(starts, ends, speaker_ids, args.speakers),
+         lambda: ConversationStats.speaker_totals(starts, ends, speaker_ids, args.speakers)[0]),
+        ("話者遷移",
+         lambda: loop_transitions(speaker_ids, args.speakers),
+         lambda: ConversationStats.transition_matrix(speaker_ids, args.speakers)),
+    ]
+    for name, loop_func, vector_func in cases:
+        loop_time, expected = measure(loop_func, args.repeat)
+        vector_time, actual = measure(vector_func, args.repeat)
+        status = "一致" if np.allclose(expected, actual) else "不一致"
+        print(f"{name}: ループ {loop_time * 1000:.1f}ms / 配列演算 {vector_time * 1000:.1f}ms "
+              f"（{loop_time / max(vector_time, 1e-9):.0f}倍, 結果{status}）")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+class ConversationStats:
+    """会話分析の集計処理（発話ごとのループを使わず配列演算で計算する）"""
+    SLOT_SECONDS = 60.0  # タイムラインの時間枠の長さ（秒）
+    PYRAMID_LEVELS = (5.0, 15.0, 60.0, 300.0, 900.0)  # タイムラインの解像度（秒、最小の倍数にする）
+    MAX_VISIBLE_SLOTS = 240  # 表示範囲に並べる時間枠の上限
+    LATENCY_BIN_SECONDS = 0.25  # 応答時間のヒストグラムの幅（秒）
+    LATENCY_RANGE = (-3.0, 5.0)  # ヒストグラムに表示する応答時間の範囲（範囲外は両端にまとめる）
+
+    @staticmethod
+    def durations(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """発話ごとの長さ（終了が開始より前の発話は0秒とする）"""
+        return np.maximum(ends - starts, 0.0)
+
+    @staticmethod
+    def slot_count(total_duration: float, slot_seconds: float = SLOT_SECONDS) -> int:
+        """時間枠の数"""
+        return max(int(np.ceil(total_duration / slot_seconds)), 1)
+
+    @staticmethod
+    def timeline(starts: np.ndarray, ends: np.ndarray, speaker_ids: np.ndarray, n_speakers: int,
+                 slot_seconds: float = SLOT_SECONDS, n_slots: int = 0) -> np.ndarray:
+        """話者×時間枠ごとの発話量（秒）を計算
+
+        時間枠をまたぐ発話は、それぞれの枠に含まれる長さで正確に按分する。
+        発話の開始枠・終了枠の端数と、その間の完全に含まれる枠を分けて集計し、
+        後者は差分配列の累積和で求める。
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.maximum(np.asarray(ends, dtype=np.float64), starts)
+        if not n_slots:
+            n_slots = ConversationStats.slot_count(float(ends.max()) if len(ends) else 0.0, slot_seconds)
+        speaker_ids = np.asarray(speaker_ids, dtype=np.int64)
+        size = n_speakers * n_slots
+
+        # 開始枠と終了枠（終了時刻がちょうど枠の境界の場合は前の枠を終了枠とする）
+        start_slots = np.minimum((starts // slot_seconds).astype(np.int64), n_slots - 1)
+        end_slots = np.ceil(ends / slot_seconds).astype(np.int64) - 1
+        end_slots = np.clip(end_slots, start_slots, n_slots - 1)
+        same = start_slots == end_slots
+        row = speaker_ids * n_slots
+
+        # 1つの枠に収まる発話はその長さ、またがる発話は開始枠・終了枠の端数
+        head = np.where(same, ends - starts, (start_slots + 1) * slot_seconds - starts)
+        tail = np.where(same, 0.0, ends - end_slots * slot_seconds)
+        result = np.bincount(row + start_slots, weights=head, minlength=size)
+        result += np.bincount(row + end_slots, weights=tail, minlength=size)
+
+        # 間の枠は1枠分ずつ加算する（差分配列に開始と終了を記録して累積和を取る）
+        spans = end_slots - start_slots > 1
+        if spans.any():
+            diff = np.bincount(row[spans] + start_slots[spans] + 1, minlength=size)
+            diff -= np.bincount(row[spans] + end_slots[spans], minlength=size)
+            full = np.cumsum(diff.reshape(n_speakers, n_slots), axis=1) * slot_seconds
+            result += full.ravel()
+
+        return result.reshape(n_speakers, n_slots)
+
+    @staticmethod
+    def timeline_pyramid(starts: np.ndarray, ends: np.ndarray, speaker_ids: np.ndarray, n_speakers: int,
+                         levels: Sequence[float] = PYRAMID_LEVELS) -> Dict[float, np.ndarray]:
+        """解像度ごとの話者×時間枠の発話量（秒）を計算
+
+        発話の走査は最小の解像度で1回だけ行い、粗い解像度は隣接する時間枠を
+        まとめて合計して作る（各解像度は最小の解像度の倍数であること）。
+        """
+        base = levels[0]
+        finest = ConversationStats.timeline(starts, ends, speaker_ids, n_speakers, slot_seconds=base)
+        if n_speakers == 0 or not finest.size:
+            # 発話がない場合は時間枠のない配列を返す
+            return {level: np.zeros((n_speakers, 0)) for level in levels}
+        pyramid = {base: finest}
+        for level in levels[1:]:
+            factor = int(round(level / base))
+            padding = (-finest.shape[1]) % factor
+            padded = np.pad(finest, ((0, 0), (0, padding)))
+            pyramid[level] = padded.reshape(n_speakers, -1, factor).sum(axis=2)
+        return pyramid
+
+    @staticmethod
+    def choose_level(visible_seconds: float, levels: Sequence[float] = PYRAMID_LEVELS,
+                     max_slots: int = MAX_VISIBLE_SLOTS) -> float:
+        """表示範囲の長さに合う解像度（時間枠が上限を超えない最も細かいもの）"""
+        for level in levels:
+            if visible_seconds / level <= max_slots:
+                return level
+        return levels[-1]
+
+    @staticmethod
+    def speaker_totals(starts: np.ndarray, ends: np.ndarray, speaker_ids: np.ndarray,
+                       n_speakers: int) -> Tuple[np.ndarray, np.ndarray]:
+        """話者ごとの総発話時間（秒）と発話数"""
+        speaker_ids = np.asarray(speaker_ids, dtype=np.int64)
+        durations = ConversationStats.durations(starts, ends)
+        totals = np.bincount(speaker_ids, weights=durations, minlength=n_speakers)
+        counts = np.bincount(speaker_ids, minlength=n_speakers)
+        return totals, counts
+
+    @staticmethod
+    def transition_matrix(speaker_ids: np.ndarray, n_speakers: int) -> np.ndarray:
+        """連続する発話の話者遷移回数（行が遷移元、列が遷移先）"""
+        speaker_ids = np.asarray(speaker_ids, dtype=np.int64)
+        if len(speaker_ids) < 2:
+            return np.zeros((n_speakers, n_speakers), dtype=np.int64)
+        pairs = speaker_ids[:-1] * n_speakers + speaker_ids[1:]
+        return np.bincount(pairs, minlength=n_speakers * n_speakers).reshape(n_speakers, n_speakers)
+
+    @staticmethod
+    def interval_metrics(starts: np.ndarray, ends: np.ndarray, speaker_ids: np.ndarray, n_speakers: int,
+                         text_lengths: np.ndarray) -> Dict:
+        """発話区間の重なり・割り込み・応答時間・話速を計算
+
+        発話を開始時刻で並べ替え（O(n log n)）、各発話をそれより前に始まった発話のうち
+        最も遅く終わるもの（その時点の発言者）と比べる。発言者は終了時刻の累積最大値で
+        求めるため、並べ替え以外は配列演算1回ずつで済む。
+
+        - 割り込み: 発言者と別の話者が発言中に話し始め、発言者より後まで話した
+        - 相槌: 発言者と別の話者が発言中に話し始め、発言者より先に話し終えた
+        - 応答時間: 話者が交代した時の、前の発言の終了から次の発言の開始まで（重なりは負）
+        行列は行が話し始めた話者、列が発言中だった話者。
+        """
+        n = len(starts)
+        order = np.argsort(starts, kind='stable')
+        starts = np.asarray(starts, dtype=np.float64)[order]
+        ends = np.maximum(np.asarray(ends, dtype=np.float64)[order], starts)
+        speakers = np.asarray(speaker_ids, dtype=np.int64)[order]
+        lengths = np.asarray(text_lengths, dtype=np.float64)[order]
+        pair_size = n_speakers * n_speakers
+        low, high = ConversationStats.LATENCY_RANGE
+        edges = np.arange(low, high + ConversationStats.LATENCY_BIN_SECONDS / 2, ConversationStats.LATENCY_BIN_SECONDS)
+
+        # 話速（文字/秒）
+        durations = np.bincount(speakers, weights=ends - starts, minlength=n_speakers)
+        characters = np.bincount(speakers, weights=lengths, minlength=n_speakers)
+        speech_rate = np.divide(characters, durations, out=np.zeros(n_speakers), where=durations > 0)
+
+        # 開始(+1)・終了(-1)の時刻順の累積和で同時に話している発話数を求め、重なり時間を合計
+        # （同時刻では終了を先に数え、接しているだけの発話は重なりとしない）
+        times = np.concatenate((starts, ends))
+        deltas = np.concatenate((np.ones(n, dtype=np.int64), -np.ones(n, dtype=np.int64)))
+        event_order = np.lexsort((deltas, times))
+        times = times[event_order]
+        active = np.cumsum(deltas[event_order])[:-1]
+        segments = np.diff(times)
+        speech_seconds = float(segments[active >= 1].sum())
+        overlap_seconds = float(segments[active >= 2].sum())
+
+        # 各発話の直前までの発言者（それまでに始まった発話のうち最も遅く終わるもの）
+        running_end = np.maximum.accumulate(ends) if n else ends
+        holder = np.maximum.accumulate(np.where(ends >= running_end, np.arange(n), 0)) if n else speakers
+        previous_end = running_end[:-1]
+        previous_speaker = speakers[holder[:-1]]
+        current_start, current_end, current_speaker = starts[1:], ends[1:], speakers[1:]
+
+        change = current_speaker != previous_speaker
+        onset = change & (current_start < previous_end)
+        contained = current_end <= previous_end
+        pairs = current_speaker * n_speakers + previous_speaker
+        interruptions = np.bincount(pairs[onset & ~contained], minlength=pair_size)
+        backchannels = np.bincount(pairs[onset & contained], minlength=pair_size)
+        overlap_pairs = np.bincount(
+            pairs[onset], weights=(np.minimum(current_end, previous_end) - current_start)[onset], minlength=pair_size
+        )
+
+        # 応答時間（相槌は発言の交代ではないため除く）
+        turns = change & ~(onset & contained)
+        latencies = (current_start - previous_end)[turns]
+        responders = current_speaker[turns]
+        bins = np.clip(np.searchsorted(edges, latencies, side='right') - 1, 0, len(edges) - 2)
+        histogram = np.bincount(responders * (len(edges) - 1) + bins, minlength=n_speakers * (len(edges) - 1))
+        median_latency = np.full(n_speakers, np.nan)
+        if len(latencies):
+            # 話者ごとの中央値も並べ替え1回で求める
+            latency_order = np.lexsort((latencies, responders))
+            sorted_latencies = latencies[latency_order]
+            counts = np.bincount(responders, minlength=n_speakers)
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            has = counts > 0
+            lower = offsets[has] + (counts[has] - 1) // 2
+            upper = offsets[has] + counts[has] // 2
+            median_latency[has] = (sorted_latencies[lower] + sorted_latencies[upper]) / 2
+
+        return {
+            "speech_seconds": speech_seconds,  # 誰かが話している時間
+            "overlap_seconds": overlap_seconds,  # 2つ以上の発話が重なっている時間
+            "interruptions": interruptions.reshape(n_speakers, n_speakers),
+            "backchannels": backchannels.reshape(n_speakers, n_speakers),
+            "overlap_pairs": overlap_pairs.reshape(n_speakers, n_speakers),  # 話者の組ごとの重なり時間
+            "latencies": latencies,
+            "latency_speakers": responders,
+            "latency_edges": edges,
+            "latency_histogram": histogram.reshape(n_speakers, len(edges) - 1),
+            "median_latency": median_latency,
+            "speech_rate": speech_rate,  # 文字/秒
+        }
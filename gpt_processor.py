@@ -1,9 +1,13 @@
 import os
 import json
-from openai import OpenAI
+from typing import Iterator, List, Dict, Optional
+from openai import OpenAI, APITimeoutError
 from datetime import datetime
 
 class GPTProcessor:
+    MODEL = "gpt-4"
+    DEFAULT_TIMEOUT = 180.0  # 1回のAI処理の制限時間（秒）
+
     def __init__(self):
         # APIキーの読み込み
         try:
@@ -12,6 +16,7 @@ class GPTProcessor:
                 self.client = OpenAI(api_key=config.get('openaiApiKey'))
                 if not self.client.api_key or self.client.api_key == 'YOUR_OPENAI_API_KEY':
                     raise ValueError('OpenAI APIキーが設定されていません')
+                self.timeout = float(config.get('aiTimeoutSeconds') or self.DEFAULT_TIMEOUT)
         except Exception as e:
             raise Exception(f'設定エラー: {str(e)}')
 
@@ -36,19 +41,49 @@ class GPTProcessor:
             f.write(prompt)
         self.prompt = prompt
 
-    def process_text(self, text):
+    def _messages(self, text: str, prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """APIに送るメッセージを作成"""
+        return [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": f"{prompt or self.prompt}\n\n{text}"}
+        ]
+
+    def process_text(self, text, prompt: Optional[str] = None):
         """テキストをChatGPT APIで処理"""
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": f"{self.prompt}\n\n{text}"}
-                ]
+                model=self.MODEL,
+                messages=self._messages(text, prompt),
+                timeout=self.timeout
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            raise Exception(f'ChatGPT API エラー: {str(e)}')
+            raise Exception(self.error_message(e))
+
+    def open_stream(self, text: str, prompt: Optional[str] = None):
+        """処理結果を少しずつ受け取るストリームを開く（close() で途中で打ち切れる）
+
+        制限時間は接続と各断片の受信待ちに適用される。エラーは error_message() で表示用に変換する。
+        """
+        return self.client.chat.completions.create(
+            model=self.MODEL,
+            messages=self._messages(text, prompt),
+            stream=True,
+            timeout=self.timeout
+        )
+
+    @staticmethod
+    def stream_chunks(stream) -> Iterator[str]:
+        """ストリームから受け取ったテキストの断片を順に返す"""
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def error_message(self, error: Exception) -> str:
+        """APIのエラーを表示用のメッセージに変換"""
+        if isinstance(error, (APITimeoutError, TimeoutError)):
+            return f'ChatGPT API エラー: 応答が{self.timeout:.0f}秒以内にありませんでした'
+        return f'ChatGPT API エラー: {str(error)}'
 
     def save_result(self, original_path, text):
         """処理結果を保存"""
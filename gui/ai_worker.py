@@ -0,0 +1,77 @@
+"""
+AI処理ワーカーモジュール
+"""
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+from gpt_processor import GPTProcessor
+
+class AIProcessingWorker(QThread):
+    """1つのプロンプトでAI処理を行うワーカークラス
+
+    結果はストリームで少しずつ受け取り、途中経過を通知する。
+    中止した場合はストリームを閉じて受信を打ち切る。
+    """
+    status = pyqtSignal(str)
+    partial_result = pyqtSignal(str)  # それまでに受け取った結果
+    result_ready = pyqtSignal(str)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    PARTIAL_INTERVAL = 0.3  # 途中経過を通知する間隔（秒）
+
+    def __init__(self, processor: GPTProcessor, prompt: str, text: str):
+        super().__init__()
+        self.processor = processor
+        self.prompt = prompt
+        self.text = text
+        self._is_cancelled = False
+        self._stream = None
+
+    def cancel(self):
+        """処理を中止"""
+        self._is_cancelled = True
+        stream = self._stream
+        if stream is not None:
+            # 受信待ちの間も中止できるよう接続を閉じる
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def run(self):
+        """AI処理を実行"""
+        started = time.monotonic()
+        try:
+            self.status.emit("AI処理: 応答を待っています...")
+            self._stream = self.processor.open_stream(self.text, self.prompt)
+            if self._is_cancelled:
+                self._stream.close()
+            parts = []
+            last_report = 0.0
+            for part in self.processor.stream_chunks(self._stream):
+                if self._is_cancelled:
+                    break
+                parts.append(part)
+                elapsed = time.monotonic() - started
+                # 断片が届き続けても全体の制限時間を超えたら打ち切る
+                if elapsed > self.processor.timeout:
+                    raise TimeoutError()
+                if elapsed - last_report >= self.PARTIAL_INTERVAL:
+                    last_report = elapsed
+                    self.partial_result.emit("".join(parts))
+                    self.status.emit(f"AI処理: 受信中（{sum(map(len, parts))}文字、{elapsed:.0f}秒）")
+        except Exception as e:
+            if self._is_cancelled:
+                self.cancelled.emit()
+            else:
+                self.error.emit(self.processor.error_message(e))
+            return
+        finally:
+            if self._stream is not None:
+                self._stream.close()
+            self._stream = None
+
+        if self._is_cancelled:
+            self.cancelled.emit()
+            return
+        self.result_ready.emit("".join(parts).strip())
@@ -3,10 +3,14 @@
 """
 import os
 import json
+from collections import deque
 from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QFrame, QVBoxLayout, QPushButton, QMessageBox
 from PyQt6.QtGui import QPalette, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from moco_client import MocoVoiceClient
+from transcription_cache import TranscriptionCache
+from job_journal import JobJournal
+from transcript_library import TranscriptLibrary
 from gpt_processor import GPTProcessor
 from .widgets import (
     FilePanel,
@@ -16,13 +20,20 @@ from .widgets import (
     ResultPanel
 )
 from .widgets.log_dialog import LogDialog
+from .widgets.library_dialog import LibraryDialog
 from .transcription_worker import TranscriptionWorker
+from .ai_worker import AIProcessingWorker
 
 class TranscriptionGUI(QMainWindow):
     """文字起こしGUIクラス"""
     def __init__(self):
         super().__init__()
         self.worker = None
+        self.ai_worker = None
+        self.ai_queue = deque()  # 順番待ちのAI処理 (プロンプト, テキスト)
+        self.ai_results = []  # 続けて実行したAI処理の結果
+        self.cache = None
+        self.library = None
         self.is_dark_mode = True
         self.log_dialog = LogDialog(self)
         self.initUI()
@@ -80,6 +91,12 @@ class TranscriptionGUI(QMainWindow):
         log_button.clicked.connect(self.show_log_dialog)
         bottom_buttons.addWidget(log_button)
         
+        # ライブラリ検索ボタン
+        library_button = QPushButton("ライブラリ検索")
+        library_button.setStyleSheet(log_button.styleSheet())
+        library_button.clicked.connect(self.show_library_dialog)
+        bottom_buttons.addWidget(library_button)
+        
         # テーマ切り替えボタン
         theme_button = QPushButton("🌓")
         theme_button.setFixedSize(30, 30)
@@ -164,14 +181,19 @@ class TranscriptionGUI(QMainWindow):
         # ファイルパネルのシグナル
         self.file_panel.file_selected.connect(lambda _: self.result_panel.clear_all())
         self.file_panel.text_loaded.connect(self.on_text_loaded)
+        self.file_panel.transcript_loaded.connect(self.on_transcript_loaded)
         self.file_panel.transcription_ready.connect(self.start_transcription)
         
         # コントロールパネルのシグナル
         self.control_panel.start_clicked.connect(self.prepare_transcription)
         self.control_panel.cancel_clicked.connect(self.cancel_transcription)
         
+        # オプションパネルのシグナル
+        self.options_panel.clear_cache_clicked.connect(self.clear_cache)
+        
         # AIパネルのシグナル
         self.ai_panel.process_clicked.connect(self.process_with_ai)
+        self.ai_panel.cancel_clicked.connect(self.cancel_ai_processing)
 
     def initClients(self):
         """クライアントの初期化"""
@@ -181,7 +203,21 @@ class TranscriptionGUI(QMainWindow):
                 api_key = config.get('mocoVoiceApiKey')
                 if not api_key or api_key == 'YOUR_MOCO_VOICE_API_KEY':
                     raise ValueError('APIキーが設定されていません')
-                self.client = MocoVoiceClient(api_key)
+                self.client = MocoVoiceClient(
+                    api_key,
+                    pool_connections=config.get('httpPoolConnections'),
+                    pool_maxsize=config.get('httpPoolMaxsize')
+                )
+                max_cache_mb = config.get('cacheMaxSizeMB')
+                self.cache = TranscriptionCache(
+                    cache_dir=config.get('cacheDir'),
+                    max_size=max_cache_mb * 1024 * 1024 if max_cache_mb else None
+                )
+                self.update_cache_stats()
+                self.library = TranscriptLibrary(config.get('libraryPath') or None)
+                self.result_panel.set_chart_backend(config.get('analysisChartBackend') or 'plotly')
+                # 前回中断したジョブの確認はウィンドウ表示後に行う
+                QTimer.singleShot(0, self.check_pending_jobs)
         except Exception as e:
             self.control_panel.set_status(f'設定エラー: {str(e)}')
             self.control_panel.set_running(False)
@@ -219,7 +255,27 @@ class TranscriptionGUI(QMainWindow):
             self.control_panel.set_status(f"エラー: {str(e)}")
             self.control_panel.set_running(False)
         
-    def start_transcription(self, audio_path: str):
+    def check_pending_jobs(self):
+        """前回中断した文字起こしがあれば再開を確認"""
+        if self.worker and self.worker.isRunning():
+            return
+        for journal in JobJournal.list_pending():
+            reply = QMessageBox.question(
+                self,
+                "中断された文字起こし",
+                f"前回中断した文字起こしがあります:\n{journal.file_path}\n\n"
+                f"完了済みの部分を再利用して再開しますか？"
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self.file_panel.input_path_label.setText(journal.file_path)
+                self.control_panel.set_running(True)
+                self.result_panel.clear_all()
+                self.log_dialog.clear_log()
+                self.start_transcription(journal.file_path, journal.options)
+                return
+            journal.discard()
+
+    def start_transcription(self, audio_path: str, options: dict = None):
         """音声ファイルの準備が完了したら文字起こしを開始"""
         if not audio_path:
             self.control_panel.set_status("音声ファイルの準備に失敗しました")
@@ -227,11 +283,14 @@ class TranscriptionGUI(QMainWindow):
             return
             
         try:
-            options = self.options_panel.get_options()
-            self.worker = TranscriptionWorker(self.client, audio_path, options)
+            if options is None:
+                options = self.options_panel.get_options()
+            cache = self.cache if options.get('use_cache') else None
+            self.worker = TranscriptionWorker(self.client, audio_path, options, cache)
             self.worker.status.connect(self.control_panel.set_status)
             self.worker.debug.connect(self.log_dialog.append_log)
             self.worker.progress.connect(self.control_panel.set_progress)
+            self.worker.partial_result.connect(self.result_panel.append_partial_result)
             self.worker.finished.connect(self.on_transcription_complete)
             self.worker.error.connect(self.on_transcription_error)
             self.worker.start()
@@ -245,10 +304,42 @@ class TranscriptionGUI(QMainWindow):
             self.worker.cancel()
             self.control_panel.set_running(False)
 
+    def update_cache_stats(self):
+        """キャッシュの使用状況を表示"""
+        if self.cache:
+            stats = self.cache.stats()
+            self.options_panel.set_cache_stats(stats['entries'], stats['total_size'])
+
+    def clear_cache(self):
+        """文字起こし結果のキャッシュを削除"""
+        if not self.cache:
+            return
+        reply = QMessageBox.question(
+            self,
+            "キャッシュの削除",
+            "保存されている文字起こし結果のキャッシュを全て削除しますか？"
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.cache.clear()
+            self.update_cache_stats()
+            self.control_panel.set_status("キャッシュを削除しました")
+
     def on_transcription_complete(self, text: str):
         """文字起こし完了時の処理"""
+        self.update_cache_stats()
+        output_path = self.worker.output_path if self.worker else None
+        # 逐次統合した場合は途中結果で全ての発話が届いているため、それを結果とする
+        transcript = None if text else self.result_panel.take_partial_result()
+        if transcript is None and not text and output_path:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        if output_path:
+            self.add_to_library(output_path, transcript)
         # 文字起こし結果はJSONファイルとして保存されないため、ファイルパスはNone
-        self.result_panel.set_result(text, None)
+        if transcript is not None:
+            self.result_panel.set_transcript(transcript, None)
+        else:
+            self.result_panel.set_result(text, None)
         self.result_panel.switch_to_tab(1)  # 結果タブに切り替え
         self.control_panel.set_running(False)
 
@@ -280,8 +371,46 @@ class TranscriptionGUI(QMainWindow):
         self.result_panel.switch_to_tab(0)  # 結果タブに切り替え
         self.control_panel.set_status("テキストファイルを読み込みました")
 
+    def on_transcript_loaded(self, transcript, file_path: str):
+        """文字起こし結果のJSON読み込み時の処理（読み込み時に解析したものを共有する）"""
+        self.result_panel.set_transcript(transcript, file_path)
+        self.result_panel.switch_to_tab(0)  # 結果タブに切り替え
+        self.control_panel.set_status("テキストファイルを読み込みました")
+        self.add_to_library(file_path, transcript)
+
+    def add_to_library(self, file_path: str, transcript=None):
+        """文字起こし結果をライブラリに取り込む（変更がなければ何もしない）"""
+        if not self.library:
+            return
+        try:
+            self.library.import_file(file_path, transcript)
+        except (OSError, ValueError) as e:
+            self.log_dialog.append_log(f"ライブラリへの取り込みに失敗しました: {str(e)}")
+
+    def show_library_dialog(self):
+        """ライブラリ検索ダイアログを表示"""
+        if not self.library:
+            self.control_panel.set_status("ライブラリが初期化されていません")
+            return
+        dialog = LibraryDialog(self.library, self)
+        dialog.open_requested.connect(self.open_library_result)
+        dialog.exec()
+
+    def open_library_result(self, file_path: str, start: float):
+        """ライブラリの検索結果を該当箇所で開く"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError as e:
+            self.control_panel.set_status(f"ファイルを開けません: {str(e)}")
+            return
+        self.file_panel.input_path_label.setText(file_path)
+        self.result_panel.set_result(text, file_path)
+        self.result_panel.switch_to_tab(0)  # 結果タブに切り替え
+        self.result_panel.scroll_to_time(start)
+
     def process_with_ai(self, prompt: str):
-        """AI処理を実行"""
+        """AI処理を順番待ちに追加（処理中でなければすぐに開始）"""
         if not self.gpt_processor:
             self.control_panel.set_status("AI処理機能が初期化されていません")
             return
@@ -296,22 +425,88 @@ class TranscriptionGUI(QMainWindow):
             self.control_panel.set_status("プロンプトを入力してください")
             return
 
-        try:
-            # プロンプトを保存してからAI処理を実行
-            self.gpt_processor.save_prompt(prompt)
-            processed_text = self.gpt_processor.process_text(text)
-            
-            # 結果を表示
-            self.result_panel.set_ai_result(processed_text)
-            self.result_panel.switch_to_tab(1)  # AI処理結果タブに切り替え
-            self.control_panel.set_status("AI処理完了")
-            
-        except Exception as e:
-            error_message = f"AI処理エラー: {str(e)}"
-            self.control_panel.set_status(error_message)
-            self.log_dialog.append_log(error_message)
-            self.show_log_dialog()
+        # プロンプトを保存してから順番待ちに追加
+        self.gpt_processor.save_prompt(prompt)
+        self.ai_queue.append((prompt, text))
+        if self.ai_worker is None:
+            self.ai_results = []
+            self.result_panel.set_ai_result("*AI処理中...*")
+            self.result_panel.switch_to_tab(2)  # AI処理結果タブに切り替え
+            self.start_next_ai_processing()
+        else:
+            self.ai_panel.set_running(True, len(self.ai_queue))
+
+    def start_next_ai_processing(self):
+        """順番待ちの次のAI処理を開始"""
+        if not self.ai_queue:
+            self.ai_panel.set_running(False)
+            return
+        prompt, text = self.ai_queue.popleft()
+        self.ai_panel.set_running(True, len(self.ai_queue))
+        self.ai_worker = AIProcessingWorker(self.gpt_processor, prompt, text)
+        self.ai_worker.status.connect(self.ai_panel.set_status)
+        self.ai_worker.partial_result.connect(self.show_ai_results)
+        self.ai_worker.result_ready.connect(self.on_ai_complete)
+        self.ai_worker.error.connect(self.on_ai_error)
+        self.ai_worker.cancelled.connect(self.on_ai_cancelled)
+        self.ai_worker.start()
+
+    def cancel_ai_processing(self):
+        """実行中と順番待ちのAI処理を中止"""
+        self.ai_queue.clear()
+        if self.ai_worker:
+            self.ai_panel.set_status("AI処理を中止しています...")
+            self.ai_worker.cancel()
+
+    def _release_ai_worker(self):
+        """終了したAI処理のワーカーを破棄"""
+        self.ai_worker.wait()
+        self.ai_worker.deleteLater()
+        self.ai_worker = None
+
+    def show_ai_results(self, current: str = ""):
+        """AI処理の結果を表示（続けて実行した結果は区切り線で並べる）"""
+        results = self.ai_results + ([current] if current else [])
+        self.result_panel.set_ai_result("\n\n---\n\n".join(results))
+
+    def on_ai_complete(self, processed_text: str):
+        """AI処理完了時の処理"""
+        self._release_ai_worker()
+        self.ai_results.append(processed_text)
+        self.show_ai_results()
+        self.ai_panel.set_status("AI処理完了")
+        self.control_panel.set_status("AI処理完了")
+        self.start_next_ai_processing()
+
+    def on_ai_error(self, error_message: str):
+        """AI処理エラー時の処理"""
+        self._release_ai_worker()
+        self.show_ai_results()
+        error_message = f"AI処理エラー: {error_message}"
+        self.ai_panel.set_status(error_message)
+        self.control_panel.set_status(error_message)
+        self.log_dialog.append_log(error_message)
+        # 順番待ちの処理を止めないよう、ログはモーダルにせずに表示する
+        self.log_dialog.show()
+        self.log_dialog.raise_()
+        self.start_next_ai_processing()
+
+    def on_ai_cancelled(self):
+        """AI処理中止時の処理"""
+        self._release_ai_worker()
+        self.show_ai_results()
+        self.ai_panel.set_status("AI処理を中止しました")
+        self.start_next_ai_processing()
 
     def show_log_dialog(self):
         """ログダイアログを表示"""
         self.log_dialog.exec()
+
+    def closeEvent(self, event):
+        """ウィンドウを閉じる時に実行中のAI処理と会話分析を止め、スレッドの終了を待つ"""
+        self.ai_queue.clear()
+        if self.ai_worker:
+            self.ai_worker.cancel()
+            self.ai_worker.wait()
+        self.result_panel.cleanup()
+        super().closeEvent(event)
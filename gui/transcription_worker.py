@@ -4,33 +4,63 @@
 import os
 import json
 import time
+import tempfile
+import threading
 import traceback
-from datetime import datetime
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
-from moco_client import MocoVoiceClient, MocoVoiceError
+from moco_client import MocoVoiceClient
 from audio_splitter import AudioSplitter
-from result_merger import TranscriptionMerger
+from result_merger import TranscriptionMerger, IncrementalMerger
+from status_poller import AdaptivePollScheduler, StatusPoller
+from transcription_cache import TranscriptionCache
+from job_journal import JobJournal, CHUNK_CREATED, CHUNK_UPLOADED, CHUNK_STARTED, CHUNK_COMPLETED
+
+STATUS_MESSAGES = {
+    'PENDING': '準備中...',
+    'CONVERTING': '変換中...',
+    'IN_PROGRESS': '文字起こし中...',
+    'COMPLETED': '完了',
+    'FAILED': 'エラー',
+    'CANCELLED': 'キャンセル'
+}
 
 class TranscriptionWorker(QThread):
     """文字起こしワーカークラス"""
     status = pyqtSignal(str)
     debug = pyqtSignal(str)
     progress = pyqtSignal(int)
-    finished = pyqtSignal(str)
+    partial_result = pyqtSignal(str)  # 先頭から確定した発話（JSON配列）
+    finished = pyqtSignal(str)  # 統合した結果（途中結果で全て通知済みの場合は空文字）
     error = pyqtSignal(str)
 
-    def __init__(self, client: MocoVoiceClient, file_path: str, options: dict):
+    DEFAULT_MAX_CONCURRENT = 3  # 同時に処理するチャンク数の既定値
+
+    # 実測した処理速度をプロセス内の後続の実行でも使えるよう共有
+    _poll_scheduler = AdaptivePollScheduler()
+
+    def __init__(self, client: MocoVoiceClient, file_path: str, options: dict,
+                 cache: Optional[TranscriptionCache] = None):
         super().__init__()
         self.client = client
+        self.cache = cache
         self.file_path = file_path
         self.options = options
         self._is_cancelled = False
+        self._user_cancelled = False
         self.chunk_files: List[str] = []
+        self._progress_lock = threading.Lock()
+        self._chunk_progress: Dict[int, float] = {}
+        self._total_chunks = 1
+        self.poller = StatusPoller(client, self._poll_scheduler)
+        self.journal: Optional[JobJournal] = None
+        self.output_path: Optional[str] = None  # 結果を保存したファイルのパス
 
     def cancel(self):
         """処理をキャンセル"""
         self._is_cancelled = True
+        self._user_cancelled = True
         self.debug.emit("\n処理を中止しています...")
 
     def cleanup(self):
@@ -40,101 +70,156 @@ class TranscriptionWorker(QThread):
             AudioSplitter.cleanup_chunks(self.chunk_files)
             self.chunk_files = []
 
-    def process_chunk(self, chunk_path: str, chunk_duration: float, total_progress: int, chunk_weight: int) -> Optional[str]:
+    def _report_chunk_progress(self, index: int, fraction: float):
+        """チャンクの進捗を記録し、全チャンクを合算した進捗を通知"""
+        with self._progress_lock:
+            self._chunk_progress[index] = max(self._chunk_progress.get(index, 0.0), fraction)
+            done = sum(self._chunk_progress.values()) / self._total_chunks
+        self.progress.emit(10 + int(90 * done))
+
+    def _emit_partial(self, entries: List[Dict]):
+        """確定した発話を途中経過として通知"""
+        if entries:
+            self.partial_result.emit(json.dumps(entries, ensure_ascii=False))
+
+    def _record_chunk(self, index: int, state: str, **fields):
+        """チャンクの処理段階をジャーナルに記録"""
+        if self.journal:
+            self.journal.update_chunk(index, state, **fields)
+
+    def _make_upload_callback(self, index: int):
+        """アップロードの進捗・速度・残り時間を通知するコールバックを作成"""
+        last_report = [0.0]
+
+        def callback(sent: int, total: int, bytes_per_sec: float):
+            # アップロードはチャンク全体の進捗のうち30%として扱う
+            self._report_chunk_progress(index, 0.3 * sent / total if total else 0.3)
+
+            now = time.monotonic()
+            if sent < total and now - last_report[0] < 1.0:
+                return
+            last_report[0] = now
+            eta = (total - sent) / bytes_per_sec if bytes_per_sec > 0 else 0
+            self.debug.emit(
+                f"チャンク {index + 1} アップロード中: "
+                f"{sent / 1024 / 1024:.1f}/{total / 1024 / 1024:.1f}MB "
+                f"({bytes_per_sec / 1024 / 1024:.2f}MB/秒, 残り約{eta:.0f}秒)"
+            )
+
+        return callback
+
+    def _on_chunk_status(self, index: int, status: str):
+        """ポーラーから通知されたチャンクの状態を反映"""
+        current_status = STATUS_MESSAGES.get(status, status)
+        if self._total_chunks > 1:
+            self.status.emit(f"チャンク {index + 1}/{self._total_chunks} 状態: {current_status}")
+        else:
+            self.status.emit(f"状態: {current_status}")
+        self.debug.emit(f"チャンク {index + 1} 現在の状態: {current_status}")
+
+        if status == 'IN_PROGRESS':
+            self._report_chunk_progress(index, 0.8)
+        elif status == 'COMPLETED':
+            self._report_chunk_progress(index, 1.0)
+
+    def process_chunk(self, index: int, chunk_path: str, chunk_duration: float) -> Optional[str]:
         """1つのチャンクを処理"""
         try:
-            self.debug.emit(f"\nチャンク処理開始: {os.path.basename(chunk_path)}")
+            self.debug.emit(f"\n=== チャンク {index + 1}/{self._total_chunks} の処理を開始 ===")
+            self.debug.emit(f"チャンク処理開始: {os.path.basename(chunk_path)}")
             self.debug.emit(f"- 長さ: {chunk_duration:.1f}分")
-            
-            filename = os.path.basename(chunk_path)
-            job_data = self.client.create_transcription_job(filename, self.options)
-            self.debug.emit(f"ジョブ作成結果: {json.dumps(job_data, indent=2, ensure_ascii=False)}")
 
-            if self._is_cancelled:
-                return None
+            cache_key = None
+            if self.cache:
+                cache_key = TranscriptionCache.make_key(chunk_path, self.options)
+                cached_text = self.cache.get(cache_key)
+                if cached_text is not None:
+                    # 同じ音声・同じオプションの結果があればアップロードと文字起こしを省略
+                    self.debug.emit(f"チャンク {index + 1}: キャッシュされた結果を使用します")
+                    self._report_chunk_progress(index, 1.0)
+                    return cached_text
+            
+            record = self.journal.get_chunk(index) if self.journal else {}
+            state = record.get('state')
+            if state == CHUNK_COMPLETED:
+                journal_text = self.journal.load_result(index)
+                if journal_text is not None:
+                    # 前回の実行で完了済みの結果を再利用
+                    self.debug.emit(f"チャンク {index + 1}: 前回の実行結果を再利用します")
+                    self._report_chunk_progress(index, 1.0)
+                    return journal_text
+                state = None
+
+            if state in (CHUNK_UPLOADED, CHUNK_STARTED):
+                # 前回作成済みのジョブを引き継ぐ
+                transcription_id = record['transcription_id']
+                self.debug.emit(f"チャンク {index + 1}: 前回のジョブ {transcription_id} を再開します")
+            else:
+                filename = os.path.basename(chunk_path)
+                job_data = self.client.create_transcription_job(filename, self.options)
+                self.debug.emit(f"ジョブ作成結果: {json.dumps(job_data, indent=2, ensure_ascii=False)}")
 
-            transcription_id = job_data['transcription_id']
-            upload_url = job_data['audio_upload_url']
+                if self._is_cancelled:
+                    return None
 
-            self.status.emit("ファイルをアップロード中...")
-            self.debug.emit("音声ファイルをアップロード中...")
-            
-            upload_status = self.client.upload_audio_file(upload_url, chunk_path)
-            self.debug.emit(f"アップロード結果: ステータスコード {upload_status}")
+                transcription_id = job_data['transcription_id']
+                upload_url = job_data['audio_upload_url']
+                self._record_chunk(index, CHUNK_CREATED, transcription_id=transcription_id)
+
+                self.status.emit("ファイルをアップロード中...")
+                self.debug.emit("音声ファイルをアップロード中...")
+                
+                upload_status = self.client.upload_audio_file(
+                    upload_url,
+                    chunk_path,
+                    progress_callback=self._make_upload_callback(index)
+                )
+                self.debug.emit(f"アップロード結果: ステータスコード {upload_status}")
+                self._record_chunk(index, CHUNK_UPLOADED, transcription_id=transcription_id)
 
             if self._is_cancelled:
                 return None
 
-            self.debug.emit("書き起こしを開始...")
-            try:
+            if state != CHUNK_STARTED:
+                self.debug.emit("書き起こしを開始...")
                 self.client.start_transcription(transcription_id)
                 self.debug.emit("書き起こしリクエスト送信完了")
-            except MocoVoiceError as e:
-                self.debug.emit(f"書き起こし開始時にエラーが発生: {str(e)}")
-                self.debug.emit("5秒後に再試行します...")
-                time.sleep(5)
-                self.client.start_transcription(transcription_id)
-                self.debug.emit("書き起こしリクエスト送信完了（再試行成功）")
+                self._record_chunk(index, CHUNK_STARTED, transcription_id=transcription_id)
 
             if self._is_cancelled:
                 return None
 
             self.debug.emit("結果待機中...")
-            retry_count = 0
-            max_retries = 3
-
-            while True:
-                if self._is_cancelled:
-                    return None
-
-                try:
-                    result = self.client.get_transcription_status(transcription_id)
-                    retry_count = 0
-                except MocoVoiceError as e:
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        raise
-                    self.debug.emit(f"ステータス取得時にエラーが発生: {str(e)}")
-                    self.debug.emit(f"{retry_count}回目の再試行...")
-                    time.sleep(5)
-                    continue
-
-                status = result['status']
-
-                status_messages = {
-                    'PENDING': '準備中...',
-                    'CONVERTING': '変換中...',
-                    'IN_PROGRESS': '文字起こし中...',
-                    'COMPLETED': '完了',
-                    'FAILED': 'エラー',
-                    'CANCELLED': 'キャンセル'
-                }
-                current_status = status_messages.get(status, status)
-                self.status.emit(f"状態: {current_status}")
-                self.debug.emit(f"現在の状態: {current_status}")
-
-                if status == 'IN_PROGRESS':
-                    progress = min(total_progress + int(chunk_weight * 0.8), total_progress + chunk_weight)
-                    self.progress.emit(progress)
-
-                if status == 'COMPLETED':
-                    self.progress.emit(total_progress + chunk_weight)
-                    break
-                elif status in ['FAILED', 'CANCELLED']:
-                    raise Exception(f'Transcription {status.lower()}')
+            result = self.poller.wait(
+                transcription_id,
+                chunk_duration * 60,
+                on_status=lambda status: self._on_chunk_status(index, status),
+                is_cancelled=lambda: self._is_cancelled
+            )
+            if result is None:
+                return None
 
-                time.sleep(5)
+            status = result['status']
+            if status in ['FAILED', 'CANCELLED']:
+                raise Exception(f'Transcription {status.lower()}')
 
-            self.debug.emit("結果を取得中...")
+            self.debug.emit(f"チャンク {index + 1} の結果を取得中...")
             transcription_text = self.client.get_transcription_result(result['transcription_path'])
+            if self.cache and cache_key:
+                self.cache.put(cache_key, transcription_text, source=os.path.basename(self.file_path))
+            if self.journal:
+                self.journal.complete_chunk(index, transcription_text)
             return transcription_text
 
         except Exception as e:
-            self.debug.emit(f"チャンク処理中にエラーが発生: {str(e)}")
+            self.debug.emit(f"チャンク {index + 1} の処理中にエラーが発生: {str(e)}")
             raise
 
     def run(self):
         """文字起こし処理を実行"""
+        jsonl_path = None
+        # 接続の集計はプロセス全体の累計のため、開始時の値との差分を記録する
+        connection_stats = self.client.get_connection_stats()
         try:
             file_size = os.path.getsize(self.file_path)
             self.debug.emit(f"ファイル情報:")
@@ -150,7 +235,13 @@ class TranscriptionWorker(QThread):
 
             self.debug.emit("\nファイル分割の準備...")
             self.progress.emit(10)
-            chunks = AudioSplitter.split_audio(self.file_path)
+            # 重複区間の照合にはタイムスタンプが必要
+            overlap_seconds = self.options.get('overlap_seconds', 0) if self.options.get('timestamp') else 0
+            chunks = AudioSplitter.split_audio_ranges(
+                self.file_path,
+                target_minutes=self.options.get('chunk_minutes'),
+                overlap_seconds=overlap_seconds
+            )
             total_chunks = len(chunks)
             self.debug.emit(f"分割数: {total_chunks}")
 
@@ -159,42 +250,100 @@ class TranscriptionWorker(QThread):
                 if self.file_path in self.chunk_files:
                     self.chunk_files.remove(self.file_path)
 
-            results = []
-            total_progress = 10
-            chunk_weight = 90 // total_chunks
-
-            for i, (chunk_path, chunk_duration) in enumerate(chunks, 1):
-                if self._is_cancelled:
-                    break
+            self._total_chunks = total_chunks
+            self._chunk_progress = {}
+
+            # 異常終了しても再開できるよう各チャンクの進行状況を記録
+            self.journal = JobJournal.open(self.file_path, self.options)
+            self.journal.set_total_chunks(total_chunks)
+            completed = self.journal.count_completed()
+            if completed:
+                self.debug.emit(f"前回中断した処理を再開します（完了済み {completed}/{total_chunks} チャンク）")
+
+            max_workers = self.options.get('max_concurrent_chunks') or self.DEFAULT_MAX_CONCURRENT
+            max_workers = max(1, min(max_workers, total_chunks))
+            self.debug.emit(f"同時処理数: {max_workers}")
+
+            base_path = os.path.join(
+                os.path.dirname(self.file_path),
+                f'{os.path.splitext(os.path.basename(self.file_path))[0]}_transcript'
+            )
+            output_path = f'{base_path}.txt'
+            self.output_path = output_path
+
+            # タイムスタンプ付きの場合は完了したチャンクから逐次統合して一時的なJSONLに書き出す
+            merger = None
+            if self.options.get('timestamp'):
+                fd, jsonl_path = tempfile.mkstemp(suffix='.jsonl', prefix='transcript_')
+                os.close(fd)
+                merger = IncrementalMerger(
+                    [(start, end) for _, start, end in chunks],
+                    output_path=jsonl_path
+                )
 
-                self.debug.emit(f"\n=== チャンク {i}/{total_chunks} の処理を開始 ===")
-                result = self.process_chunk(chunk_path, chunk_duration, total_progress, chunk_weight)
-                if result:
-                    results.append(result)
-                total_progress += chunk_weight
+            # 完了順に受け取り、元の順序で並べ直す
+            chunk_results: List[Optional[str]] = [None] * total_chunks
+            has_results = False
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self.process_chunk, i, chunk_path, (end - start) / 60): i
+                    for i, (chunk_path, start, end) in enumerate(chunks)
+                }
+                try:
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        result = future.result()
+                        if not result:
+                            # 欠けたチャンクを記録し、後続のチャンクの統合を止めない
+                            if merger:
+                                self._emit_partial(merger.mark_missing(index))
+                            continue
+                        has_results = True
+                        if merger:
+                            self._emit_partial(merger.add_chunk(index, result))
+                        else:
+                            chunk_results[index] = result
+                except Exception:
+                    # 1つでも失敗したら残りのチャンクも停止させる
+                    self._is_cancelled = True
+                    for future in futures:
+                        future.cancel()
+                    if merger:
+                        merger.finish()
+                    raise
 
             if self._is_cancelled:
+                if merger:
+                    merger.finish()
                 raise Exception("処理が中止されました")
 
-            if results:
+            if has_results:
                 self.debug.emit("\n結果を統合中...")
-                if self.options.get('timestamp'):
-                    final_text = TranscriptionMerger.merge_json_results(results)
+                if merger:
+                    self._emit_partial(merger.finish())
+                    self.debug.emit("\n結果を保存...")
+                    # JSONLを1行ずつ読みながらJSON配列として保存
+                    TranscriptionMerger.jsonl_to_json(jsonl_path, output_path)
+                    # 発話は全て途中結果として通知済みのため、結果を読み戻さない
+                    final_text = ""
                 else:
                     final_text = TranscriptionMerger.merge_results(
-                        results,
+                        [result for result in chunk_results if result],
                         include_speaker=self.options.get('speaker_diarization', False)
                     )
+                    self.debug.emit("\n結果を保存...")
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        f.write(final_text)
+                self.debug.emit(f"結果を保存しました: {output_path}")
 
-                self.debug.emit("\n結果を保存...")
-                output_path = os.path.join(
-                    os.path.dirname(self.file_path),
-                    f'{os.path.splitext(os.path.basename(self.file_path))[0]}_transcript.txt'
+                stats = self.client.get_connection_stats(since=connection_stats)
+                self.debug.emit(
+                    f"HTTP接続: リクエスト {stats['requests']}件 / "
+                    f"新規接続 {stats['new_connections']}件 / 再利用 {stats['reused_connections']}件"
                 )
 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(final_text)
-                self.debug.emit(f"結果を保存しました: {output_path}")
+                self.journal.discard()
+                self.journal = None
 
                 self.progress.emit(100)
                 self.status.emit("完了")
@@ -207,4 +356,10 @@ class TranscriptionWorker(QThread):
             self.status.emit("エラーが発生しました")
         
         finally:
+            self.poller.stop()
+            if jsonl_path and os.path.exists(jsonl_path):
+                os.remove(jsonl_path)
+            # 中止した場合は再開しないため記録を破棄（エラー時は次回再開できるよう残す）
+            if self._user_cancelled and self.journal:
+                self.journal.discard()
             self.cleanup()
@@ -11,6 +11,7 @@ from PyQt6.QtCore import pyqtSignal, QTimer
 class AIPanel(QFrame):
     """AI処理パネルクラス"""
     process_clicked = pyqtSignal(str)  # 処理実行時のシグナル (プロンプト)
+    cancel_clicked = pyqtSignal()  # 中止ボタンクリック時のシグナル
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -58,11 +59,23 @@ class AIPanel(QFrame):
         
         layout.addWidget(prompt_frame)
         
-        # AI処理ボタン
-        process_button = QPushButton("AI処理実行")
-        process_button.setFont(QFont("Helvetica", 11))
-        process_button.clicked.connect(self.process_text)
-        layout.addWidget(process_button)
+        # AI処理ボタン（処理中に押した場合は順番待ちに追加）
+        button_layout = QHBoxLayout()
+        self.process_button = QPushButton("AI処理実行")
+        self.process_button.setFont(QFont("Helvetica", 11))
+        self.process_button.clicked.connect(self.process_text)
+        button_layout.addWidget(self.process_button)
+        
+        self.cancel_button = QPushButton("中止")
+        self.cancel_button.setFont(QFont("Helvetica", 11))
+        self.cancel_button.clicked.connect(self.cancel_clicked.emit)
+        self.cancel_button.setEnabled(False)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+        
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
 
     def load_prompt(self):
         """プロンプトファイルを読み込む"""
@@ -93,6 +106,15 @@ class AIPanel(QFrame):
             self.save_prompt_button.setEnabled(True)
         ))
 
+    def set_running(self, running: bool, queued: int = 0):
+        """実行状態を設定（queued: 順番待ちのプロンプト数）"""
+        self.cancel_button.setEnabled(running)
+        self.process_button.setText(f"AI処理実行（順番待ち {queued}件）" if queued else "AI処理実行")
+
+    def set_status(self, text: str):
+        """ステータスを設定"""
+        self.status_label.setText(text)
+
     def process_text(self):
         """テキスト処理を実行"""
         prompt_text = self.prompt_edit.toPlainText()
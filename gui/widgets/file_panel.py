@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QPixmap, QCursor
 from PyQt6.QtCore import Qt, pyqtSignal, QThread
 from moco_client import MIME_TYPES
+from transcript_model import Transcript
 from ..media_converter import MediaConverter
 
 class AudioRecorder(QThread):
@@ -62,6 +63,7 @@ class FilePanel(QFrame):
     """ファイル選択パネルクラス"""
     file_selected = pyqtSignal(str)  # ファイル選択時のシグナル
     text_loaded = pyqtSignal(tuple)  # テキスト読み込み時のシグナル (text, file_path)
+    transcript_loaded = pyqtSignal(object, str)  # 文字起こし結果のJSON読み込み時のシグナル (Transcript, file_path)
     transcription_ready = pyqtSignal(str)  # 文字起こし準備完了時のシグナル
 
     def __init__(self, parent=None):
@@ -222,12 +224,13 @@ class FilePanel(QFrame):
                 # ファイルの拡張子を確認
                 if file_name.lower().endswith('.json'):
                     # JSONファイルの場合は文字起こし結果として処理
-                    from .result.transcript_formatter import TranscriptFormatter
-                    formatter = TranscriptFormatter()
-                    
-                    # JSONの形式を検証
-                    if formatter.validate_transcript_json(text):
-                        self.text_loaded.emit((text, file_name))  # タプルとして送信
+                    # （検証を兼ねた解析結果をそのまま渡し、表示側では解析し直さない）
+                    try:
+                        transcript = Transcript.from_json(text)
+                    except ValueError:
+                        transcript = None
+                    if transcript is not None:
+                        self.transcript_loaded.emit(transcript, file_name)
                     else:
                         self.text_loaded.emit(("エラー: 無効なJSONファイルです。文字起こし結果のJSONファイルを選択してください。\n\n" + 
                                            "JSONファイルは以下の形式である必要があります:\n" +
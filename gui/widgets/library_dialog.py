@@ -0,0 +1,164 @@
+"""
+文字起こしライブラリの検索ダイアログモジュール
+"""
+import os
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+    QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+    QProgressBar, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+from transcript_library import TranscriptLibrary
+from .result.utils import format_time
+
+class LibraryImportWorker(QThread):
+    """フォルダ内の文字起こし結果をライブラリに取り込むスレッド"""
+    progress = pyqtSignal(int, int)  # (処理済み件数, 全件数)
+    completed = pyqtSignal(dict)  # 取り込み件数
+
+    def __init__(self, db_path: str, directory: str):
+        super().__init__()
+        self.db_path = db_path
+        self.directory = directory
+
+    def run(self):
+        """取り込みを実行"""
+        # SQLiteの接続はスレッドごとに作成する
+        library = TranscriptLibrary(self.db_path)
+        try:
+            counts = library.import_directory(
+                self.directory,
+                progress_callback=lambda done, total, _: self.progress.emit(done, total)
+            )
+        finally:
+            library.close()
+        self.completed.emit(counts)
+
+class LibraryDialog(QDialog):
+    """ライブラリ検索ダイアログクラス"""
+    open_requested = pyqtSignal(str, float)  # (文字起こし結果のパス, 開始時刻)
+
+    SEARCH_DELAY_MS = 200  # 入力が止まってから検索するまでの時間
+
+    def __init__(self, library: TranscriptLibrary, parent=None):
+        super().__init__(parent)
+        self.library = library
+        self.import_worker = None
+        self.results = []
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.search)
+        self.initUI()
+        self.update_stats()
+
+    def initUI(self):
+        """UIの初期化"""
+        self.setWindowTitle("ライブラリ検索")
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(600)
+
+        layout = QVBoxLayout(self)
+
+        # 検索欄
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("検索するフレーズ（空白区切りで絞り込み）")
+        self.search_edit.textChanged.connect(lambda _: self.search_timer.start(self.SEARCH_DELAY_MS))
+        self.search_edit.returnPressed.connect(self.search)
+        search_layout.addWidget(self.search_edit)
+
+        self.import_button = QPushButton("フォルダを取り込む")
+        self.import_button.clicked.connect(self.import_directory)
+        search_layout.addWidget(self.import_button)
+        layout.addLayout(search_layout)
+
+        # 検索結果
+        self.result_table = QTableWidget(0, 4)
+        self.result_table.setHorizontalHeaderLabels(["ファイル", "時刻", "話者", "発話"])
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_table.verticalHeader().setVisible(False)
+        header = self.result_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.result_table.cellDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.result_table)
+
+        # 状態表示
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        status_layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        status_layout.addWidget(self.progress_bar)
+        layout.addLayout(status_layout)
+
+        # 閉じるボタン
+        close_button = QPushButton("閉じる")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignRight)
+
+    def update_stats(self):
+        """取り込み済みの件数を表示"""
+        stats = self.library.stats()
+        self.status_label.setText(f"{stats['sources']}件のファイル / {stats['utterances']}件の発話")
+
+    def search(self):
+        """検索を実行"""
+        self.search_timer.stop()
+        query = self.search_edit.text().strip()
+        self.results = self.library.search(query) if query else []
+
+        self.result_table.setRowCount(len(self.results))
+        for row, result in enumerate(self.results):
+            self.result_table.setItem(row, 0, QTableWidgetItem(os.path.basename(result['path'])))
+            self.result_table.setItem(row, 1, QTableWidgetItem(format_time(result['start'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem(result['speaker']))
+            self.result_table.setItem(row, 3, QTableWidgetItem(result['text']))
+            self.result_table.item(row, 0).setToolTip(result['path'])
+
+        if query:
+            self.status_label.setText(f"{len(self.results)}件見つかりました")
+        else:
+            self.update_stats()
+
+    def open_result(self, row: int, column: int):
+        """検索結果の文字起こしを該当箇所で開く"""
+        result = self.results[row]
+        self.open_requested.emit(result['path'], result['start'])
+
+    def import_directory(self):
+        """フォルダを選択して取り込む"""
+        directory = QFileDialog.getExistingDirectory(self, "取り込むフォルダを選択")
+        if not directory:
+            return
+
+        self.import_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.status_label.setText("取り込み中...")
+
+        self.import_worker = LibraryImportWorker(self.library.db_path, directory)
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.completed.connect(self.on_import_finished)
+        self.import_worker.start()
+
+    def on_import_progress(self, done: int, total: int):
+        """取り込みの進捗を表示"""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def on_import_finished(self, counts: dict):
+        """取り込み完了時の処理"""
+        self.import_button.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.update_stats()
+        self.status_label.setText(
+            f"{self.status_label.text()}（追加・更新 {counts['imported']}件 / "
+            f"変更なし {counts['skipped']}件 / 対象外 {counts['ignored']}件 / 失敗 {counts['failed']}件 / "
+            f"削除 {counts['removed']}件）"
+        )
+        if self.search_edit.text().strip():
+            self.search()
@@ -1,10 +1,13 @@
 """
 オプションパネルモジュール
 """
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QCheckBox
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, QSpinBox, QPushButton
+from PyQt6.QtCore import pyqtSignal
 
 class OptionsPanel(QFrame):
     """オプションパネルクラス"""
+    clear_cache_clicked = pyqtSignal()  # キャッシュ削除ボタンクリック時のシグナル
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.initUI()
@@ -25,11 +28,63 @@ class OptionsPanel(QFrame):
         layout.addWidget(self.speaker_checkbox)
         layout.addWidget(self.timestamp_checkbox)
         layout.addWidget(self.punctuation_checkbox)
+        
+        # 分割したチャンクを同時に処理する数
+        concurrency_layout = QHBoxLayout()
+        concurrency_layout.addWidget(QLabel("同時処理数"))
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setRange(1, 8)
+        self.concurrency_spinbox.setValue(3)
+        concurrency_layout.addWidget(self.concurrency_spinbox)
+        concurrency_layout.addStretch()
+        layout.addLayout(concurrency_layout)
+        
+        # 分割するチャンクの目標の長さ（短いほど並列度が上がる）
+        chunk_layout = QHBoxLayout()
+        chunk_layout.addWidget(QLabel("分割の長さ（分）"))
+        self.chunk_spinbox = QSpinBox()
+        self.chunk_spinbox.setRange(1, 55)
+        self.chunk_spinbox.setValue(55)
+        chunk_layout.addWidget(self.chunk_spinbox)
+        chunk_layout.addStretch()
+        layout.addLayout(chunk_layout)
+        
+        # 隣接するチャンクを重ねる長さ（境界での欠落を防ぐ）
+        overlap_layout = QHBoxLayout()
+        overlap_layout.addWidget(QLabel("重複区間（秒）"))
+        self.overlap_spinbox = QSpinBox()
+        self.overlap_spinbox.setRange(0, 30)
+        self.overlap_spinbox.setValue(0)
+        overlap_layout.addWidget(self.overlap_spinbox)
+        overlap_layout.addStretch()
+        layout.addLayout(overlap_layout)
+        
+        # 文字起こし結果のキャッシュ
+        self.cache_checkbox = QCheckBox("キャッシュを使用")
+        self.cache_checkbox.setChecked(True)  # デフォルトでオン
+        layout.addWidget(self.cache_checkbox)
+        
+        cache_layout = QHBoxLayout()
+        self.cache_label = QLabel()
+        cache_layout.addWidget(self.cache_label)
+        cache_layout.addStretch()
+        clear_cache_button = QPushButton("キャッシュを削除")
+        clear_cache_button.clicked.connect(self.clear_cache_clicked.emit)
+        cache_layout.addWidget(clear_cache_button)
+        layout.addLayout(cache_layout)
 
     def get_options(self) -> dict:
         """オプション設定を取得"""
         return {
             'speaker_diarization': self.speaker_checkbox.isChecked(),
             'timestamp': self.timestamp_checkbox.isChecked(),
-            'punctuation': self.punctuation_checkbox.isChecked()
+            'punctuation': self.punctuation_checkbox.isChecked(),
+            'max_concurrent_chunks': self.concurrency_spinbox.value(),
+            'chunk_minutes': self.chunk_spinbox.value(),
+            'overlap_seconds': self.overlap_spinbox.value(),
+            'use_cache': self.cache_checkbox.isChecked()
         }
+
+    def set_cache_stats(self, entries: int, total_size: int):
+        """キャッシュの使用状況を表示"""
+        self.cache_label.setText(f"キャッシュ: {entries}件 / {total_size / 1024 / 1024:.1f}MB")
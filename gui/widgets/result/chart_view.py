@@ -0,0 +1,134 @@
+"""
+会話分析のグラフ表示を担当するモジュール
+"""
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+import plotly
+import plotly.graph_objects as go
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtCore import QUrl
+
+# plotlyパッケージに同梱されているplotly.js（ネットワークに接続できない環境でも使える）
+PLOTLY_JS_DIR = os.path.join(os.path.dirname(plotly.__file__), 'package_data')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="plotly.min.js"></script>
+<style>
+    body {{ margin: 0; font-family: "Noto Sans JP", sans-serif; background-color: white; }}
+    .row {{ display: flex; gap: 20px; }}
+    .cell {{ flex: 1; min-width: 400px; }}
+    .title {{ font-size: 16px; font-weight: bold; margin: 10px 0; }}
+    .chart {{ height: 300px; }}
+</style>
+</head>
+<body>
+{sections}
+<script>
+var pyramids = {{}};
+function setFigure(id, figure, pyramid) {{
+    pyramids[id] = pyramid || null;
+    Plotly.react(id, figure.data, figure.layout, {{responsive: true}}).then(function(div) {{
+        if (pyramid && !div.pyramidBound) {{
+            div.on('plotly_relayout', function() {{ updateLevel(id); }});
+            div.pyramidBound = true;
+        }}
+    }});
+}}
+// 表示範囲に合わせて、あらかじめ計算した解像度のデータに差し替える
+function updateLevel(id) {{
+    var pyramid = pyramids[id];
+    if (!pyramid) return;
+    var div = document.getElementById(id);
+    var range = div.layout.xaxis.range;
+    var visible = (range[1] - range[0]) * 60;
+    var index = pyramid.levels.length - 1;
+    for (var i = 0; i < pyramid.levels.length; i++) {{
+        if (visible / pyramid.levels[i] <= pyramid.maxSlots) {{ index = i; break; }}
+    }}
+    var level = pyramid.levels[index];
+    if (level === pyramid.current) return;
+    pyramid.current = level;
+    var series = pyramid.data[index];
+    var x = series[0].map(function(_, slot) {{ return slot * level / 60; }});
+    Plotly.update(id,
+        {{x: series.map(function() {{ return x; }}), y: series}},
+        {{'xaxis.title.text': pyramid.titles[index]}});
+}}
+function clearFigure(id) {{
+    pyramids[id] = null;
+    Plotly.purge(id);
+    document.getElementById(id).pyramidBound = false;
+}}
+</script>
+</body>
+</html>
+"""
+
+class PlotlyChartView(QWebEngineView):
+    """複数のplotlyグラフを1つのページに表示するビュー
+
+    ページとplotly.jsの読み込みは最初の1回だけ行い、以降はグラフのJSONだけを
+    ページに渡して Plotly.react で描き直す。
+    """
+
+    def __init__(self, rows: List[List[Tuple[str, str]]], parent=None):
+        """rows: 行ごとに (グラフID, 見出し) を並べたリスト"""
+        super().__init__(parent)
+        self.chart_ids = [chart_id for row in rows for chart_id, _ in row]
+        self.loaded = False
+        self.pending: Dict[str, str] = {}  # ページの読み込み前に設定されたグラフ
+        self.loadFinished.connect(self.on_load_finished)
+        self.setHtml(self._build_page(rows), QUrl.fromLocalFile(PLOTLY_JS_DIR + os.sep))
+
+    @staticmethod
+    def _build_page(rows: List[List[Tuple[str, str]]]) -> str:
+        """グラフの配置を含むページを作成"""
+        sections = []
+        for row in rows:
+            cells = "".join(
+                f'<div class="cell"><div class="title">{title}</div>'
+                f'<div id="{chart_id}" class="chart"></div></div>'
+                for chart_id, title in row
+            )
+            sections.append(f'<div class="row">{cells}</div>')
+        return PAGE_TEMPLATE.format(sections="\n".join(sections))
+
+    def on_load_finished(self, ok: bool):
+        """ページの読み込み完了時に、保留していたグラフを表示"""
+        self.loaded = ok
+        if not ok:
+            print("分析グラフのページを読み込めませんでした")
+            return
+        pending, self.pending = self.pending, {}
+        for chart_id, script in pending.items():
+            self.page().runJavaScript(script)
+
+    def _run(self, chart_id: str, script: str):
+        """スクリプトを実行（ページの読み込み前なら保留）"""
+        if self.loaded:
+            self.page().runJavaScript(script)
+        else:
+            self.pending[chart_id] = script
+
+    @staticmethod
+    def serialize(figure: go.Figure, pyramid: Optional[Dict] = None) -> Tuple[str, str]:
+        """グラフと解像度ごとのデータをページに渡すJSONに変換（GUIスレッド以外でも実行できる）"""
+        pyramid_json = json.dumps(pyramid, ensure_ascii=False) if pyramid else "null"
+        return figure.to_json(), pyramid_json
+
+    def set_figure(self, chart_id: str, figure: go.Figure, pyramid: Optional[Dict] = None):
+        """グラフを表示（pyramidを渡すと、拡大・縮小に合わせて解像度を切り替える）"""
+        self.set_figure_json(chart_id, *self.serialize(figure, pyramid))
+
+    def set_figure_json(self, chart_id: str, figure_json: str, pyramid_json: str = "null"):
+        """JSONに変換済みのグラフを表示"""
+        self._run(chart_id, f"setFigure('{chart_id}', {figure_json}, {pyramid_json});")
+
+    def clear(self):
+        """全てのグラフを消去"""
+        for chart_id in self.chart_ids:
+            self._run(chart_id, f"clearFigure('{chart_id}');")
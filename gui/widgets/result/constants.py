@@ -18,59 +18,35 @@ FONT_SETTINGS = {
     }
 }
 
-# HTMLスタイル設定
-HTML_STYLES = {
-    "body": """
-        font-family: -apple-system, BlinkMacSystemFont, Helvetica, sans-serif;
-        line-height: 1.6;
-        padding: 20px;
-        max-width: 800px;
-        margin: 0 auto;
-        background-color: #1e1e1e;
-        color: #e0e0e0;
-    """,
-    "speaker": """
-        margin-top: 20px;
-        font-size: 1.1em;
-        font-weight: 600;
-        padding: 4px 8px;
-        border-radius: 4px;
-        display: inline-block;
-        margin-bottom: 2px;
-        background-color: rgba(255, 255, 255, 0.1);
-        color: #e0e0e0;
-    """,
-    "content": """
-        margin: 0 0 12px 20px;
-        padding: 8px 12px;
-        background-color: #2d2d2d;
-        border-radius: 6px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.2);
-        position: relative;
-    """,
-    "timestamp": """
-        color: #888888;
-        font-size: 0.7em;
-        font-family: ui-monospace, Menlo, monospace;
-        display: inline-block;
-        margin-bottom: 6px;
-        opacity: 0.7;
-        background-color: rgba(0, 0, 0, 0.2);
-        padding: 1px 3px;
-        border-radius: 2px;
-        letter-spacing: -0.3px;
-    """,
-    "text": """
-        font-size: 1em;
-        line-height: 1.5;
-        color: #e0e0e0;
-        display: block;
-        word-wrap: break-word;
-    """
+# 表示モードのリスト描画設定
+VIEWER_COLORS = {
+    "background": "#1e1e1e",
+    "card": "#2d2d2d",
+    "selected": "#3a4a5c",
+    "text": "#e0e0e0",
+    "timestamp": "#888888"
 }
 
-# JSONバリデーション設定
-REQUIRED_KEYS = {"start", "end", "text"}
+VIEWER_METRICS = {
+    "speaker_height": 28,  # 話者名の行の高さ
+    "speaker_gap": 12,  # 話者名の上の余白
+    "card_indent": 20,  # 発話カードの左の字下げ
+    "card_padding": 10,  # 発話カード内の余白
+    "card_spacing": 8,  # 発話カード間の余白
+    "timestamp_height": 16  # タイムスタンプの行の高さ
+}
+
+# 会話分析グラフ（Qtで描画する場合）の配色
+CHART_COLORS = {
+    "background": "#ffffff",
+    "grid": "#d3d3d3",
+    "axis": "#444444",
+    "text": "#333333",
+    "edge": "#808080",
+    "node_border": "#808080",
+    "legend_background": "#ccffffff",
+    "heatmap": "#2171b5"
+}
 
 # ファイル保存設定
 FILE_FILTERS = {
@@ -1,77 +1,179 @@
 """
 会話分析モジュール
 """
-import json
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from plotly.colors import qualitative
-from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QScrollArea
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
+
+from transcript_model import Transcript
+from conversation_stats import ConversationStats
+from .chart_view import PlotlyChartView
+from .utils import format_level
+from .native_charts import (
+    NativeChartView, StackedAreaChart, BarChart, TransitionGraph, MatrixChart, HistogramChart, to_qcolor
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 
 class ConversationAnalyzer:
     """会話分析クラス"""
     
     def __init__(self):
         self.speakers = []
-        self.utterances = []
+        self.transcript = Transcript()
         self.total_duration = 0
         self.color_map = {}  # 話者ごとの色を保持
+        self.speaker_order = np.empty(0, dtype=np.int64)  # self.speakers の順に並べた話者ID
+        self.pyramid: Dict[float, np.ndarray] = {}  # 解像度ごとの話者×時間枠の発話量
+        self.metrics: Dict = {}  # 重なり・割り込み・応答時間・話速（話者は self.speakers の順）
         
-    def load_transcript(self, json_text: str):
+    def load_transcript(self, transcript: Transcript):
         """文字起こし結果を読み込む"""
-        data = json.loads(json_text)
-        self.utterances = data
+        self.transcript = transcript
         
         # 話者リストを作成
-        speakers = set()
-        max_end = 0
-        for utterance in data:
-            speakers.add(utterance["speaker"])
-            max_end = max(max_end, utterance["end"])
-            
-        self.speakers = sorted(list(speakers))
-        self.total_duration = max_end
+        self.speakers = transcript.speakers
+        self.total_duration = transcript.total_duration
+        speaker_ids = {name: i for i, name in enumerate(transcript.speaker_names)}
+        self.speaker_order = np.array([speaker_ids[speaker] for speaker in self.speakers], dtype=np.int64)
+        
+        # タイムラインは全ての解像度をここで1回だけ計算し、拡大・縮小時はこれを使う
+        pyramid = ConversationStats.timeline_pyramid(
+            transcript.starts, transcript.ends, transcript.speaker_ids, len(transcript.speaker_names)
+        )
+        self.pyramid = {level: bins[self.speaker_order] for level, bins in pyramid.items()}
+        
+        # 発話区間の指標も1回の走査でまとめて計算する
+        self.metrics = self._compute_metrics(transcript)
         
         # 話者ごとの色を設定
         colors = qualitative.Set3  # 12色のカラーパレット
         for i, speaker in enumerate(self.speakers):
             self.color_map[speaker] = colors[i % len(colors)]
         
-    def create_timeline_graph(self) -> go.Figure:
-        """発話量の時間変化グラフを作成"""
-        # 時間軸の分割数（1分ごと）
-        time_slots = int(np.ceil(self.total_duration / 60))
+    def _compute_metrics(self, transcript: Transcript) -> Dict:
+        """発話区間の指標を計算し、話者の並びを self.speakers の順にそろえる"""
+        text_lengths = np.fromiter(map(len, transcript.texts), dtype=np.int64, count=len(transcript))
+        metrics = ConversationStats.interval_metrics(
+            transcript.starts, transcript.ends, transcript.speaker_ids, len(transcript.speaker_names), text_lengths
+        )
+        order = self.speaker_order
+        positions = np.full(len(transcript.speaker_names), -1, dtype=np.int64)
+        positions[order] = np.arange(len(order))
+        for key in ("interruptions", "backchannels", "overlap_pairs"):
+            metrics[key] = metrics[key][np.ix_(order, order)]
+        for key in ("latency_histogram", "median_latency", "speech_rate"):
+            metrics[key] = metrics[key][order]
+        metrics["latency_speakers"] = positions[metrics["latency_speakers"]]
+        return metrics
         
-        # 話者ごとの発話量を計算
-        speaker_data = {speaker: np.zeros(time_slots) for speaker in self.speakers}
+    def metrics_summary(self) -> str:
+        """発話区間の指標の概要"""
+        metrics = self.metrics
+        ratio = metrics["overlap_seconds"] / metrics["speech_seconds"] * 100 if metrics["speech_seconds"] else 0.0
+        summary = (
+            f"重複発話: {metrics['overlap_seconds']:.1f}秒（発話時間の{ratio:.1f}%） / "
+            f"割り込み: {int(metrics['interruptions'].sum())}回 / 相槌: {int(metrics['backchannels'].sum())}回"
+        )
+        if len(metrics["latencies"]):
+            summary += f" / 応答時間の中央値: {float(np.median(metrics['latencies'])):.2f}秒"
+        return summary
         
-        for utterance in self.utterances:
-            speaker = utterance["speaker"]
-            start_slot = int(utterance["start"] / 60)
-            end_slot = int(utterance["end"] / 60)
-            duration = utterance["end"] - utterance["start"]
-            
-            if start_slot == end_slot:
-                speaker_data[speaker][start_slot] += duration
-            else:
-                # 発話が複数の時間枠にまたがる場合
-                for slot in range(start_slot, end_slot + 1):
-                    if slot == start_slot:
-                        speaker_data[speaker][slot] += (60 - (utterance["start"] % 60))
-                    elif slot == end_slot:
-                        speaker_data[speaker][slot] += (utterance["end"] % 60)
-                    else:
-                        speaker_data[speaker][slot] += 60
+    def latency_bin_centers(self) -> np.ndarray:
+        """応答時間のヒストグラムの各区間の中央（秒）"""
+        edges = self.metrics["latency_edges"]
+        return (edges[:-1] + edges[1:]) / 2
         
-        # グラフを作成
+    def timeline_level(self) -> float:
+        """全体を表示する時のタイムラインの解像度（秒）"""
+        return ConversationStats.choose_level(self.total_duration)
+        
+    def timeline_data(self, level: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """話者ごとの時間枠ごとの発話量（秒）"""
+        bins = self.pyramid[level or self.timeline_level()]
+        return dict(zip(self.speakers, bins))
+        
+    def timeline_x(self, level: float) -> np.ndarray:
+        """時間枠の開始時刻（分）"""
+        return np.arange(self.pyramid[level].shape[1]) * (level / 60)
+        
+    def timeline_axis_title(self, level: float) -> str:
+        """タイムラインの横軸の見出し"""
+        return f"時間（分） / {format_level(level)}ごと"
+        
+    def timeline_pyramid_data(self, max_slots: int = 20000) -> Dict:
+        """グラフの拡大・縮小時に解像度を切り替えるための全解像度のデータ
+
+        時間枠が多すぎる細かい解像度は、ページに渡すデータ量を抑えるため含めない。
+        """
+        levels = [level for level, bins in self.pyramid.items() if bins.shape[1] <= max_slots]
+        if not levels:
+            levels = [max(self.pyramid)]
+        return {
+            "levels": levels,
+            "titles": [self.timeline_axis_title(level) for level in levels],
+            "maxSlots": ConversationStats.MAX_VISIBLE_SLOTS,
+            "current": self.timeline_level(),
+            "data": [np.round(self.pyramid[level], 2).tolist() for level in levels],
+        }
+        
+    def total_speech_data(self) -> Dict[str, float]:
+        """話者ごとの総発話量（秒）"""
+        transcript = self.transcript
+        totals, _ = ConversationStats.speaker_totals(
+            transcript.starts, transcript.ends, transcript.speaker_ids, len(transcript.speaker_names)
+        )
+        return dict(zip(self.speakers, totals[self.speaker_order].tolist()))
+        
+    def transition_data(self) -> Dict[str, Dict[str, int]]:
+        """話者間の遷移回数（遷移元 → 遷移先 → 回数）"""
+        matrix = ConversationStats.transition_matrix(
+            self.transcript.speaker_ids, len(self.transcript.speaker_names)
+        )
+        matrix = matrix[np.ix_(self.speaker_order, self.speaker_order)].tolist()
+        return {s1: dict(zip(self.speakers, row)) for s1, row in zip(self.speakers, matrix)}
+        
+    def node_positions(self) -> Dict[str, Tuple[float, float]]:
+        """ターンテイクグラフのノードの位置（円形に配置、話者数に応じて半径を調整）"""
+        n_speakers = len(self.speakers)
+        radius = 1.0 + (n_speakers - 4) * 0.1 if n_speakers > 4 else 1.0
+        angles = np.linspace(0, 2*np.pi, n_speakers, endpoint=False)
+        return {speaker: (radius * np.cos(angle), radius * np.sin(angle)) 
+                for speaker, angle in zip(self.speakers, angles)}
+        
+    @staticmethod
+    def edge_curve(s1_pos: Tuple[float, float], s2_pos: Tuple[float, float],
+                   points: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """ターンテイクグラフのエッジの座標列"""
+        # 自己ループの場合は円弧を描画
+        if s1_pos == s2_pos:
+            t = np.linspace(0, 2*np.pi, points)
+            r = 0.2
+            center_x = s1_pos[0] + r
+            center_y = s1_pos[1]
+            return center_x + r * np.cos(t), center_y + r * np.sin(t)
+        
+        # 異なるノード間は制御点を使用して曲線を描画
+        t = np.linspace(0, 1, points)
+        control_scale = 0.3
+        dx = s2_pos[0] - s1_pos[0]
+        dy = s2_pos[1] - s1_pos[1]
+        control_x = (s1_pos[0] + s2_pos[0])/2 - dy * control_scale
+        control_y = (s1_pos[1] + s2_pos[1])/2 + dx * control_scale
+        x = (1-t)**2 * s1_pos[0] + 2*(1-t)*t * control_x + t**2 * s2_pos[0]
+        y = (1-t)**2 * s1_pos[1] + 2*(1-t)*t * control_y + t**2 * s2_pos[1]
+        return x, y
+        
+    def create_timeline_graph(self) -> go.Figure:
+        """発話量の時間変化グラフを作成"""
+        level = self.timeline_level()
+        speaker_data = self.timeline_data(level)
+        
+        # グラフを作成（横軸は各時間枠の開始時刻）
         fig = go.Figure()
-        x = list(range(time_slots))
+        x = self.timeline_x(level)
         
         # 積み上げ面グラフを作成
         for speaker in self.speakers:
@@ -83,7 +185,7 @@ class ConversationAnalyzer:
                 mode='lines',
                 line=dict(width=0.5),
                 fillcolor=self.color_map[speaker],
-                hovertemplate="時間: %{x}分<br>" +
+                hovertemplate="時間: %{x:.2f}分<br>" +
                             f"話者: {speaker}<br>" +
                             "発話量: %{y:.1f}秒<extra></extra>"
             ))
@@ -92,7 +194,7 @@ class ConversationAnalyzer:
         fig.update_layout(
             margin=dict(t=20, b=20, l=20, r=20),
             xaxis=dict(
-                title="時間（分）",
+                title=self.timeline_axis_title(level),
                 gridcolor='lightgray',
                 title_font=dict(family="Noto Sans JP")
             ),
@@ -117,11 +219,7 @@ class ConversationAnalyzer:
         
     def create_total_speech_graph(self) -> go.Figure:
         """話者ごとの総発話量グラフを作成"""
-        # 話者ごとの総発話量を計算
-        total_speech = {speaker: 0 for speaker in self.speakers}
-        for utterance in self.utterances:
-            duration = utterance["end"] - utterance["start"]
-            total_speech[utterance["speaker"]] += duration
+        total_speech = self.total_speech_data()
             
         # グラフを作成
         fig = go.Figure()
@@ -156,20 +254,8 @@ class ConversationAnalyzer:
         
     def create_turn_taking_graph(self) -> go.Figure:
         """ターンテイクグラフを作成"""
-        # 話者間の遷移回数を計算
-        transitions = {s1: {s2: 0 for s2 in self.speakers} for s1 in self.speakers}
-        
-        for i in range(len(self.utterances) - 1):
-            current_speaker = self.utterances[i]["speaker"]
-            next_speaker = self.utterances[i + 1]["speaker"]
-            transitions[current_speaker][next_speaker] += 1
-            
-        # ノードの位置を計算（円形に配置、話者数に応じて半径を調整）
-        n_speakers = len(self.speakers)
-        radius = 1.0 + (n_speakers - 4) * 0.1 if n_speakers > 4 else 1.0
-        angles = np.linspace(0, 2*np.pi, n_speakers, endpoint=False)
-        pos = {speaker: (radius * np.cos(angle), radius * np.sin(angle)) 
-               for speaker, angle in zip(self.speakers, angles)}
+        transitions = self.transition_data()
+        pos = self.node_positions()
         
         # エッジの最大値を計算
         max_transitions = max(max(row.values()) for row in transitions.values())
@@ -185,24 +271,7 @@ class ConversationAnalyzer:
                     width = (transitions[s1][s2] / max_transitions) * 5
                     opacity = 0.3 + (transitions[s1][s2] / max_transitions) * 0.7
                     
-                    # 自己ループの場合は円弧を描画
-                    if s1 == s2:
-                        t = np.linspace(0, 2*np.pi, 100)
-                        r = 0.2
-                        center_x = s1_pos[0] + r
-                        center_y = s1_pos[1]
-                        x = center_x + r * np.cos(t)
-                        y = center_y + r * np.sin(t)
-                    else:
-                        # 異なるノード間は制御点を使用して曲線を描画
-                        t = np.linspace(0, 1, 100)
-                        control_scale = 0.3
-                        dx = s2_pos[0] - s1_pos[0]
-                        dy = s2_pos[1] - s1_pos[1]
-                        control_x = (s1_pos[0] + s2_pos[0])/2 - dy * control_scale
-                        control_y = (s1_pos[1] + s2_pos[1])/2 + dx * control_scale
-                        x = (1-t)**2 * s1_pos[0] + 2*(1-t)*t * control_x + t**2 * s2_pos[0]
-                        y = (1-t)**2 * s1_pos[1] + 2*(1-t)*t * control_y + t**2 * s2_pos[1]
+                    x, y = self.edge_curve(s1_pos, s2_pos)
                     
                     fig.add_trace(go.Scatter(
                         x=x,
@@ -261,78 +330,370 @@ class ConversationAnalyzer:
         
         return fig
 
+    def create_interruption_graph(self) -> go.Figure:
+        """話者間の割り込み回数のヒートマップを作成"""
+        interruptions = self.metrics["interruptions"]
+        backchannels = self.metrics["backchannels"]
+        overlaps = self.metrics["overlap_pairs"]
+        customdata = np.dstack((backchannels, overlaps))
+        
+        fig = go.Figure(go.Heatmap(
+            z=interruptions,
+            x=list(self.speakers),
+            y=list(self.speakers),
+            text=interruptions,
+            texttemplate="%{text}",
+            customdata=customdata,
+            colorscale="Blues",
+            showscale=False,
+            hovertemplate="%{y} → %{x}<br>割り込み: %{z}回<br>相槌: %{customdata[0]}回<br>"
+                          "重なり: %{customdata[1]:.1f}秒<extra></extra>"
+        ))
+        
+        # レイアウトを設定
+        fig.update_layout(
+            margin=dict(t=20, b=20, l=20, r=20),
+            xaxis=dict(
+                title="割り込まれた話者",
+                title_font=dict(family="Noto Sans JP")
+            ),
+            yaxis=dict(
+                title="割り込んだ話者",
+                autorange="reversed",
+                title_font=dict(family="Noto Sans JP")
+            ),
+            plot_bgcolor='white'
+        )
+        
+        return fig
+        
+    def create_latency_graph(self) -> go.Figure:
+        """話者交代時の応答時間の分布グラフを作成"""
+        centers = self.latency_bin_centers()
+        histogram = self.metrics["latency_histogram"]
+        median = self.metrics["median_latency"]
+        
+        fig = go.Figure()
+        for i, speaker in enumerate(self.speakers):
+            median_text = f"{median[i]:.2f}秒" if not np.isnan(median[i]) else "-"
+            fig.add_trace(go.Bar(
+                x=centers,
+                y=histogram[i],
+                name=speaker,
+                marker_color=self.color_map[speaker],
+                hovertemplate="応答時間: %{x:.2f}秒<br>" +
+                            f"話者: {speaker}（中央値 {median_text}）<br>" +
+                            "回数: %{y}回<extra></extra>"
+            ))
+        
+        # レイアウトを設定
+        fig.update_layout(
+            margin=dict(t=20, b=20, l=20, r=20),
+            barmode='stack',
+            bargap=0.05,
+            xaxis=dict(
+                title="応答までの時間（秒、負の値は重なり）",
+                gridcolor='lightgray',
+                title_font=dict(family="Noto Sans JP")
+            ),
+            yaxis=dict(
+                title="回数",
+                gridcolor='lightgray',
+                title_font=dict(family="Noto Sans JP")
+            ),
+            plot_bgcolor='white',
+            showlegend=True
+        )
+        
+        return fig
+        
+    def create_speech_rate_graph(self) -> go.Figure:
+        """話者ごとの話速グラフを作成"""
+        speech_rate = self.metrics["speech_rate"]
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=list(self.speakers),
+            y=speech_rate,
+            text=[f"{rate:.1f}文字/秒" for rate in speech_rate.tolist()],
+            textposition='auto',
+            marker_color=[self.color_map[speaker] for speaker in self.speakers],
+            hovertemplate="話者: %{x}<br>話速: %{y:.2f}文字/秒<extra></extra>"
+        ))
+        
+        # レイアウトを設定
+        fig.update_layout(
+            margin=dict(t=20, b=20, l=20, r=20),
+            xaxis=dict(
+                title="話者",
+                gridcolor='lightgray',
+                title_font=dict(family="Noto Sans JP")
+            ),
+            yaxis=dict(
+                title="話速（文字/秒）",
+                gridcolor='lightgray',
+                title_font=dict(family="Noto Sans JP")
+            ),
+            plot_bgcolor='white',
+            showlegend=False
+        )
+        
+        return fig
+
+class AnalysisWorker(QThread):
+    """会話分析とグラフの作成を行うスレッド
+
+    GUIスレッドでの編集と競合しないよう、文字起こし結果の複製を分析する。
+    """
+    result_ready = pyqtSignal(object)  # 分析結果（analyzer, figures, transcript, version, backend）
+    error = pyqtSignal(str)
+
+    # plotlyで表示するグラフ（グラフID → 作成するメソッド）
+    PLOTLY_FIGURES = {
+        "timeline": ConversationAnalyzer.create_timeline_graph,
+        "total_speech": ConversationAnalyzer.create_total_speech_graph,
+        "turn_taking": ConversationAnalyzer.create_turn_taking_graph,
+        "speech_rate": ConversationAnalyzer.create_speech_rate_graph,
+        "interruptions": ConversationAnalyzer.create_interruption_graph,
+        "response_latency": ConversationAnalyzer.create_latency_graph,
+    }
+
+    def __init__(self, transcript: Transcript, backend: str):
+        super().__init__()
+        self.transcript = transcript
+        self.version = transcript.version
+        self.snapshot = transcript.copy()
+        self.backend = backend
+
+    def run(self):
+        """分析を実行"""
+        try:
+            analyzer = ConversationAnalyzer()
+            analyzer.load_transcript(self.snapshot)
+            figures = {}
+            if self.backend == "plotly":
+                # グラフのJSONへの変換もここで行い、GUIスレッドではページに渡すだけにする
+                for chart_id, create in self.PLOTLY_FIGURES.items():
+                    pyramid = analyzer.timeline_pyramid_data() if chart_id == "timeline" else None
+                    figures[chart_id] = PlotlyChartView.serialize(create(analyzer), pyramid)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.result_ready.emit({
+            "analyzer": analyzer,
+            "figures": figures,
+            "transcript": self.transcript,
+            "version": self.version,
+            "backend": self.backend,
+        })
+
 class ConversationAnalysisWidget(QWidget):
     """会話分析ウィジェット"""
     
+    BACKENDS = ("plotly", "native")  # plotly: WebEngineで表示、native: Qtで直接描画
+    
+    # グラフの配置（行ごとに (グラフID, 見出し)）
+    CHART_ROWS = [
+        [("timeline", "発話量の時間変化")],
+        [("total_speech", "話者ごとの総発話量"), ("turn_taking", "発話の遷移パターン")],
+        [("speech_rate", "話者ごとの話速"), ("interruptions", "話者間の割り込み")],
+        [("response_latency", "話者交代時の応答時間")],
+    ]
+    
+    # Qtで直接描画する場合のグラフの種類
+    NATIVE_CHART_TYPES = {
+        "timeline": StackedAreaChart,
+        "total_speech": BarChart,
+        "turn_taking": TransitionGraph,
+        "speech_rate": BarChart,
+        "interruptions": MatrixChart,
+        "response_latency": HistogramChart,
+    }
+    
+    UPDATE_DELAY_MS = 300  # 編集が止まってから分析するまでの時間
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.analyzer = ConversationAnalyzer()
+        self.backend = "plotly"
+        self.chart_view = None  # 最初に表示する時に作成する
+        self.transcript: Optional[Transcript] = None  # 分析する文字起こし結果
+        self.analyzed: Tuple[Optional[Transcript], int] = (None, 0)  # 表示中の分析の (文字起こし結果, 版)
+        self.active = False  # 分析タブが表示されているか
+        self.worker: Optional[AnalysisWorker] = None
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self.start_analysis)
         self.initUI()
         
     def initUI(self):
         """UIの初期化"""
         layout = QVBoxLayout(self)
-        layout.setSpacing(20)
+        layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
         
-        # タイムライングラフ
-        timeline_container = QWidget()
-        timeline_layout = QVBoxLayout(timeline_container)
-        timeline_label = QLabel("発話量の時間変化")
-        timeline_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px 0;")
-        timeline_layout.addWidget(timeline_label)
-        self.timeline_view = QWebEngineView()
-        self.timeline_view.setMinimumHeight(300)
-        timeline_layout.addWidget(self.timeline_view)
-        layout.addWidget(timeline_container)
-        
-        # 下部のグラフを横に並べる
-        bottom_container = QWidget()
-        bottom_layout = QHBoxLayout(bottom_container)
-        
-        # 総発話量グラフ
-        speech_container = QWidget()
-        speech_layout = QVBoxLayout(speech_container)
-        speech_label = QLabel("話者ごとの総発話量")
-        speech_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px 0;")
-        speech_layout.addWidget(speech_label)
-        self.total_speech_view = QWebEngineView()
-        self.total_speech_view.setMinimumHeight(300)
-        self.total_speech_view.setMinimumWidth(400)
-        speech_layout.addWidget(self.total_speech_view)
-        bottom_layout.addWidget(speech_container)
-        
-        # ターンテイクグラフ
-        turn_container = QWidget()
-        turn_layout = QVBoxLayout(turn_container)
-        turn_label = QLabel("発話の遷移パターン")
-        turn_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px 0;")
-        turn_layout.addWidget(turn_label)
-        self.turn_taking_view = QWebEngineView()
-        self.turn_taking_view.setMinimumHeight(300)
-        self.turn_taking_view.setMinimumWidth(400)
-        turn_layout.addWidget(self.turn_taking_view)
-        bottom_layout.addWidget(turn_container)
-        
-        layout.addWidget(bottom_container)
-        
-    def update_analysis(self, json_text: str):
-        """分析結果を更新"""
-        try:
-            # 新しい分析を実行
-            self.analyzer.load_transcript(json_text)
+        # 重なり・割り込み・応答時間の概要
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("font-size: 14px; margin: 10px;")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setVisible(False)
+        layout.addWidget(self.summary_label)
+        
+    def show_status(self, message: str):
+        """分析の状態やエラーを概要の欄に表示"""
+        self.summary_label.setText(message)
+        self.summary_label.setVisible(True)
+        
+    def set_backend(self, backend: str):
+        """グラフの表示方法を設定"""
+        if backend not in self.BACKENDS:
+            self.show_status(f"不明なグラフの表示方法です: {backend}")
+            return
+        if backend == self.backend:
+            return
+        self.backend = backend
+        if self.chart_view is not None:
+            # 作成済みのビューは作り直し、表示中の内容は次に分析タブを表示した時に描画する
+            self.layout().removeWidget(self.chart_view)
+            self.chart_view.deleteLater()
+            self.chart_view = None
+            self.analyzed = (None, 0)
+            self.schedule_update(0)
             
-            # タイムライングラフ
-            timeline_fig = self.analyzer.create_timeline_graph()
-            self.timeline_view.setHtml(timeline_fig.to_html(include_plotlyjs='cdn'))
+    def _ensure_chart_view(self):
+        """グラフのビューを作成"""
+        if self.chart_view is not None:
+            return
+        if self.backend == "native":
+            self.chart_view = NativeChartView(self.CHART_ROWS, self.NATIVE_CHART_TYPES)
+        else:
+            # 全てのグラフを1つのページに表示（plotly.jsの読み込みは1回だけ）
+            self.chart_view = PlotlyChartView(self.CHART_ROWS)
+            self.chart_view.setMinimumHeight(360 * len(self.CHART_ROWS))
+        self.chart_view.setMinimumWidth(840)
+        self.layout().addWidget(self.chart_view)
+        
+    def set_transcript(self, transcript: Optional[Transcript]):
+        """分析する文字起こし結果を設定（分析は分析タブが表示されている時だけ行う）"""
+        self.transcript = transcript
+        self.schedule_update(self.UPDATE_DELAY_MS)
+        
+    def set_active(self, active: bool):
+        """分析タブの表示・非表示を設定"""
+        self.active = active
+        if active:
+            self.schedule_update(0)
+        else:
+            self.update_timer.stop()
             
-            # 総発話量グラフ
-            total_speech_fig = self.analyzer.create_total_speech_graph()
-            self.total_speech_view.setHtml(total_speech_fig.to_html(include_plotlyjs='cdn'))
+    def is_up_to_date(self) -> bool:
+        """表示中の分析が現在の文字起こし結果のものか"""
+        transcript, version = self.analyzed
+        return transcript is self.transcript and (transcript is None or transcript.version == version)
+        
+    def schedule_update(self, delay_ms: int):
+        """分析を予約（続けて予約された場合は最後の予約から delay_ms 後に1回だけ分析する）"""
+        if self.active and not self.is_up_to_date():
+            self.update_timer.start(delay_ms)
             
-            # ターンテイクグラフ
-            turn_taking_fig = self.analyzer.create_turn_taking_graph()
-            self.turn_taking_view.setHtml(turn_taking_fig.to_html(include_plotlyjs='cdn'))
+    def start_analysis(self):
+        """別スレッドで分析を開始"""
+        if self.is_up_to_date():
+            return
+        if self.worker is not None:
+            # 実行中の分析が終わった時に改めて予約する
+            return
+        transcript = self.transcript
+        if transcript is None or len(transcript) == 0:
+            self.analyzed = (transcript, transcript.version if transcript is not None else 0)
+            self.summary_label.setVisible(False)
+            if self.chart_view is not None:
+                self.chart_view.clear()
+            return
+        self.show_status("分析中...")
+        self.worker = AnalysisWorker(transcript, self.backend)
+        self.worker.result_ready.connect(self.on_analysis_finished)
+        self.worker.error.connect(self.on_analysis_error)
+        self.worker.start()
+        
+    def on_analysis_finished(self, result: Dict):
+        """分析の完了時に結果を表示"""
+        self._release_worker()
+        # 分析中に別の文字起こし結果に切り替わった場合や表示方法が変わった場合は表示しない
+        if result["transcript"] is self.transcript and result["backend"] == self.backend:
+            self.analyzed = (result["transcript"], result["version"])
+            self.analyzer = result["analyzer"]
+            self._show_result(result["figures"])
+        # 分析中に編集された場合は改めて分析する
+        self.schedule_update(self.UPDATE_DELAY_MS)
+        
+    def on_analysis_error(self, message: str):
+        """分析エラー時の処理"""
+        worker = self.worker
+        self._release_worker()
+        self.show_status(f"分析エラー: {message}")
+        # 同じ内容で分析を繰り返さないよう、分析済みとして扱う
+        self.analyzed = (worker.transcript, worker.version)
+        self.schedule_update(self.UPDATE_DELAY_MS)
+        
+    def _release_worker(self):
+        """終了したスレッドを破棄"""
+        # run() から戻るのを待ってから参照を外す
+        self.worker.wait()
+        self.worker.deleteLater()
+        self.worker = None
+        
+    def _show_result(self, figures: Dict[str, Tuple[str, str]]):
+        """分析結果をグラフに表示"""
+        self.summary_label.setText(self.analyzer.metrics_summary())
+        self.summary_label.setVisible(True)
+        self._ensure_chart_view()
+        if self.backend == "native":
+            self._show_native()
+        else:
+            # 作成済みのグラフのJSONをページに渡して描き直す
+            for chart_id, (figure_json, pyramid_json) in figures.items():
+                self.chart_view.set_figure_json(chart_id, figure_json, pyramid_json)
+                
+    def cleanup(self):
+        """終了処理"""
+        self.update_timer.stop()
+        if self.worker is not None:
+            self.worker.wait()
             
-        except Exception as e:
-            print(f"分析エラー: {str(e)}")
+    def _show_native(self):
+        """Qtで直接描画するグラフにデータを設定"""
+        analyzer = self.analyzer
+        speakers = analyzer.speakers
+        colors = {speaker: to_qcolor(analyzer.color_map[speaker]) for speaker in speakers}
+        charts = self.chart_view.charts
+        
+        charts["timeline"].set_data([(speaker, colors[speaker]) for speaker in speakers], analyzer.pyramid)
+        
+        total_speech = analyzer.total_speech_data()
+        charts["total_speech"].set_data(
+            speakers, [colors[speaker] for speaker in speakers], [total_speech[speaker] for speaker in speakers]
+        )
+        
+        transitions = analyzer.transition_data()
+        pos = analyzer.node_positions()
+        edges = [
+            (s1, s2, transitions[s1][s2], *analyzer.edge_curve(pos[s1], pos[s2]))
+            for s1 in speakers for s2 in speakers if transitions[s1][s2] > 0
+        ]
+        charts["turn_taking"].set_data([(speaker, colors[speaker], pos[speaker]) for speaker in speakers], edges)
+        
+        metrics = analyzer.metrics
+        charts["speech_rate"].set_data(
+            speakers, [colors[speaker] for speaker in speakers], metrics["speech_rate"].tolist(),
+            value_name="話速", unit="文字/秒"
+        )
+        charts["interruptions"].set_data(speakers, metrics["interruptions"], [
+            ("相槌", metrics["backchannels"], "{:d}回"),
+            ("重なり", metrics["overlap_pairs"], "{:.1f}秒"),
+        ])
+        charts["response_latency"].set_data(
+            [(speaker, colors[speaker]) for speaker in speakers],
+            metrics["latency_edges"], metrics["latency_histogram"],
+            "応答までの時間（秒、負の値は重なり）"
+        )
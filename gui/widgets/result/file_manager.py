@@ -1,11 +1,10 @@
 """
 文字起こし結果のファイル操作を担当するモジュール
 """
-import json
-import os
 from typing import Optional, Tuple
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QWidget
 
+from transcript_model import Transcript
 from .constants import FILE_FILTERS
 
 class TranscriptFileManager:
@@ -15,7 +14,7 @@ class TranscriptFileManager:
         self.parent = parent
         self.current_file = None
         
-    def save_transcript(self, text: str, file_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+    def save_transcript(self, transcript: Transcript, file_path: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """文字起こし結果を保存"""
         try:
             # 保存先を取得
@@ -29,24 +28,13 @@ class TranscriptFileManager:
                 if not file_path:
                     return False, None
             
-            # JSONとしてパース（検証）
-            data = json.loads(text)
-            
             # ファイルに保存
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write(transcript.to_json())
                 
             self.current_file = file_path
             return True, file_path
             
-        except json.JSONDecodeError as e:
-            QMessageBox.warning(
-                self.parent,
-                "保存エラー",
-                f"無効なJSONフォーマットです:\n{str(e)}"
-            )
-            return False, None
-            
         except Exception as e:
             QMessageBox.warning(
                 self.parent,
@@ -55,7 +43,7 @@ class TranscriptFileManager:
             )
             return False, None
             
-    def load_transcript(self) -> Tuple[bool, Optional[str], Optional[str]]:
+    def load_transcript(self) -> Tuple[bool, Optional[Transcript], Optional[str]]:
         """文字起こし結果を読み込み"""
         try:
             # ファイルを選択
@@ -73,13 +61,12 @@ class TranscriptFileManager:
                 text = f.read()
                 
             # JSONとしてパース（検証）
-            data = json.loads(text)
-            formatted_text = json.dumps(data, ensure_ascii=False, indent=2)
+            transcript = Transcript.from_json(text)
             
             self.current_file = file_path
-            return True, formatted_text, file_path
+            return True, transcript, file_path
             
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             QMessageBox.warning(
                 self.parent,
                 "読み込みエラー",
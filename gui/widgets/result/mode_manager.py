@@ -1,66 +1,181 @@
 """
 表示/編集モードの管理を担当するモジュール
 """
+import json
+from typing import List, Optional
 from PyQt6.QtWidgets import QStackedWidget, QPushButton
 from PyQt6.QtCore import pyqtSignal
+from transcript_model import Transcript
 from .transcript_viewer import TranscriptViewWidget
 from .transcript_editor import TranscriptEditWidget
+from .utterance_table import UtteranceTableView
 
 class TranscriptModeManager(QStackedWidget):
-    """表示/編集モードの管理クラス"""
-    
+    """表示/編集モードの管理クラス
+
+    編集モードでは通常は発話単位の表で編集し、JSONを直接編集するモードは
+    明示的に選んだ場合だけ使う。JSONのテキストはそのモードに入る時に初めて作成する。
+    """
+
     # シグナル定義
     content_changed = pyqtSignal()
-    
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.transcript: Optional[Transcript] = None
+        self.raw_json_mode = False  # JSONを直接編集するか
+        self.editor_loaded = False  # JSONエディタの内容が現在の文字起こし結果と一致しているか
         self.setup_widgets()
-        
+
     def setup_widgets(self):
         """ウィジェットの初期化"""
-        # 編集モード
+        # 編集モード（表形式）
+        self.table = UtteranceTableView()
+        self.table.table_model.rows_edited.connect(self.on_rows_edited)
+        self.addWidget(self.table)
+
+        # 編集モード（JSON）
         self.editor = TranscriptEditWidget()
-        self.editor.textChanged.connect(self.content_changed.emit)
+        self.editor.textChanged.connect(self.on_editor_changed)
         self.addWidget(self.editor)
-        
+
         # 表示モード
         self.viewer = TranscriptViewWidget()
         self.addWidget(self.viewer)
-        
+
     def set_mode_button(self, button: QPushButton):
         """モード切り替えボタンを設定"""
         self.mode_button = button
         self.mode_button.clicked.connect(self.toggle_mode)
-        
+
+    def set_transcript(self, transcript: Transcript):
+        """文字起こし結果を設定"""
+        self.transcript = transcript
+
+        # JSONエディタの内容は必要になるまで作成しない
+        self.editor_loaded = False
+        self.table.set_transcript(transcript)
+        self.viewer.set_transcript(transcript)
+        self.show_viewer()
+
+    def show_partial(self, transcript: Transcript):
+        """文字起こし中の途中結果を表示（表示モードの時だけ更新し、編集中の内容には触れない）"""
+        if self.currentWidget() is self.viewer:
+            self.viewer.set_transcript(transcript)
+
     def set_content(self, text: str):
-        """内容を設定"""
+        """文字起こし結果のJSON以外の内容を設定"""
+        self.transcript = None
+
         # 編集モードのテキストを設定
-        self.editor.setPlainText(text)
-        
-        # 表示モードのHTMLを設定
+        self.editor.set_text(text)
+        self.editor_loaded = True
+
+        # 表示モードのテキストを設定
         self.viewer.set_html(text)
-        
-        # 表示モードに切り替え
+        self.show_viewer()
+
+    def show_viewer(self):
+        """表示モードに切り替え"""
         self.mode_button.setChecked(False)
         self.mode_button.setText("編集モード")
         self.setCurrentWidget(self.viewer)
-        
+
+    def show_editor(self):
+        """編集モードの画面を表示"""
+        if self.transcript is None or self.raw_json_mode:
+            if not self.editor_loaded:
+                self.editor.set_text(self.transcript.to_json())
+                self.editor_loaded = True
+            self.setCurrentWidget(self.editor)
+        else:
+            self.setCurrentWidget(self.table)
+
+    def set_raw_json_mode(self, enabled: bool):
+        """JSONを直接編集するモードを切り替え（JSONが不正で戻せない場合はValueError）"""
+        if enabled == self.raw_json_mode:
+            return
+        if not enabled and self.currentWidget() is self.editor and self.transcript is not None:
+            # 表形式に戻る前にJSONの編集内容を反映
+            if self.editor.document().isModified():
+                self._sync_from_editor()
+        self.raw_json_mode = enabled
+        if self.currentWidget() in (self.table, self.editor):
+            self.show_editor()
+
+    def on_rows_edited(self, rows: List[int]):
+        """表形式で発話が編集された時の処理"""
+        # JSONエディタの内容は次に開くときに作り直す
+        self.editor_loaded = False
+        self.viewer.update_rows(self.transcript, rows)
+        self.content_changed.emit()
+
+    def on_editor_changed(self):
+        """JSONエディタが編集された時の処理"""
+        if self.editor.document().isModified():
+            self.content_changed.emit()
+
     def get_content(self) -> str:
         """内容を取得"""
+        if self.transcript is not None and not self.editor.document().isModified():
+            return self.transcript.to_json()
         return self.editor.toPlainText()
-        
+
+    def get_transcript(self) -> Transcript:
+        """編集内容を反映した文字起こし結果を取得（JSONが不正な場合はValueError）"""
+        # 編集されていなければ解析済みのものをそのまま使う
+        if self.transcript is None or self.editor.document().isModified():
+            self._sync_from_editor()
+        return self.transcript
+
+    def _apply_changed_entries(self) -> Optional[List[int]]:
+        """編集された発話だけを解析して反映し、変更した行を返す（反映できない場合はNone）"""
+        if self.transcript is None:
+            return None
+        if self.editor.entry_count != len(self.transcript):
+            return None
+        entries = self.editor.changed_entries()
+        if entries is None:
+            return None
+        # すべての発話を解析・検証してから反映する（途中で失敗しても結果は変更されない）
+        items = [(index, json.loads(self.editor.entry_text(index))) for index in entries]
+        self.transcript.set_entries(items)
+        return entries
+
+    def _sync_from_editor(self):
+        """JSONエディタの編集内容を文字起こし結果と表示に反映（JSONが不正な場合はValueError）"""
+        try:
+            rows = self._apply_changed_entries()
+        except ValueError:
+            # 発話単位で解析できない編集は全体の解析で検証する
+            rows = None
+        if rows is None:
+            self.transcript = Transcript.from_json(self.editor.toPlainText())
+            self.table.set_transcript(self.transcript)
+            self.viewer.set_transcript(self.transcript)
+        else:
+            self.table.table_model.refresh_rows(rows)
+            self.viewer.update_rows(self.transcript, rows)
+        self.editor.document().setModified(False)
+        self.editor.reset_changes()
+        self.editor_loaded = True
+
     def toggle_mode(self):
         """モードを切り替え"""
         if self.mode_button.isChecked():
             # 編集モードに切り替え
-            self.setCurrentWidget(self.editor)
+            self.show_editor()
             self.mode_button.setText("表示モード")
         else:
-            # 表示モードに切り替え
-            self.viewer.set_html(self.editor.toPlainText())
+            # 表示モードに切り替え（表形式の編集は反映済み、JSONは編集された発話のみ再表示）
+            if self.editor.document().isModified():
+                try:
+                    self._sync_from_editor()
+                except ValueError:
+                    self.viewer.set_html(self.editor.toPlainText())
             self.setCurrentWidget(self.viewer)
             self.mode_button.setText("編集モード")
-            
+
     def cleanup(self):
         """終了処理"""
         self.viewer.cleanup()
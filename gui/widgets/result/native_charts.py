@@ -0,0 +1,638 @@
+"""
+会話分析のグラフをQtで直接描画するモジュール
+
+WebEngineを使わないため、起動時間とメモリ使用量を抑えられる。
+ツールチップの当たり判定用の座標は、サイズ変更時に作成した配列から検索する。
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QToolTip
+from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QPolygonF, QPainterPath
+from PyQt6.QtCore import Qt, QPointF, QRectF
+
+from conversation_stats import ConversationStats
+from .constants import CHART_COLORS
+from .utils import format_level
+
+def to_qcolor(color: str) -> QColor:
+    """plotlyの色指定（"rgb(r, g, b)" など）をQColorに変換"""
+    match = re.match(r'rgba?\(([^)]*)\)', color.strip())
+    if not match:
+        return QColor(color)
+    values = [float(v) for v in match.group(1).split(',')]
+    qcolor = QColor(int(values[0]), int(values[1]), int(values[2]))
+    if len(values) > 3:
+        qcolor.setAlphaF(values[3])
+    return qcolor
+
+def nice_step(span: float, count: int) -> float:
+    """範囲を約count個に分ける切りの良い目盛りの間隔"""
+    raw_step = span / count
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    return next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+
+def nice_ticks(max_value: float, count: int = 5) -> List[float]:
+    """0から最大値までの切りの良い目盛り（最後の目盛りは最大値以上）"""
+    if max_value <= 0:
+        return [0.0]
+    step = nice_step(max_value, count)
+    return [i * step for i in range(int(np.floor(max_value / step)) + 2)]
+
+def range_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """範囲内の切りの良い目盛り"""
+    if high <= low:
+        return []
+    step = nice_step(high - low, count)
+    first = np.ceil(low / step)
+    return [round(i * step, 10) for i in np.arange(first, np.floor(high / step) + 1)]
+
+class NativeChart(QWidget):
+    """QPainterで描画するグラフの基底クラス"""
+
+    MARGINS = (68, 12, 16, 40)  # 左, 上, 右, 下
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setMinimumHeight(300)
+        self.layout_dirty = True
+
+    def plot_rect(self) -> QRectF:
+        """描画領域（軸の内側）"""
+        left, top, right, bottom = self.MARGINS
+        return QRectF(left, top, max(self.width() - left - right, 1), max(self.height() - top - bottom, 1))
+
+    def invalidate(self):
+        """座標を計算し直して再描画"""
+        self.layout_dirty = True
+        self.update()
+
+    def resizeEvent(self, event):
+        self.layout_dirty = True
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self.layout_dirty:
+            self.build_layout()
+            self.layout_dirty = False
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor(CHART_COLORS["background"]))
+        self.paint_chart(painter)
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        if self.layout_dirty:
+            return
+        text = self.hit_test(event.position())
+        if text:
+            QToolTip.showText(event.globalPosition().toPoint(), text, self)
+        else:
+            QToolTip.hideText()
+
+    def leaveEvent(self, event):
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def build_layout(self):
+        """描画・当たり判定用の座標を計算（サイズ変更時とデータ設定時のみ）"""
+
+    def paint_chart(self, painter: QPainter):
+        """グラフを描画"""
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        """マウス位置のツールチップ文字列（該当なしはNone）"""
+        return None
+
+    def draw_value_axis(self, painter: QPainter, rect: QRectF, ticks: List[float], scale: float, title: str):
+        """縦軸と横方向の目盛り線を描画"""
+        painter.setPen(QColor(CHART_COLORS["text"]))
+        metrics = painter.fontMetrics()
+        for tick in ticks:
+            y = rect.bottom() - tick * scale
+            if y < rect.top() - 0.5:
+                break
+            painter.setPen(QPen(QColor(CHART_COLORS["grid"]), 1))
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+            painter.setPen(QColor(CHART_COLORS["text"]))
+            label = f"{tick:g}"
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(label) - 6, y + metrics.ascent() / 2), label)
+        painter.save()
+        painter.translate(12, rect.center().y())
+        painter.rotate(-90)
+        painter.drawText(QPointF(-metrics.horizontalAdvance(title) / 2, 0), title)
+        painter.restore()
+        painter.setPen(QPen(QColor(CHART_COLORS["axis"]), 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+    def draw_axis_title(self, painter: QPainter, rect: QRectF, title: str):
+        """横軸の見出しを描画"""
+        metrics = painter.fontMetrics()
+        painter.setPen(QColor(CHART_COLORS["text"]))
+        painter.drawText(QPointF(rect.center().x() - metrics.horizontalAdvance(title) / 2, self.height() - 6), title)
+
+class StackedAreaChart(NativeChart):
+    """話者ごとの発話量の積み上げ面グラフ
+
+    ホイールで拡大・縮小、ドラッグで移動、ダブルクリックで全体表示に戻る。
+    解像度ごとに集計済みのデータから表示範囲に合うものを選ぶため、発話を走査し直さない。
+    """
+
+    ZOOM_STEP = 0.8  # ホイール1段階での表示範囲の倍率
+    MIN_VISIBLE_SLOTS = 10  # 最も細かい解像度で最低限表示する時間枠の数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names: List[str] = []
+        self.colors: List[QColor] = []
+        self.pyramid: Dict[float, np.ndarray] = {}  # 解像度（秒）→ 系列×時間枠の発話量
+        self.levels: List[float] = []
+        self.total_seconds = 0.0
+        self.view_start = 0.0  # 表示範囲（秒）
+        self.view_end = 0.0
+        self.level = 0.0  # 表示中の解像度（秒）
+        self.first_slot = 0  # 表示中の最初の時間枠
+        self.values = np.zeros((0, 0))
+        self.polygons: List[QPolygonF] = []
+        self.xs = np.empty(0)
+        self.ticks: List[float] = []
+        self.scale = 1.0
+        self.drag_origin: Optional[Tuple[float, float]] = None  # (ドラッグ開始時のx座標, 表示開始時刻)
+
+    def set_data(self, series: List[Tuple[str, QColor]], pyramid: Dict[float, np.ndarray]):
+        """(話者名, 色) のリストと、解像度ごとの系列×時間枠の発話量を設定"""
+        self.names = [name for name, _ in series]
+        self.colors = [color for _, color in series]
+        self.pyramid = pyramid
+        self.levels = sorted(pyramid)
+        self.total_seconds = self.levels[0] * pyramid[self.levels[0]].shape[1] if self.levels else 0.0
+        self.reset_view()
+
+    def clear(self):
+        self.set_data([], {})
+
+    def reset_view(self):
+        """全体を表示"""
+        self.view_start, self.view_end = 0.0, self.total_seconds
+        self.invalidate()
+
+    def set_view(self, start: float, span: float):
+        """表示範囲を設定（記録の範囲内に収める）"""
+        min_span = self.levels[0] * self.MIN_VISIBLE_SLOTS if self.levels else 0.0
+        span = min(max(span, min_span), self.total_seconds)
+        start = min(max(start, 0.0), self.total_seconds - span)
+        self.view_start, self.view_end = start, start + span
+        self.invalidate()
+
+    def build_layout(self):
+        rect = self.plot_rect()
+        self.polygons = []
+        span = self.view_end - self.view_start
+        if not self.levels or span <= 0:
+            self.values = np.zeros((len(self.names), 0))
+            self.xs = np.empty(0)
+            return
+
+        # 表示範囲に合う解像度を選び、範囲内の時間枠だけを取り出す
+        self.level = ConversationStats.choose_level(span, self.levels)
+        bins = self.pyramid[self.level]
+        self.first_slot = max(int(self.view_start // self.level), 0)
+        last_slot = min(int(np.ceil(self.view_end / self.level)) + 1, bins.shape[1])
+        self.values = bins[:, self.first_slot:last_slot]
+        stacks = np.cumsum(self.values, axis=0)
+
+        # 時間枠ごとのx座標（当たり判定にもこの配列を使う）
+        times = (self.first_slot + np.arange(self.values.shape[1])) * self.level
+        self.xs = rect.left() + (times - self.view_start) / span * rect.width()
+        max_value = float(stacks[-1].max()) if len(stacks) and stacks.shape[1] else 0.0
+        self.ticks = nice_ticks(max_value)
+        self.scale = rect.height() / max(self.ticks[-1], 1e-9)
+
+        # 時間枠が横幅のピクセル数より多い場合は、描画用にピクセル列ごとの最大値にまとめる
+        # （積み上げの順序は保たれる。ツールチップは元の時間枠の値を使う）
+        xs = self.xs
+        if len(xs) > rect.width():
+            columns = np.floor(xs - rect.left()).astype(np.int64)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(columns)) + 1))
+            xs = xs[starts]
+            stacks = np.maximum.reduceat(stacks, starts, axis=1)
+        lower = np.full(len(xs), rect.bottom())
+        xs = xs.tolist()
+        for stack in stacks:
+            upper = rect.bottom() - stack * self.scale
+            points = [QPointF(x, y) for x, y in zip(xs, upper.tolist())]
+            points += [QPointF(x, y) for x, y in zip(reversed(xs), lower[::-1].tolist())]
+            self.polygons.append(QPolygonF(points))
+            lower = upper
+
+    def paint_chart(self, painter: QPainter):
+        rect = self.plot_rect()
+        self.draw_value_axis(painter, rect, self.ticks, self.scale, "発話量（秒）")
+        title = f"時間（分） / {format_level(self.level)}ごと" if self.level else "時間（分）"
+        self.draw_axis_title(painter, rect, title)
+        if not len(self.xs):
+            return
+
+        # 横軸の目盛り（表示範囲内の切りの良い分）
+        metrics = painter.fontMetrics()
+        span = self.view_end - self.view_start
+        painter.setPen(QColor(CHART_COLORS["text"]))
+        for minute in range_ticks(self.view_start / 60, self.view_end / 60, max(int(rect.width() / 80), 1)):
+            x = rect.left() + (minute * 60 - self.view_start) / span * rect.width()
+            label = f"{minute:g}"
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(label) / 2, rect.bottom() + metrics.height()), label)
+
+        painter.save()
+        painter.setClipRect(rect)
+        for polygon, color in zip(self.polygons, self.colors):
+            painter.setPen(QPen(color.darker(120), 0.5))
+            painter.setBrush(QBrush(color))
+            painter.drawPolygon(polygon)
+        painter.restore()
+
+        # 凡例
+        line_height = metrics.height() + 2
+        width = max((metrics.horizontalAdvance(name) for name in self.names), default=0) + 28
+        legend = QRectF(rect.left() + 8, rect.top() + 4, width, line_height * len(self.names) + 8)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(CHART_COLORS["legend_background"]))
+        painter.drawRect(legend)
+        for i, (name, color) in enumerate(zip(self.names, self.colors)):
+            y = legend.top() + 4 + i * line_height
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawRect(QRectF(legend.left() + 6, y + 3, 12, line_height - 6))
+            painter.setPen(QColor(CHART_COLORS["text"]))
+            painter.drawText(QPointF(legend.left() + 24, y + metrics.ascent()), name)
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        if not len(self.xs) or not self.plot_rect().contains(pos):
+            return None
+        # 最も近い時間枠を二分探索で求める
+        index = int(np.searchsorted(self.xs, pos.x()))
+        if index > 0 and (index == len(self.xs) or pos.x() - self.xs[index - 1] < self.xs[index] - pos.x()):
+            index -= 1
+        minute = (self.first_slot + index) * self.level / 60
+        lines = [f"時間: {minute:.2f}分（{format_level(self.level)}ごと）"]
+        lines += [f"{name}: {value:.1f}秒" for name, value in zip(self.names, self.values[:, index].tolist())]
+        return "\n".join(lines)
+
+    def wheelEvent(self, event):
+        """カーソル位置を中心に拡大・縮小"""
+        steps = event.angleDelta().y() / 120
+        if not self.levels or not steps:
+            return
+        rect = self.plot_rect()
+        span = self.view_end - self.view_start
+        ratio = min(max((event.position().x() - rect.left()) / rect.width(), 0.0), 1.0)
+        anchor = self.view_start + ratio * span
+        new_span = span * self.ZOOM_STEP ** steps
+        self.set_view(anchor - ratio * new_span, new_span)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self.levels:
+            self.drag_origin = (event.position().x(), self.view_start)
+            QToolTip.hideText()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.drag_origin is None:
+            super().mouseMoveEvent(event)
+            return
+        # ドラッグで表示範囲を移動
+        origin_x, origin_start = self.drag_origin
+        span = self.view_end - self.view_start
+        shift = (event.position().x() - origin_x) / self.plot_rect().width() * span
+        self.set_view(origin_start - shift, span)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_origin = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.reset_view()
+
+class BarChart(NativeChart):
+    """話者ごとの値（総発話量・話速など）の棒グラフ"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.labels: List[str] = []
+        self.colors: List[QColor] = []
+        self.values: List[float] = []
+        self.value_name = "発話量"
+        self.unit = "秒"
+        self.bars: List[QRectF] = []
+        self.lefts = np.empty(0)
+        self.ticks: List[float] = []
+        self.scale = 1.0
+
+    def set_data(self, labels: List[str], colors: List[QColor], values: List[float],
+                 value_name: str = "発話量", unit: str = "秒"):
+        """棒ごとの見出し・色・値と、値の名前・単位を設定"""
+        self.labels, self.colors, self.values = list(labels), list(colors), list(values)
+        self.value_name, self.unit = value_name, unit
+        self.invalidate()
+
+    def clear(self):
+        self.set_data([], [], [])
+
+    def build_layout(self):
+        rect = self.plot_rect()
+        self.ticks = nice_ticks(max(self.values, default=0.0))
+        self.scale = rect.height() / max(self.ticks[-1], 1e-9)
+        slot = rect.width() / max(len(self.values), 1)
+        width = slot * 0.7
+        self.bars = [
+            QRectF(rect.left() + i * slot + (slot - width) / 2, rect.bottom() - value * self.scale,
+                   width, value * self.scale)
+            for i, value in enumerate(self.values)
+        ]
+        self.lefts = np.array([bar.left() for bar in self.bars])
+
+    def paint_chart(self, painter: QPainter):
+        rect = self.plot_rect()
+        self.draw_value_axis(painter, rect, self.ticks, self.scale, f"{self.value_name}（{self.unit}）")
+        self.draw_axis_title(painter, rect, "話者")
+        metrics = painter.fontMetrics()
+        for bar, label, color, value in zip(self.bars, self.labels, self.colors, self.values):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawRect(bar)
+            painter.setPen(QColor(CHART_COLORS["text"]))
+            text = f"{value:.1f}{self.unit}"
+            text_y = bar.top() + metrics.ascent() + 4 if bar.height() > metrics.height() + 8 else bar.top() - 4
+            painter.drawText(QPointF(bar.center().x() - metrics.horizontalAdvance(text) / 2, text_y), text)
+            label = metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(bar.width() / 0.7))
+            painter.drawText(QPointF(bar.center().x() - metrics.horizontalAdvance(label) / 2,
+                                     rect.bottom() + metrics.height()), label)
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        index = int(np.searchsorted(self.lefts, pos.x(), side='right')) - 1
+        if index < 0 or not self.bars[index].contains(pos):
+            return None
+        return f"話者: {self.labels[index]}\n{self.value_name}: {self.values[index]:.2f}{self.unit}"
+
+class TransitionGraph(NativeChart):
+    """話者間の遷移パターンのグラフ"""
+
+    NODE_RADIUS = 20  # ノードの半径（ピクセル）
+    HIT_DISTANCE = 6  # エッジの当たり判定の距離（ピクセル）
+    VIEW_RANGE = 1.5  # 表示するデータ座標の範囲（±）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.nodes: List[Tuple[str, QColor, Tuple[float, float]]] = []
+        self.edges: List[Tuple[str, str, int, np.ndarray, np.ndarray]] = []
+        self.node_points = np.zeros((0, 2))
+        self.edge_paths: List[QPainterPath] = []
+        self.edge_points = np.zeros((0, 2))
+        self.edge_index = np.empty(0, dtype=np.int64)  # edge_points の各点が属するエッジ
+
+    def set_data(self, nodes: List[Tuple[str, QColor, Tuple[float, float]]],
+                 edges: List[Tuple[str, str, int, np.ndarray, np.ndarray]]):
+        """ノード (話者名, 色, 位置) とエッジ (遷移元, 遷移先, 回数, x座標列, y座標列) を設定"""
+        self.nodes, self.edges = list(nodes), list(edges)
+        self.invalidate()
+
+    def clear(self):
+        self.set_data([], [])
+
+    def _transform(self) -> Tuple[float, float, float]:
+        """データ座標 → ピクセル座標の変換（縦横比を保つ）"""
+        rect = QRectF(self.rect())
+        scale = min(rect.width(), rect.height()) / (2 * self.VIEW_RANGE)
+        return rect.center().x(), rect.center().y(), scale
+
+    def build_layout(self):
+        cx, cy, scale = self._transform()
+        self.node_points = np.array(
+            [(cx + x * scale, cy - y * scale) for _, _, (x, y) in self.nodes], dtype=np.float64
+        ).reshape(-1, 2)
+        self.edge_paths = []
+        points, index = [], []
+        for i, (_, _, _, xs, ys) in enumerate(self.edges):
+            edge = np.column_stack((cx + np.asarray(xs) * scale, cy - np.asarray(ys) * scale))
+            path = QPainterPath(QPointF(*edge[0]))
+            for x, y in edge[1:].tolist():
+                path.lineTo(x, y)
+            self.edge_paths.append(path)
+            points.append(edge)
+            index.append(np.full(len(edge), i, dtype=np.int64))
+        self.edge_points = np.concatenate(points) if points else np.zeros((0, 2))
+        self.edge_index = np.concatenate(index) if index else np.empty(0, dtype=np.int64)
+
+    def paint_chart(self, painter: QPainter):
+        if not self.nodes:
+            return
+        max_count = max((count for _, _, count, _, _ in self.edges), default=1)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for path, (_, _, count, _, _) in zip(self.edge_paths, self.edges):
+            # エッジの太さと透明度を遷移回数に応じて変更
+            color = QColor(CHART_COLORS["edge"])
+            color.setAlphaF(0.3 + (count / max_count) * 0.7)
+            painter.setPen(QPen(color, max((count / max_count) * 5, 0.5)))
+            painter.drawPath(path)
+
+        metrics = painter.fontMetrics()
+        for (name, color, _), (x, y) in zip(self.nodes, self.node_points.tolist()):
+            painter.setPen(QPen(QColor(CHART_COLORS["node_border"]), 2))
+            painter.setBrush(color)
+            painter.drawEllipse(QPointF(x, y), self.NODE_RADIUS, self.NODE_RADIUS)
+            painter.setPen(QColor(CHART_COLORS["text"]))
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(name) / 2, y + metrics.ascent() / 2), name)
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        point = np.array([pos.x(), pos.y()])
+        if len(self.node_points):
+            distances = np.hypot(*(self.node_points - point).T)
+            nearest = int(distances.argmin())
+            if distances[nearest] <= self.NODE_RADIUS:
+                return self.nodes[nearest][0]
+        if len(self.edge_points):
+            distances = np.hypot(*(self.edge_points - point).T)
+            nearest = int(distances.argmin())
+            if distances[nearest] <= self.HIT_DISTANCE:
+                s1, s2, count, _, _ = self.edges[self.edge_index[nearest]]
+                return f"{s1} → {s2}: {count}回"
+        return None
+
+class MatrixChart(NativeChart):
+    """話者の組ごとの回数のヒートマップ（行が話し始めた話者、列が発言中だった話者）"""
+
+    MARGINS = (96, 12, 16, 48)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.labels: List[str] = []
+        self.values = np.zeros((0, 0), dtype=np.int64)
+        self.details: List[Tuple[str, np.ndarray, str]] = []  # ツールチップに添える (名前, 行列, 書式文字列)
+        self.cell_width = 1.0
+        self.cell_height = 1.0
+
+    def set_data(self, labels: List[str], values: np.ndarray, details: List[Tuple[str, np.ndarray, str]] = ()):
+        """話者名と回数の行列、ツールチップに添える他の行列を設定"""
+        self.labels = list(labels)
+        self.values = np.asarray(values)
+        self.details = list(details)
+        self.invalidate()
+
+    def clear(self):
+        self.set_data([], np.zeros((0, 0), dtype=np.int64))
+
+    def build_layout(self):
+        rect = self.plot_rect()
+        n = max(len(self.labels), 1)
+        self.cell_width = rect.width() / n
+        self.cell_height = rect.height() / n
+
+    def paint_chart(self, painter: QPainter):
+        if not self.labels:
+            return
+        rect = self.plot_rect()
+        metrics = painter.fontMetrics()
+        max_value = max(int(self.values.max()), 1)
+        base = QColor(CHART_COLORS["heatmap"])
+        for row, column in np.ndindex(self.values.shape):
+            value = int(self.values[row, column])
+            cell = QRectF(rect.left() + column * self.cell_width, rect.top() + row * self.cell_height,
+                          self.cell_width, self.cell_height)
+            color = QColor(base)
+            color.setAlphaF(0.08 + 0.92 * value / max_value)
+            painter.setPen(QPen(QColor(CHART_COLORS["background"]), 1))
+            painter.setBrush(color)
+            painter.drawRect(cell)
+            painter.setPen(QColor(CHART_COLORS["background"] if value / max_value > 0.6 else CHART_COLORS["text"]))
+            text = str(value)
+            painter.drawText(QPointF(cell.center().x() - metrics.horizontalAdvance(text) / 2,
+                                     cell.center().y() + metrics.ascent() / 2), text)
+
+        painter.setPen(QColor(CHART_COLORS["text"]))
+        for i, label in enumerate(self.labels):
+            row_label = metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(rect.left()) - 8)
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(row_label) - 6,
+                                     rect.top() + (i + 0.5) * self.cell_height + metrics.ascent() / 2), row_label)
+            column_label = metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(self.cell_width))
+            painter.drawText(QPointF(rect.left() + (i + 0.5) * self.cell_width - metrics.horizontalAdvance(column_label) / 2,
+                                     rect.bottom() + metrics.height()), column_label)
+        self.draw_axis_title(painter, rect, "割り込まれた話者")
+        painter.save()
+        painter.translate(12, rect.center().y())
+        painter.rotate(-90)
+        title = "割り込んだ話者"
+        painter.drawText(QPointF(-metrics.horizontalAdvance(title) / 2, 0), title)
+        painter.restore()
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        rect = self.plot_rect()
+        if not self.labels or not rect.contains(pos):
+            return None
+        # セルの位置は等間隔なので割り算で求める
+        column = min(int((pos.x() - rect.left()) / self.cell_width), len(self.labels) - 1)
+        row = min(int((pos.y() - rect.top()) / self.cell_height), len(self.labels) - 1)
+        lines = [f"{self.labels[row]} → {self.labels[column]}", f"割り込み: {int(self.values[row, column])}回"]
+        lines += [f"{name}: " + template.format(values[row, column]) for name, values, template in self.details]
+        return "\n".join(lines)
+
+class HistogramChart(NativeChart):
+    """話者ごとの度数を積み上げたヒストグラム"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names: List[str] = []
+        self.colors: List[QColor] = []
+        self.edges = np.empty(0)
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.x_title = ""
+        self.xs = np.empty(0)  # 各区間の左端のx座標
+        self.ticks: List[float] = []
+        self.scale = 1.0
+
+    def set_data(self, series: List[Tuple[str, QColor]], edges: np.ndarray, counts: np.ndarray, x_title: str):
+        """(話者名, 色) のリスト、区間の境界、系列×区間の度数、横軸の見出しを設定"""
+        self.names = [name for name, _ in series]
+        self.colors = [color for _, color in series]
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.asarray(counts).reshape(len(series), max(len(self.edges) - 1, 0))
+        self.x_title = x_title
+        self.invalidate()
+
+    def clear(self):
+        self.set_data([], np.empty(0), np.zeros((0, 0)), "")
+
+    def _to_x(self, value: float) -> float:
+        rect = self.plot_rect()
+        return rect.left() + (value - self.edges[0]) / (self.edges[-1] - self.edges[0]) * rect.width()
+
+    def build_layout(self):
+        if len(self.edges) < 2:
+            self.xs = np.empty(0)
+            return
+        rect = self.plot_rect()
+        self.xs = rect.left() + (self.edges - self.edges[0]) / (self.edges[-1] - self.edges[0]) * rect.width()
+        totals = self.counts.sum(axis=0) if len(self.counts) else np.zeros(1)
+        self.ticks = nice_ticks(float(totals.max()))
+        self.scale = rect.height() / max(self.ticks[-1], 1e-9)
+
+    def paint_chart(self, painter: QPainter):
+        rect = self.plot_rect()
+        self.draw_value_axis(painter, rect, self.ticks, self.scale, "回数")
+        self.draw_axis_title(painter, rect, self.x_title)
+        if not len(self.xs):
+            return
+        metrics = painter.fontMetrics()
+        painter.setPen(QColor(CHART_COLORS["text"]))
+        for tick in range_ticks(self.edges[0], self.edges[-1], max(int(rect.width() / 60), 1)):
+            x = self._to_x(tick)
+            label = f"{tick:g}"
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(label) / 2, rect.bottom() + metrics.height()), label)
+
+        bottoms = np.zeros(self.counts.shape[1])
+        for counts, color in zip(self.counts, self.colors):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            for i in np.flatnonzero(counts):
+                height = counts[i] * self.scale
+                top = rect.bottom() - bottoms[i] - height
+                painter.drawRect(QRectF(self.xs[i] + 0.5, top, self.xs[i + 1] - self.xs[i] - 1, height))
+            bottoms += counts * self.scale
+
+    def hit_test(self, pos: QPointF) -> Optional[str]:
+        if not len(self.xs) or not self.plot_rect().contains(pos):
+            return None
+        index = int(np.searchsorted(self.xs, pos.x(), side='right')) - 1
+        if index < 0 or index >= len(self.xs) - 1:
+            return None
+        lines = [f"{self.edges[index]:g}〜{self.edges[index + 1]:g}秒"]
+        lines += [f"{name}: {int(count)}回" for name, count in zip(self.names, self.counts[:, index].tolist()) if count]
+        return "\n".join(lines)
+
+class NativeChartView(QWidget):
+    """複数のグラフを見出し付きで並べるビュー"""
+
+    def __init__(self, rows: List[List[Tuple[str, str]]], chart_types: Dict[str, type], parent=None):
+        """rows: 行ごとに (グラフID, 見出し) を並べたリスト、chart_types: グラフIDごとのクラス"""
+        super().__init__(parent)
+        self.charts: Dict[str, NativeChart] = {}
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+        for row in rows:
+            row_layout = QHBoxLayout()
+            for chart_id, title in row:
+                cell = QVBoxLayout()
+                label = QLabel(title)
+                label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px 0;")
+                cell.addWidget(label)
+                chart = chart_types[chart_id]()
+                chart.setMinimumWidth(400)
+                cell.addWidget(chart)
+                row_layout.addLayout(cell)
+                self.charts[chart_id] = chart
+            layout.addLayout(row_layout)
+
+    def clear(self):
+        """全てのグラフを消去"""
+        for chart in self.charts.values():
+            chart.clear()
@@ -2,15 +2,17 @@
 結果表示パネルのメインモジュール
 """
 import json
+from typing import Optional
 import markdown
 from PyQt6.QtWidgets import (
     QFrame, QVBoxLayout, QHBoxLayout, QTabWidget, 
     QTextBrowser, QPushButton, QMessageBox,
-    QScrollArea, QLabel, QDialog, QWidget
+    QScrollArea, QLabel, QDialog, QWidget, QCheckBox
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 
+from transcript_model import Transcript
 from .constants import FONT_SETTINGS, TAB_INDICES, TAB_TITLES
 from .mode_manager import TranscriptModeManager
 from .file_manager import TranscriptFileManager
@@ -22,7 +24,8 @@ class ResultPanel(QFrame):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.raw_text = ""
+        self.partial_transcript = None  # 文字起こし中に届いた確定済みの発話
+        self.partial_incomplete = False  # 途中結果の一部を取り込めなかったか
         self.setup_managers()
         self.initUI()
         
@@ -57,6 +60,12 @@ class ResultPanel(QFrame):
         
         # 右側のボタン
         right_buttons = QHBoxLayout()
+        self.raw_json_check = QCheckBox("JSONで編集")
+        self.raw_json_check.setToolTip("編集モードで表の代わりにJSONを直接編集します")
+        self.raw_json_check.toggled.connect(self.on_raw_json_toggled)
+        self.raw_json_check.setVisible(False)  # 初期状態では非表示
+        right_buttons.addWidget(self.raw_json_check)
+        
         self.view_mode_button = QPushButton("編集モード")
         self.view_mode_button.setCheckable(True)
         right_buttons.addWidget(self.view_mode_button)
@@ -68,7 +77,6 @@ class ResultPanel(QFrame):
         
         # タブウィジェット
         self.tab_widget = QTabWidget()
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # 文字起こし結果タブ
         result_widget = QWidget()
@@ -94,37 +102,67 @@ class ResultPanel(QFrame):
             FONT_SETTINGS["result"]["size"]
         ))
         self.tab_widget.addTab(self.ai_result_text, TAB_TITLES["ai_result"])
+        # タブの追加が終わってから接続する（追加時の切り替えで分析ウィジェットを参照しないため）
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
         
     def set_result(self, text: str, file_path: str = None):
         """文字起こし結果を設定"""
         try:
-            # JSONとしてパースを試みる
-            data = json.loads(text)
-            self.raw_text = json.dumps(data, ensure_ascii=False, indent=2)
-            
-            # モードマネージャーに内容を設定
-            self.mode_manager.set_content(self.raw_text)
-            
-            # ファイル情報を更新
-            if file_path:
-                self.file_manager.current_file = file_path
-                self.overwrite_button.setEnabled(True)
-            
-            # 表示モード切り替えボタンと話者管理ボタンを表示
-            self.view_mode_button.setVisible(True)
-            self.speaker_button.setVisible(True)
-            
-            # 会話分析を更新
-            self.analysis_widget.update_analysis(self.raw_text)
-            
-        except json.JSONDecodeError:
+            # JSONの解析はここで1回だけ行い、各ウィジェットで共有する
+            transcript = Transcript.from_json(text)
+        except ValueError:
             # JSONでない場合はそのまま表示
+            self.partial_transcript = None
             self.mode_manager.set_content(text)
             self.view_mode_button.setVisible(False)
+            self.raw_json_check.setVisible(False)
             self.speaker_button.setVisible(False)
+            return
+        self.set_transcript(transcript, file_path)
+        
+    def set_transcript(self, transcript: Transcript, file_path: str = None):
+        """解析済みの文字起こし結果を設定"""
+        self.partial_transcript = None
+        
+        # モードマネージャーに内容を設定
+        self.mode_manager.set_transcript(transcript)
+        
+        # ファイル情報を更新
+        if file_path:
+            self.file_manager.current_file = file_path
+            self.overwrite_button.setEnabled(True)
+        
+        # 表示モード切り替えボタンと話者管理ボタンを表示
+        self.view_mode_button.setVisible(True)
+        self.raw_json_check.setVisible(True)
+        self.speaker_button.setVisible(True)
+        
+        # 会話分析は分析タブを表示した時に別スレッドで行う
+        self.analysis_widget.set_transcript(transcript)
             
+    def append_partial_result(self, entries_json: str):
+        """文字起こし中の途中結果を追加して表示"""
+        if self.partial_transcript is None:
+            self.partial_transcript = Transcript()
+            self.partial_incomplete = False
+        try:
+            self.partial_transcript.extend(json.loads(entries_json))
+        except ValueError:
+            self.partial_incomplete = True
+            return
+        # 会話分析は完了後にまとめて行うため、ここでは表示のみ更新
+        self.mode_manager.show_partial(self.partial_transcript)
+        
+    def take_partial_result(self) -> Optional[Transcript]:
+        """途中結果として届いた発話を全て取り込めていれば返す（取り込めていない場合はNone）"""
+        transcript = self.partial_transcript
+        self.partial_transcript = None
+        if transcript is None or self.partial_incomplete:
+            return None
+        return transcript
+        
     def set_ai_result(self, text: str):
         """AI処理結果を設定"""
         html = markdown.markdown(text, extensions=['tables', 'fenced_code'])
@@ -135,8 +173,10 @@ class ResultPanel(QFrame):
         current_index = self.tab_widget.currentIndex()
         
         if current_index == TAB_INDICES["result"]:
-            text = self.mode_manager.get_content()
-            success, file_path = self.file_manager.save_transcript(text)
+            transcript = self.get_transcript()
+            if transcript is None:
+                return
+            success, file_path = self.file_manager.save_transcript(transcript)
             if success:
                 self.overwrite_button.setEnabled(True)
                 
@@ -144,23 +184,45 @@ class ResultPanel(QFrame):
         """現在のタブの内容を上書き保存"""
         current_index = self.tab_widget.currentIndex()
         if current_index == TAB_INDICES["result"]:
-            text = self.mode_manager.get_content()
-            self.file_manager.save_transcript(text, self.file_manager.get_current_file())
+            transcript = self.get_transcript()
+            if transcript is None:
+                return
+            self.file_manager.save_transcript(transcript, self.file_manager.get_current_file())
+            
+    def get_transcript(self) -> Optional[Transcript]:
+        """編集内容を反映した文字起こし結果を取得（JSONが不正な場合は警告してNone）"""
+        try:
+            return self.mode_manager.get_transcript()
+        except ValueError as e:
+            QMessageBox.warning(
+                self,
+                "エラー",
+                f"無効なJSONフォーマットです:\n{str(e)}"
+            )
+            return None
+            
+    def get_result(self) -> str:
+        """文字起こし結果のテキストを取得（JSONエディタの編集中の内容を含む）"""
+        return self.mode_manager.get_content()
             
     def manage_speakers(self):
         """話者名の編集ダイアログを表示"""
-        dialog = SpeakerDialog(self.raw_text, self)
+        transcript = self.get_transcript()
+        if transcript is None:
+            return
+        dialog = SpeakerDialog(transcript, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            modified_json = dialog.get_modified_json()
-            if modified_json != self.raw_text:
-                # JSONを更新
-                self.raw_text = modified_json
+            modified = dialog.get_modified_transcript()
+            if modified is not None:
+                # 表示を更新
+                self.mode_manager.set_transcript(modified)
+                self.analysis_widget.set_transcript(modified)
                 
                 # ファイルに保存
                 if self.file_manager.get_current_file():
                     try:
                         with open(self.file_manager.get_current_file(), 'w', encoding='utf-8') as f:
-                            f.write(modified_json)
+                            f.write(modified.to_json())
                             
                         # 保存成功メッセージ
                         QMessageBox.information(
@@ -169,10 +231,6 @@ class ResultPanel(QFrame):
                             "話者名の変更を保存しました。"
                         )
                         
-                        # 表示を更新
-                        self.mode_manager.set_content(self.raw_text)
-                        self.analysis_widget.update_analysis(self.raw_text)
-                        
                     except Exception as e:
                         QMessageBox.warning(
                             self,
@@ -184,6 +242,8 @@ class ResultPanel(QFrame):
         """内容が変更された時の処理"""
         if self.file_manager.get_current_file():
             self.overwrite_button.setEnabled(True)
+        # 会話分析は編集が続いている間は行わず、止まってから1回だけ行う
+        self.analysis_widget.set_transcript(self.mode_manager.transcript)
             
     def on_tab_changed(self, index: int):
         """タブ切り替え時の処理"""
@@ -193,17 +253,42 @@ class ResultPanel(QFrame):
             index == TAB_INDICES["result"] and bool(self.file_manager.get_current_file())
         )
         
+        # 会話分析は分析タブが表示されている時だけ行う（JSONエディタの編集内容も反映する）
+        if index == TAB_INDICES["analysis"]:
+            self.analysis_widget.set_transcript(self.mode_manager.transcript)
+        self.analysis_widget.set_active(index == TAB_INDICES["analysis"])
+        
+    def on_raw_json_toggled(self, checked: bool):
+        """JSONを直接編集するモードの切り替え"""
+        try:
+            self.mode_manager.set_raw_json_mode(checked)
+        except ValueError as e:
+            QMessageBox.warning(self, "警告", f"JSONの形式が正しくないため表形式に戻せません：\n{str(e)}")
+            self.raw_json_check.blockSignals(True)
+            self.raw_json_check.setChecked(True)
+            self.raw_json_check.blockSignals(False)
+        
+    def set_chart_backend(self, backend: str):
+        """会話分析グラフの表示方法を設定（"plotly" または "native"）"""
+        self.analysis_widget.set_backend(backend)
+        
+    def scroll_to_time(self, seconds: float):
+        """表示モードで指定した時刻の発話を表示"""
+        self.mode_manager.show_viewer()
+        self.mode_manager.viewer.scroll_to_time(seconds)
+        
     def switch_to_tab(self, index: int):
         """指定したタブに切り替え"""
         self.tab_widget.setCurrentIndex(index)
         
     def clear_all(self):
         """全ての表示内容をクリア"""
-        self.raw_text = ""
+        self.partial_transcript = None
         self.mode_manager.set_content("")
-        self.analysis_widget.update_analysis("")
+        self.analysis_widget.set_transcript(None)
         self.ai_result_text.clear()
         self.view_mode_button.setVisible(False)
+        self.raw_json_check.setVisible(False)
         self.speaker_button.setVisible(False)
         self.overwrite_button.setEnabled(False)
         self.file_manager.current_file = None
@@ -211,3 +296,4 @@ class ResultPanel(QFrame):
     def cleanup(self):
         """終了処理"""
         self.mode_manager.cleanup()
+        self.analysis_widget.cleanup()
@@ -1,9 +1,8 @@
 """
 話者名の管理を担当するモジュール
 """
-import json
 import re
-from typing import List, Optional, Tuple
+from typing import List, Optional
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QLineEdit, QMessageBox, QPlainTextEdit,
@@ -12,9 +11,14 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont, QTextCharFormat, QSyntaxHighlighter
 from PyQt6.QtCore import Qt
 
+from transcript_model import Transcript
+
 class JsonHighlighter(QSyntaxHighlighter):
     """JSONのシンタックスハイライト"""
     
+    # 行ごとに呼ばれるため、パターンはあらかじめコンパイルしておく
+    SPEAKER_PATTERN = re.compile(r'"speaker":\s*"([^"]+)"')
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.speaker_format = QTextCharFormat()
@@ -22,35 +26,28 @@ class JsonHighlighter(QSyntaxHighlighter):
         
     def highlightBlock(self, text: str):
         """話者名部分をハイライト"""
-        pattern = r'"speaker":\s*"([^"]+)"'
-        for match in re.finditer(pattern, text):
-            # "speaker": の部分
-            start = match.start()
-            colon_pos = text.find(':', start) + 1
-            self.setFormat(start, colon_pos - start, QTextCharFormat())
-            
+        if '"speaker"' not in text:
+            return
+        for match in self.SPEAKER_PATTERN.finditer(text):
             # 話者名の部分
-            name_start = text.find('"', colon_pos) + 1
-            name_end = text.find('"', name_start)
+            name_start, name_end = match.span(1)
             self.setFormat(name_start, name_end - name_start, self.speaker_format)
 
 class SpeakerDialog(QDialog):
     """話者名の編集ダイアログ"""
     
-    def __init__(self, json_text: str, parent=None):
+    def __init__(self, transcript: Transcript, parent=None):
         super().__init__(parent)
-        self.json_text = json_text
-        self.modified_json = json_text
+        # キャンセル時に元の内容を変えないよう複製を編集する
+        self.transcript = transcript.copy()
+        self.modified = False
+        self.editor_dirty = False  # エディタが直接編集され、まだ反映していない
         self.speakers = self._get_speakers()
         self.initUI()
         
     def _get_speakers(self) -> List[str]:
         """話者リストを取得"""
-        try:
-            data = json.loads(self.json_text)
-            return sorted(list({utterance["speaker"] for utterance in data}))
-        except:
-            return []
+        return self.transcript.speakers
             
     def initUI(self):
         """UIの初期化"""
@@ -127,8 +124,9 @@ class SpeakerDialog(QDialog):
         layout.addWidget(QLabel("JSONエディタ (黄色の部分が話者名です):"))
         self.editor = QPlainTextEdit()
         self.editor.setFont(QFont("Menlo", 11))
-        self.editor.setPlainText(json.dumps(json.loads(self.json_text), indent=2, ensure_ascii=False))
         self.highlighter = JsonHighlighter(self.editor.document())
+        self._refresh_editor()
+        self.editor.textChanged.connect(self._on_editor_changed)
         layout.addWidget(self.editor)
         
         # ボタン
@@ -143,23 +141,36 @@ class SpeakerDialog(QDialog):
         
         layout.addLayout(button_layout)
         
+    def _refresh_editor(self):
+        """エディタの表示を現在の内容で更新"""
+        self.editor.blockSignals(True)
+        self.editor.setPlainText(self.transcript.to_json())
+        self.editor.blockSignals(False)
+        self.editor_dirty = False
+        
+    def _on_editor_changed(self):
+        """エディタが直接編集された時の処理"""
+        self.editor_dirty = True
+        self.modified = True
+        
+    def _sync_from_editor(self):
+        """直接編集されたJSONを反映（JSONが不正な場合はValueError）"""
+        if self.editor_dirty:
+            self.transcript = Transcript.from_json(self.editor.toPlainText())
+            self.editor_dirty = False
+            
     def _update_speakers_list(self):
         """話者リストを更新"""
-        try:
-            data = json.loads(self.editor.toPlainText())
-            self.speakers = sorted(list({utterance["speaker"] for utterance in data}))
-            
-            # 各ウィジェットを更新
-            self.speakers_label.setText(", ".join(self.speakers))
-            
-            self.from_combo.clear()
-            self.from_combo.addItems(self.speakers)
-            
-            self.merge_list.clear()
-            self.merge_list.addItems(self.speakers)
-            
-        except:
-            pass
+        self.speakers = self._get_speakers()
+        
+        # 各ウィジェットを更新
+        self.speakers_label.setText(", ".join(self.speakers))
+        
+        self.from_combo.clear()
+        self.from_combo.addItems(self.speakers)
+        
+        self.merge_list.clear()
+        self.merge_list.addItems(self.speakers)
             
     def replace_speaker(self):
         """話者名を置換"""
@@ -171,19 +182,16 @@ class SpeakerDialog(QDialog):
             return
             
         try:
-            # 現在のテキストを取得
-            text = self.editor.toPlainText()
-            
-            # 正規表現で置換
-            pattern = f'("speaker":\\s*"){old_name}(")'
-            new_text = re.sub(pattern, f'\\1{new_name}\\2', text)
+            self._sync_from_editor()
             
-            if new_text == text:
+            # 話者IDの対応表を書き換えて置換
+            if self.transcript.rename_speaker(old_name, new_name) == 0:
                 QMessageBox.warning(self, "エラー", f"話者名 {old_name} は見つかりませんでした")
                 return
                 
             # テキストを更新
-            self.editor.setPlainText(new_text)
+            self.modified = True
+            self._refresh_editor()
             
             # 話者リストを更新
             self._update_speakers_list()
@@ -204,27 +212,21 @@ class SpeakerDialog(QDialog):
             return
             
         try:
-            # 現在のテキストを取得
-            text = self.editor.toPlainText()
-            data = json.loads(text)
+            self._sync_from_editor()
             
             # 選択された話者名を取得
             old_names = [item.text() for item in selected_items]
             
             # 話者名を統合
-            count = 0
-            for utterance in data:
-                if utterance["speaker"] in old_names:
-                    utterance["speaker"] = new_name
-                    count += 1
+            count = self.transcript.merge_speakers(old_names, new_name)
                     
             if count == 0:
                 QMessageBox.warning(self, "エラー", "統合対象の発話が見つかりませんでした")
                 return
                 
             # テキストを更新
-            new_text = json.dumps(data, ensure_ascii=False, indent=2)
-            self.editor.setPlainText(new_text)
+            self.modified = True
+            self._refresh_editor()
             
             # 話者リストを更新
             self._update_speakers_list()
@@ -242,12 +244,13 @@ class SpeakerDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "エラー", f"統合に失敗しました: {str(e)}")
             
-    def get_modified_json(self) -> str:
-        """変更後のJSONを取得"""
+    def get_modified_transcript(self) -> Optional[Transcript]:
+        """変更後の文字起こし結果を取得（変更がない場合はNone）"""
+        if not self.modified:
+            return None
         try:
-            # JSONとしてパースして整形
-            data = json.loads(self.editor.toPlainText())
-            return json.dumps(data, ensure_ascii=False, indent=2)
-        except json.JSONDecodeError as e:
+            self._sync_from_editor()
+            return self.transcript
+        except ValueError as e:
             QMessageBox.warning(self, "エラー", f"無効なJSON形式です: {str(e)}")
-            return self.json_text
+            return None
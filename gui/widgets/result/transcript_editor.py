@@ -1,6 +1,8 @@
 """
 文字起こし結果の編集を担当するモジュール
 """
+from bisect import bisect_right
+from typing import List, Optional, Set
 from PyQt6.QtWidgets import QPlainTextEdit
 from PyQt6.QtGui import QFont, QTextOption
 from PyQt6.QtCore import Qt
@@ -10,9 +12,19 @@ from .constants import FONT_SETTINGS
 class TranscriptEditWidget(QPlainTextEdit):
     """文字起こし結果の編集ウィジェット"""
     
+    # Transcript.to_json() で発話の先頭・末尾になる行（その他のキーの分だけ行数は発話ごとに変わる）
+    ENTRY_FIRST_LINE = "  {"
+    ENTRY_LAST_LINES = ("  }", "  },")
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.changed_blocks: Set[int] = set()
+        self.lines_changed = False  # 前回の同期以降に行の追加・削除があったか
+        self.block_count = 1
+        self.entry_firsts: List[int] = []  # 発話ごとの先頭の行
+        self.entry_lasts: List[int] = []  # 発話ごとの末尾の行
         self.setup_editor()
+        self.document().contentsChange.connect(self._on_contents_change)
         
     def setup_editor(self):
         """エディタの設定"""
@@ -44,3 +56,59 @@ class TranscriptEditWidget(QPlainTextEdit):
                 selection-color: #000000;
             }
         """)
+        
+    def set_text(self, text: str):
+        """内容を設定し、変更の記録をリセット"""
+        self.setPlainText(text)
+        self.document().setModified(False)
+        self.reset_changes()
+        
+    def reset_changes(self):
+        """変更の記録をリセットし、発話ごとの行の範囲を記録し直す（表示と同期した後に呼ぶ）"""
+        self.changed_blocks.clear()
+        self.lines_changed = False
+        self.block_count = self.document().blockCount()
+        lines = self.toPlainText().split("\n")
+        self.entry_firsts = [i for i, line in enumerate(lines) if line == self.ENTRY_FIRST_LINE]
+        self.entry_lasts = [i for i, line in enumerate(lines) if line in self.ENTRY_LAST_LINES]
+        if len(self.entry_firsts) != len(self.entry_lasts):
+            # to_json() の形式でない場合は発話単位で扱わない
+            self.entry_firsts, self.entry_lasts = [], []
+        
+    @property
+    def entry_count(self) -> int:
+        """行の範囲を記録した発話の数"""
+        return len(self.entry_firsts)
+        
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """編集された行を記録"""
+        document = self.document()
+        last_position = min(position + added, document.characterCount() - 1)
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(last_position).blockNumber()
+        self.changed_blocks.update(range(first, max(first, last) + 1))
+        # 改行の追加・削除を含む編集では、以降の発話の行の範囲がずれる
+        block_count = document.blockCount()
+        if block_count != self.block_count or last > first:
+            self.lines_changed = True
+        self.block_count = block_count
+        
+    def changed_entries(self) -> Optional[List[int]]:
+        """前回の同期以降に編集された発話の番号（行の構成が変わった場合はNone）"""
+        if self.lines_changed or not self.entry_firsts:
+            return None
+        entries = set()
+        for block in self.changed_blocks:
+            index = bisect_right(self.entry_firsts, block) - 1
+            # 発話の外（配列の括弧の行など）が編集された場合は全体を解析し直す
+            if index < 0 or block > self.entry_lasts[index]:
+                return None
+            entries.add(index)
+        return sorted(entries)
+        
+    def entry_text(self, index: int) -> str:
+        """発話1つ分のJSONテキストを取得"""
+        document = self.document()
+        first, last = self.entry_firsts[index], self.entry_lasts[index]
+        lines = [document.findBlockByNumber(block).text() for block in range(first, last + 1)]
+        return "\n".join(lines).rstrip().rstrip(',')
@@ -1,81 +1,326 @@
 """
 文字起こし結果の表示を担当するモジュール
 """
-import json
-import tempfile
-import os
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
-from PyQt6.QtCore import QUrl
+from typing import Dict, List, Optional
+import numpy as np
+from PyQt6.QtWidgets import (
+    QStackedWidget, QTreeView, QPlainTextEdit, QStyledItemDelegate,
+    QStyleOptionViewItem, QStyle, QApplication, QAbstractItemView
+)
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPalette, QKeySequence
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
 
-from .transcript_formatter import TranscriptFormatter
+from transcript_model import Transcript
+from .constants import FONT_SETTINGS, VIEWER_COLORS, VIEWER_METRICS
+from .utils import format_time, generate_speaker_color
 
-class TranscriptViewWidget(QWebEngineView):
+# 発話ごとに取得するデータのロール
+START_ROLE = Qt.ItemDataRole.UserRole + 1
+END_ROLE = Qt.ItemDataRole.UserRole + 2
+SPEAKER_ROLE = Qt.ItemDataRole.UserRole + 3
+SHOW_SPEAKER_ROLE = Qt.ItemDataRole.UserRole + 4  # 直前の発話と話者が異なるか
+
+class TranscriptListModel(QAbstractListModel):
+    """文字起こし結果の発話を1行ずつ提供するモデル（表示する行だけ値を取り出す）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transcript = Transcript()
+        self._row_count = 0
+
+    def set_transcript(self, transcript: Transcript):
+        """文字起こし結果を設定"""
+        if transcript is self.transcript and len(transcript) >= self._row_count:
+            # 途中結果の追加など、同じ文字起こし結果に発話が増えた場合は追加分だけ通知
+            if len(transcript) > self._row_count:
+                self.beginInsertRows(QModelIndex(), self._row_count, len(transcript) - 1)
+                self._row_count = len(transcript)
+                self.endInsertRows()
+            return
+        self.beginResetModel()
+        self.transcript = transcript
+        self._row_count = len(transcript)
+        self.endResetModel()
+
+    def update_rows(self, transcript: Transcript, rows: List[int]):
+        """編集された行だけ再描画を通知"""
+        if transcript is not self.transcript or len(transcript) != self._row_count:
+            self.set_transcript(transcript)
+            return
+        changed = set()
+        for row in rows:
+            # 話者が変わると次の行の話者名の表示有無も変わる
+            changed.update(r for r in (row, row + 1) if r < self._row_count)
+        for row in sorted(changed):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        transcript = self.transcript
+        if role == Qt.ItemDataRole.DisplayRole:
+            return transcript.texts[row]
+        if role == START_ROLE:
+            return float(transcript.starts[row])
+        if role == END_ROLE:
+            return float(transcript.ends[row])
+        if role == SPEAKER_ROLE:
+            return transcript.speaker(row)
+        if role == SHOW_SPEAKER_ROLE:
+            return row == 0 or transcript.speaker_ids[row] != transcript.speaker_ids[row - 1]
+        return None
+
+    def row_at_time(self, seconds: float) -> int:
+        """指定した時刻に話されている（またはその直前の）発話の行番号"""
+        row = int(np.searchsorted(self.transcript.starts, seconds, side='right')) - 1
+        return min(max(row, 0), max(self._row_count - 1, 0))
+
+class UtteranceDelegate(QStyledItemDelegate):
+    """話者名・タイムスタンプ・本文をカード状に描画するデリゲート"""
+
+    MAX_CACHED_SIZES = 50000  # 本文の高さを覚えておく件数の上限
+
+    def __init__(self, view: QTreeView):
+        super().__init__(view)
+        self.view = view
+        self.text_font = QFont(FONT_SETTINGS["result"]["family"], FONT_SETTINGS["result"]["size"] + 2)
+        self.speaker_font = QFont(self.text_font)
+        self.speaker_font.setWeight(QFont.Weight.DemiBold)
+        self.timestamp_font = QFont(FONT_SETTINGS["debug"]["family"], FONT_SETTINGS["debug"]["size"] - 2)
+        self.text_metrics = QFontMetrics(self.text_font)
+        self.speaker_metrics = QFontMetrics(self.speaker_font)
+        self.speaker_colors: Dict[str, QColor] = {}
+        # 本文の内容ごとに折り返し後の高さを保持し、再レイアウト時の計算を省く
+        self.text_heights: Dict[str, int] = {}
+        self.text_heights_width = 0
+
+    def _speaker_color(self, speaker: str) -> QColor:
+        """話者の色を取得（未設定の場合は生成）"""
+        if speaker not in self.speaker_colors:
+            self.speaker_colors[speaker] = QColor(generate_speaker_color(speaker))
+        return self.speaker_colors[speaker]
+
+    def _text_width(self, width: int) -> int:
+        """本文を折り返す幅"""
+        metrics = VIEWER_METRICS
+        return max(width - metrics["card_indent"] - metrics["card_padding"] * 2, 50)
+
+    def _header_height(self, index: QModelIndex) -> int:
+        """話者名の行の高さ（話者が変わらない場合は0）"""
+        if not index.data(SHOW_SPEAKER_ROLE):
+            return 0
+        return VIEWER_METRICS["speaker_gap"] + VIEWER_METRICS["speaker_height"]
+
+    def _text_height(self, text: str, width: int) -> int:
+        """本文を折り返した高さ（同じ内容・同じ幅なら計算済みの値を使う）"""
+        if width != self.text_heights_width or len(self.text_heights) > self.MAX_CACHED_SIZES:
+            self.text_heights.clear()
+            self.text_heights_width = width
+        height = self.text_heights.get(text)
+        if height is None:
+            height = self.text_metrics.boundingRect(
+                QRect(0, 0, self._text_width(width), 1 << 20),
+                Qt.TextFlag.TextWordWrap,
+                text
+            ).height()
+            self.text_heights[text] = height
+        return height
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        metrics = VIEWER_METRICS
+        width = self.view.viewport().width()
+        text_height = self._text_height(index.data(Qt.ItemDataRole.DisplayRole), width)
+        height = (self._header_height(index) + metrics["card_padding"] * 2 +
+                  metrics["timestamp_height"] + text_height + metrics["card_spacing"])
+        return QSize(width, height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        metrics = VIEWER_METRICS
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect
+        top = rect.top()
+
+        # 話者名（話者が変わった行のみ）
+        speaker = index.data(SPEAKER_ROLE)
+        header_height = self._header_height(index)
+        if header_height:
+            color = self._speaker_color(speaker)
+            painter.setFont(self.speaker_font)
+            label_width = self.speaker_metrics.horizontalAdvance(speaker) + 16
+            label_rect = QRect(rect.left(), top + metrics["speaker_gap"], label_width, metrics["speaker_height"])
+            background = QColor(color)
+            background.setAlpha(40)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(background)
+            painter.drawRoundedRect(label_rect, 4, 4)
+            painter.setPen(color)
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, speaker)
+            top += header_height
+
+        # 発話カード
+        card_rect = QRect(rect.left() + metrics["card_indent"], top,
+                          rect.width() - metrics["card_indent"], rect.bottom() - top - metrics["card_spacing"] + 1)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(VIEWER_COLORS["selected" if selected else "card"]))
+        painter.drawRoundedRect(card_rect, 6, 6)
+
+        inner = card_rect.adjusted(metrics["card_padding"], metrics["card_padding"],
+                                   -metrics["card_padding"], -metrics["card_padding"])
+        painter.setFont(self.timestamp_font)
+        painter.setPen(QColor(VIEWER_COLORS["timestamp"]))
+        painter.drawText(
+            QRect(inner.left(), inner.top(), inner.width(), metrics["timestamp_height"]),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"[{format_time(index.data(START_ROLE))} - {format_time(index.data(END_ROLE))}]"
+        )
+
+        painter.setFont(self.text_font)
+        painter.setPen(QColor(VIEWER_COLORS["text"]))
+        painter.drawText(
+            inner.adjusted(0, metrics["timestamp_height"], 0, 0),
+            Qt.TextFlag.TextWordWrap,
+            index.data(Qt.ItemDataRole.DisplayRole)
+        )
+        painter.restore()
+
+class TranscriptListView(QTreeView):
+    """発話のリスト表示（画面内の行だけを描画する）
+
+    QListView は行の高さが揃っていない場合に全ての行の高さを計算するため、
+    表示範囲の行の高さだけを求める QTreeView を1列のリストとして使う。
+    スクロールは行単位にして、全体の高さを求めずに任意の行へ移動できるようにする。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(UtteranceDelegate(self))
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(False)
+        self.setIndentation(0)
+        self.setItemsExpandable(False)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerItem)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # 背景色はパレットで設定する（スタイルシートで背景色を指定すると、描画のたびに
+        # 先頭から表示位置までの全ての行の高さが計算される）
+        palette = self.palette()
+        palette.setColor(QPalette.ColorRole.Base, QColor(VIEWER_COLORS["background"]))
+        self.setPalette(palette)
+        self.setStyleSheet("""
+            QTreeView {
+                border: none;
+                padding: 12px 20px;
+            }
+        """)
+
+    def resizeEvent(self, event):
+        """幅が変わると本文の折り返しが変わるため、行の高さを計算し直す"""
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width():
+            self.scheduleDelayedItemsLayout()
+
+    def scroll_to_row(self, row: int):
+        """指定した行を先頭に表示"""
+        if not 0 <= row < self.model().rowCount():
+            return
+        # 画面外の行を再描画しようとすると、表示位置からその行までの高さを全て計算するため、
+        # 移動前の選択は通知せずに解除する（スクロール後は画面全体が再描画される）
+        selection = self.selectionModel()
+        selection.blockSignals(True)
+        selection.clear()
+        selection.blockSignals(False)
+        index = self.model().index(row, 0)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
+        self.setCurrentIndex(index)
+        self.viewport().update()
+
+    def keyPressEvent(self, event):
+        """選択した発話をコピー"""
+        if event.matches(QKeySequence.StandardKey.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            model = self.model()
+            lines = []
+            for row in rows:
+                index = model.index(row)
+                lines.append(
+                    f"[{format_time(index.data(START_ROLE))} - {format_time(index.data(END_ROLE))}] "
+                    f"{index.data(SPEAKER_ROLE)}: {index.data(Qt.ItemDataRole.DisplayRole)}"
+                )
+            QApplication.clipboard().setText("\n".join(lines))
+            return
+        super().keyPressEvent(event)
+
+class TranscriptViewWidget(QStackedWidget):
     """文字起こし結果の表示ウィジェット"""
-    
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.formatter = TranscriptFormatter()
-        self.current_temp_file = None
-        self.setup_settings()
-        
-    def setup_settings(self):
-        """WebEngineの設定"""
-        settings = self.settings()
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessFileUrls, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, False)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.ShowScrollBars, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, False)
-        self.setZoomFactor(1.0)
-        
+        self.transcript: Optional[Transcript] = None
+        self.setup_widgets()
+
+    def setup_widgets(self):
+        """ウィジェットの初期化"""
+        # 文字起こし結果のリスト表示
+        self.model = TranscriptListModel(self)
+        self.list_view = TranscriptListView()
+        self.list_view.setModel(self.model)
+        self.addWidget(self.list_view)
+
+        # JSONでない内容のテキスト表示
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        self.text_view.setFont(QFont(
+            FONT_SETTINGS["result"]["family"],
+            FONT_SETTINGS["result"]["size"]
+        ))
+        self.text_view.setStyleSheet(f"""
+            QPlainTextEdit {{
+                background-color: {VIEWER_COLORS["background"]};
+                color: {VIEWER_COLORS["text"]};
+                padding: 20px;
+                border: none;
+            }}
+        """)
+        self.addWidget(self.text_view)
+
+    def set_transcript(self, transcript: Transcript):
+        """文字起こし結果を表示"""
+        self.transcript = transcript
+        self.model.set_transcript(transcript)
+        self.setCurrentWidget(self.list_view)
+
     def set_html(self, text: str):
         """HTMLを設定"""
         try:
-            # 既存の一時ファイルを削除
-            if self.current_temp_file:
-                try:
-                    os.unlink(self.current_temp_file)
-                except:
-                    pass
-                    
-            # JSONをパースしてHTML形式に変換
-            data = json.loads(text)
-            formatted_text = self.formatter.format_transcript(text)
-            
-            # 一時ファイルに保存
-            with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(formatted_text)
-                self.current_temp_file = f.name
-                
-            # HTMLを表示
-            self.load(QUrl.fromLocalFile(self.current_temp_file))
-            
-        except json.JSONDecodeError:
-            # JSONでない場合はプレーンテキストとして表示
-            html = f"""
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <style>
-                    body {{
-                        font-family: Helvetica, sans-serif;
-                        line-height: 1.6;
-                        padding: 20px;
-                        white-space: pre-wrap;
-                    }}
-                </style>
-            </head>
-            <body>
-                {text}
-            </body>
-            </html>
-            """
-            self.setHtml(html)
-            
+            # JSONを1回だけ解析して表示
+            self.set_transcript(Transcript.from_json(text))
+
+        except ValueError:
+            # 文字起こし結果のJSONでない場合はプレーンテキストとして表示
+            self.transcript = None
+            self.text_view.setPlainText(text)
+            self.setCurrentWidget(self.text_view)
+
+    def update_rows(self, transcript: Transcript, rows: List[int]):
+        """編集された発話だけを再表示"""
+        self.transcript = transcript
+        self.model.update_rows(transcript, rows)
+        self.setCurrentWidget(self.list_view)
+
+    def scroll_to_time(self, seconds: float):
+        """指定した時刻の発話までスクロール"""
+        if self.transcript is None or len(self.transcript) == 0:
+            return
+        # 開始時刻の配列を二分探索して該当する発話を求める
+        self.list_view.scroll_to_row(self.model.row_at_time(seconds))
+
     def cleanup(self):
         """終了処理"""
-        if self.current_temp_file:
-            try:
-                os.unlink(self.current_temp_file)
-            except:
-                pass
+        self.model.set_transcript(Transcript())
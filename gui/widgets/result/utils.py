@@ -1,10 +1,8 @@
 """
 結果表示パネルのユーティリティ関数
 """
-import json
 import colorsys
 from datetime import timedelta
-from typing import Dict, Any, Tuple
 
 from .constants import BASE_HUES
 
@@ -16,6 +14,10 @@ def format_time(seconds: float) -> str:
     seconds = time.total_seconds() % 60
     return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
 
+def format_level(seconds: float) -> str:
+    """集計の時間枠の長さを表示用に変換（例: 5秒、15分）"""
+    return f"{seconds / 60:g}分" if seconds >= 60 else f"{seconds:g}秒"
+
 def generate_speaker_color(speaker_id: str) -> str:
     """話者IDから色を動的に生成"""
     try:
@@ -36,28 +38,3 @@ def generate_speaker_color(speaker_id: str) -> str:
         int(rgb[1]*255),
         int(rgb[2]*255)
     )
-
-def parse_json_safely(text: str) -> Tuple[bool, Any, str]:
-    """JSONを安全にパースし、結果とエラーメッセージを返す"""
-    try:
-        data = json.loads(text)
-        return True, data, ""
-    except json.JSONDecodeError as e:
-        return False, None, f"JSONの解析に失敗しました: {str(e)}"
-    except Exception as e:
-        return False, None, f"予期せぬエラーが発生しました: {str(e)}"
-
-def ensure_json_extension(file_path: str) -> str:
-    """ファイルパスの拡張子が.jsonでない場合は追加"""
-    if not file_path.lower().endswith('.json'):
-        return file_path + '.json'
-    return file_path
-
-def convert_plain_text_to_json(text: str) -> Dict:
-    """プレーンテキストを最小限のJSON形式に変換"""
-    return {
-        "start": 0,
-        "end": 0,
-        "text": text,
-        "speaker": "SPEAKER_01"
-    }
@@ -0,0 +1,181 @@
+"""
+発話単位の表形式エディタを担当するモジュール
+"""
+from typing import List
+from PyQt6.QtWidgets import (
+    QTableView, QStyledItemDelegate, QDoubleSpinBox, QHeaderView,
+    QAbstractItemView, QWidget, QStyleOptionViewItem
+)
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from transcript_model import Transcript
+from .constants import FONT_SETTINGS
+from .utils import format_time
+
+# 列の定義
+COLUMN_START = 0
+COLUMN_END = 1
+COLUMN_SPEAKER = 2
+COLUMN_TEXT = 3
+COLUMN_TITLES = ["開始", "終了", "話者", "発話"]
+
+class UtteranceTableModel(QAbstractTableModel):
+    """文字起こし結果の発話を編集する表モデル（行は必要になった分だけ読み込む）"""
+
+    rows_edited = pyqtSignal(list)  # 編集された行番号のリスト
+
+    FETCH_SIZE = 500  # 一度に読み込む行数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transcript = Transcript()
+        self._loaded_rows = 0
+
+    def set_transcript(self, transcript: Transcript):
+        """文字起こし結果を設定"""
+        if transcript is self.transcript and len(transcript) >= self._loaded_rows:
+            # 同じ文字起こし結果に発話が追加された場合は、次の読み込みで表示される
+            return
+        self.beginResetModel()
+        self.transcript = transcript
+        self._loaded_rows = min(len(transcript), self.FETCH_SIZE)
+        self.endResetModel()
+
+    def refresh_rows(self, rows: List[int]):
+        """外部で変更された行を再表示"""
+        for row in rows:
+            if row < self._loaded_rows:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMN_TITLES) - 1))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMN_TITLES)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self._loaded_rows < len(self.transcript)
+
+    def fetchMore(self, parent: QModelIndex):
+        """次の行をまとめて読み込む"""
+        count = min(len(self.transcript) - self._loaded_rows, self.FETCH_SIZE)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return COLUMN_TITLES[section]
+        return section + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        transcript = self.transcript
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_START:
+                return format_time(float(transcript.starts[row]))
+            if column == COLUMN_END:
+                return format_time(float(transcript.ends[row]))
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == COLUMN_START:
+                return float(transcript.starts[row])
+            if column == COLUMN_END:
+                return float(transcript.ends[row])
+            if column == COLUMN_SPEAKER:
+                return transcript.speaker(row)
+            if column == COLUMN_TEXT:
+                return transcript.texts[row]
+        if role == Qt.ItemDataRole.ToolTipRole and column == COLUMN_TEXT:
+            return transcript.texts[row]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """1つのセルを更新（変更した行だけを文字起こし結果に反映）"""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        entry = self.transcript.entry(row)
+        key = ("start", "end", "speaker", "text")[column]
+        if column == COLUMN_SPEAKER:
+            value = str(value).strip()
+            if not value:
+                return False
+        if entry[key] == value:
+            return False
+        entry[key] = value
+        if entry["start"] > entry["end"]:
+            # 開始が終了より後になる編集は受け付けない
+            return False
+        try:
+            self.transcript.set_entry(row, entry)
+        except ValueError:
+            return False
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMN_TITLES) - 1))
+        self.rows_edited.emit([row])
+        return True
+
+class TimeDelegate(QStyledItemDelegate):
+    """時刻（秒）を編集するデリゲート"""
+
+    def createEditor(self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> QWidget:
+        editor = QDoubleSpinBox(parent)
+        editor.setDecimals(3)
+        editor.setRange(0, 10 ** 7)
+        editor.setSingleStep(0.1)
+        editor.setSuffix(" 秒")
+        return editor
+
+class UtteranceTableView(QTableView):
+    """発話の表形式エディタ"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table_model = UtteranceTableModel(self)
+        self.setModel(self.table_model)
+        self.setup_view()
+
+    def setup_view(self):
+        """表示の設定"""
+        self.setFont(QFont(
+            FONT_SETTINGS["result"]["family"],
+            FONT_SETTINGS["result"]["size"]
+        ))
+        self.time_delegate = TimeDelegate(self)
+        self.setItemDelegateForColumn(COLUMN_START, self.time_delegate)
+        self.setItemDelegateForColumn(COLUMN_END, self.time_delegate)
+
+        header = self.horizontalHeader()
+        # 時刻の列は表示形式が固定長のため、内容から幅を計算しない
+        time_width = self.fontMetrics().horizontalAdvance("00:00:00.000") + 24
+        for column in (COLUMN_START, COLUMN_END):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            header.resizeSection(column, time_width)
+        header.setSectionResizeMode(COLUMN_SPEAKER, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(COLUMN_TEXT, QHeaderView.ResizeMode.Stretch)
+        # 行の高さは固定にして、行数に比例した計算を避ける
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(44)
+        self.setWordWrap(True)
+        self.setAlternatingRowColors(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked |
+            QAbstractItemView.EditTrigger.EditKeyPressed |
+            QAbstractItemView.EditTrigger.AnyKeyPressed
+        )
+
+    def set_transcript(self, transcript: Transcript):
+        """文字起こし結果を設定"""
+        self.table_model.set_transcript(transcript)
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional
+from transcription_cache import CACHE_KEY_OPTIONS
+
+# チャンクの処理段階（この順に進む）
+CHUNK_CREATED = 'created'
+CHUNK_UPLOADED = 'uploaded'
+CHUNK_STARTED = 'started'
+CHUNK_COMPLETED = 'completed'
+
+class JobJournal:
+    """文字起こしジョブの進行状況をディスクに記録し、異常終了後の再開に使うジャーナル"""
+    DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.mocovoice', 'jobs')
+
+    def __init__(self, path: str, data: Dict):
+        self.path = path
+        self.data = data
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _job_id(file_path: str) -> str:
+        """ファイルのパス・サイズ・更新時刻からジョブIDを生成"""
+        stat = os.stat(file_path)
+        identity = f'{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}'
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:32]
+
+    @staticmethod
+    def _key_options(options: Dict) -> Dict:
+        # 分割の長さや重複区間が変わるとチャンクの区切りも変わるため比較対象に含める
+        return {name: options.get(name) for name in CACHE_KEY_OPTIONS + ('chunk_minutes', 'overlap_seconds')}
+
+    @classmethod
+    def open(cls, file_path: str, options: Dict, journal_dir: Optional[str] = None) -> 'JobJournal':
+        """ファイルに対応するジャーナルを開く（なければ新規作成）"""
+        journal_dir = journal_dir or cls.DEFAULT_DIR
+        os.makedirs(journal_dir, exist_ok=True)
+        path = os.path.join(journal_dir, f'{cls._job_id(file_path)}.json')
+
+        data = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # 結果に影響するオプションが異なる場合は以前の記録を使わない
+        if data is None or cls._key_options(data.get('options', {})) != cls._key_options(options):
+            if data is not None:
+                cls(path, data).discard()
+            data = {
+                'file_path': os.path.abspath(file_path),
+                'options': options,
+                'created': time.time(),
+                'chunks': {}
+            }
+        journal = cls(path, data)
+        journal._save()
+        return journal
+
+    @classmethod
+    def list_pending(cls, journal_dir: Optional[str] = None) -> List['JobJournal']:
+        """中断されたままのジャーナルを取得（元のファイルが存在するもののみ）"""
+        journal_dir = journal_dir or cls.DEFAULT_DIR
+        if not os.path.isdir(journal_dir):
+            return []
+        journals = []
+        for name in sorted(os.listdir(journal_dir)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(journal_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            file_path = data.get('file_path')
+            if not file_path or not os.path.exists(file_path):
+                continue
+            if cls._job_id(file_path) != name[:-len('.json')]:
+                # 元のファイルが更新されている
+                continue
+            journals.append(cls(path, data))
+        return journals
+
+    @property
+    def file_path(self) -> str:
+        return self.data['file_path']
+
+    @property
+    def options(self) -> Dict:
+        return self.data['options']
+
+    def _save(self):
+        """ジャーナルを書き出す（途中で落ちても壊れないよう置き換えで保存）"""
+        self.data['updated'] = time.time()
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _result_path(self, index: int) -> str:
+        return f'{os.path.splitext(self.path)[0]}_chunk{index}.txt'
+
+    def set_total_chunks(self, total_chunks: int):
+        """分割数を記録（前回と異なる場合はチャンクの記録を破棄）"""
+        with self._lock:
+            if self.data.get('total_chunks') not in (None, total_chunks):
+                for index in list(self.data['chunks'].keys()):
+                    try:
+                        os.remove(self._result_path(int(index)))
+                    except OSError:
+                        pass
+                self.data['chunks'] = {}
+            self.data['total_chunks'] = total_chunks
+            self._save()
+
+    def get_chunk(self, index: int) -> Dict:
+        """チャンクの記録を取得"""
+        with self._lock:
+            return dict(self.data['chunks'].get(str(index), {}))
+
+    def count_completed(self) -> int:
+        """完了済みのチャンク数"""
+        with self._lock:
+            return sum(1 for chunk in self.data['chunks'].values() if chunk.get('state') == CHUNK_COMPLETED)
+
+    def update_chunk(self, index: int, state: str, **fields):
+        """チャンクの処理段階を記録"""
+        with self._lock:
+            chunk = self.data['chunks'].setdefault(str(index), {})
+            chunk.update(fields)
+            chunk['state'] = state
+            self._save()
+
+    def complete_chunk(self, index: int, result: str):
+        """チャンクの結果を保存して完了を記録"""
+        result_path = self._result_path(index)
+        temp_path = f'{result_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(result)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, result_path)
+        self.update_chunk(index, CHUNK_COMPLETED)
+
+    def load_result(self, index: int) -> Optional[str]:
+        """完了済みチャンクの結果を読み込む"""
+        try:
+            with open(self._result_path(index), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def discard(self):
+        """ジャーナルと保存した結果を削除"""
+        with self._lock:
+            for index in list(self.data.get('chunks', {}).keys()):
+                try:
+                    os.remove(self._result_path(int(index)))
+                except OSError:
+                    pass
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
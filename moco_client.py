@@ -1,8 +1,10 @@
 import os
-import json
 import time
+import threading
 import requests
-from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from retry_policy import IDEMPOTENT_METHODS, CircuitBreaker, CircuitOpenError, RetryPolicy
 
 MIME_TYPES = {
     '.wav': 'audio/wav',
@@ -13,14 +15,104 @@ MIME_TYPES = {
 
 class MocoVoiceError(Exception):
     """MocoVoice APIのエラー"""
-    pass
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None,
+                 circuit_open: bool = False):
+        super().__init__(message)
+        self.retryable = retryable  # 時間をおいて再試行すれば成功しうるか
+        self.retry_after = retry_after  # サーバーが指定した待ち時間（秒）
+        self.circuit_open = circuit_open  # サーキットブレーカーが遮断したため送信しなかったか
+
+class UploadTimeoutError(Exception):
+    """アップロード全体の制限時間を超えた"""
+
+class UploadStream:
+    """ファイルを固定サイズのブロックで読み出し、送信状況を通知するストリーム"""
+    BLOCK_SIZE = 256 * 1024  # 256KB
+
+    def __init__(self, file_path: str, callback: Optional[Callable[[int, int, float], None]] = None,
+                 time_limit: Optional[float] = None):
+        self.file_path = file_path
+        self.total_size = os.path.getsize(file_path)
+        self.callback = callback
+        self.time_limit = time_limit  # 送信全体の制限時間（秒）
+        self.sent = 0
+        self.started_at = None
+
+    def __len__(self) -> int:
+        # Content-Lengthを送るために必要（チャンク転送にしない）
+        return self.total_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.sent = 0
+        self.started_at = time.monotonic()
+        with open(self.file_path, 'rb') as f:
+            while True:
+                # 読み取りタイムアウトはバイト間の待ち時間しか制限しないため、全体の時間はここで確認
+                if self.time_limit is not None and time.monotonic() - self.started_at > self.time_limit:
+                    raise UploadTimeoutError(f"アップロードが制限時間（{self.time_limit:.0f}秒）内に終わりませんでした")
+                block = f.read(self.BLOCK_SIZE)
+                if not block:
+                    break
+                yield block
+                self.sent += len(block)
+                if self.callback:
+                    self.callback(self.sent, self.total_size, self.bytes_per_sec())
+
+    def bytes_per_sec(self) -> float:
+        """送信開始からの平均スループット"""
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """閉じた接続プールの利用回数も集計に残すアダプター
+
+    プールの数が pool_connections を超えると古いプールが破棄され、
+    その num_requests / num_connections も失われるため、破棄時に加算しておく。
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.retired_requests = 0
+        self.retired_connections = 0
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def retire(pool):
+            self.retired_requests += pool.num_requests
+            self.retired_connections += pool.num_connections
+            if dispose:
+                dispose(pool)
+
+        pools.dispose_func = retire
 
 class MocoVoiceClient:
-    MAX_RETRIES = 5
-    RETRY_DELAY = 5  # 秒
+    POOL_CONNECTIONS = 4  # 接続プールを保持するホスト数
+    POOL_MAXSIZE = 8  # ホストごとの最大接続数
+    UPLOAD_STALL_TIMEOUT = 60  # 送信・応答が途切れたとみなす秒数
+    UPLOAD_MIN_TIMEOUT = 30  # アップロード全体の制限時間の下限（秒）
+    INITIAL_UPLOAD_BANDWIDTH = 256 * 1024  # 実測前に想定する帯域（bytes/秒）
+
+    # 直近のアップロードで実測した帯域（全体の制限時間の算出に使用）
+    _upload_bandwidth = INITIAL_UPLOAD_BANDWIDTH
+
+    # プロセス内で共有するセッション（プール設定ごとに1つ）
+    _shared_sessions: Dict[Tuple[int, int], requests.Session] = {}
+    _session_lock = threading.Lock()
 
-    def __init__(self, api_key: str):
+    # API障害の検知はプロセス内の全クライアントで共有
+    _circuit_breaker = CircuitBreaker()
+    # アップロード先のストレージはAPIとは別のホストのため、障害も別に検知する
+    _storage_breaker = CircuitBreaker()
+
+    def __init__(self, api_key: str, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None):
         self.api_key = api_key
+        self.pool_connections = pool_connections or self.POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self.session = self._get_shared_session(self.pool_connections, self.pool_maxsize)
+        self.retry_policy = RetryPolicy(breaker=self._circuit_breaker)
+        self.upload_policy = RetryPolicy(breaker=self._storage_breaker)
         # ★ ここのベースURLを修正： /api/v1 を含める
         self.base_url = 'https://api.mocomoco.ai/api/v1'
         self.headers = {
@@ -29,70 +121,100 @@ class MocoVoiceClient:
             'Content-Type': 'application/json'
         }
 
+    @classmethod
+    def _get_shared_session(cls, pool_connections: int, pool_maxsize: int) -> requests.Session:
+        """Keep-Aliveの接続プールを持つ共有セッションを取得"""
+        key = (pool_connections, pool_maxsize)
+        with cls._session_lock:
+            session = cls._shared_sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # pool_block=True でホストごとの接続数を上限内に抑える
+                adapter = CountingHTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=True
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._shared_sessions[key] = session
+            return session
+
+    def get_connection_stats(self, since: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """接続の再利用状況を取得
+
+        セッションはプロセス内で共有されるため、値は累計になる。処理ごとの値は
+        開始時に取得した値を since に渡して差分で求める。
+        """
+        total_requests = 0
+        new_connections = 0
+        seen = set()
+        for adapter in self.session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            total_requests += getattr(adapter, 'retired_requests', 0)
+            new_connections += getattr(adapter, 'retired_connections', 0)
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+        if since:
+            total_requests -= since['requests']
+            new_connections -= since['new_connections']
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(total_requests - new_connections, 0)
+        }
+
     def get_mime_type(self, file_path: str) -> str:
         ext = os.path.splitext(file_path)[1].lower()
         return MIME_TYPES.get(ext, 'application/octet-stream')
 
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """リトライ機能付きのリクエスト実行"""
-        last_error = None
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                response = requests.request(method, url, timeout=30, **kwargs)
-                
-                # サーバーエラー (5xx) の場合はリトライ
-                if response.status_code >= 500:
-                    error_msg = f"サーバーエラー (ステータスコード: {response.status_code})"
-                    if attempt < self.MAX_RETRIES - 1:
-                        print(f"リトライ {attempt + 1}/{self.MAX_RETRIES}: {error_msg}")
-                        time.sleep(self.RETRY_DELAY * (attempt + 1))
-                        continue
-                    raise MocoVoiceError(error_msg)
-                
-                response.raise_for_status()
-                return response
-                
-            except requests.exceptions.Timeout:
-                error_msg = "リクエストがタイムアウトしました"
-                if attempt < self.MAX_RETRIES - 1:
-                    print(f"リトライ {attempt + 1}/{self.MAX_RETRIES}: {error_msg}")
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-                    continue
-                raise MocoVoiceError(error_msg)
-                
-            except requests.exceptions.ConnectionError as e:
-                error_msg = f"接続エラー: {str(e)}"
-                if attempt < self.MAX_RETRIES - 1:
-                    print(f"リトライ {attempt + 1}/{self.MAX_RETRIES}: {error_msg}")
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-                    continue
-                raise MocoVoiceError(error_msg)
-                
-            except requests.exceptions.RequestException as e:
-                last_error = e
-                if attempt < self.MAX_RETRIES - 1:
-                    print(f"リトライ {attempt + 1}/{self.MAX_RETRIES}: {str(e)}")
-                    time.sleep(self.RETRY_DELAY * (attempt + 1))
-                    continue
-                break
-        
-        # 最終的なエラーハンドリング
-        if isinstance(last_error, requests.exceptions.HTTPError):
-            status_code = last_error.response.status_code
+    def _make_request(self, method: str, url: str, idempotent: Optional[bool] = None,
+                      max_attempts: Optional[int] = None, timeout=30, **kwargs) -> requests.Response:
+        """リトライ方針に従ったリクエスト実行"""
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        try:
+            response = self.retry_policy.call(
+                lambda: self.session.request(method, url, timeout=timeout, **kwargs),
+                idempotent=idempotent,
+                max_attempts=max_attempts
+            )
+        except CircuitOpenError as e:
+            raise MocoVoiceError(str(e), retry_after=e.retry_after, circuit_open=True)
+        except requests.exceptions.Timeout:
+            raise MocoVoiceError("リクエストがタイムアウトしました", retryable=True)
+        except requests.exceptions.ConnectionError as e:
+            raise MocoVoiceError(f"接続エラー: {str(e)}", retryable=True)
+        except requests.exceptions.RequestException as e:
+            raise MocoVoiceError(f"ネットワークエラー: {str(e)}")
+
+        if response.status_code >= 400:
+            status_code = response.status_code
             error_messages = {
                 400: "リクエストが不正です",
                 401: "APIキーが無効です",
                 403: "アクセス権限がありません",
                 404: "リソースが見つかりません",
+                429: "リクエストが多すぎます",
                 500: "サーバーエラーが発生しました",
                 502: "サーバーが一時的に利用できません",
                 503: "サービスが一時的に利用できません",
                 504: "ゲートウェイタイムアウト"
             }
             error_msg = error_messages.get(status_code, f"APIエラー (ステータスコード: {status_code})")
-            raise MocoVoiceError(error_msg)
-        else:
-            raise MocoVoiceError(f"ネットワークエラー: {str(last_error)}")
+            raise MocoVoiceError(
+                error_msg,
+                retryable=RetryPolicy.is_retryable_status(status_code, idempotent),
+                retry_after=RetryPolicy.parse_retry_after(response.headers.get('Retry-After'))
+            )
+        return response
 
     def create_transcription_job(self, filename: str, options: Optional[Dict] = None) -> Dict:
         """文字起こしジョブを作成"""
@@ -111,39 +233,65 @@ class MocoVoiceClient:
         response = self._make_request('POST', url, headers=self.headers, json=data)
         return response.json()
 
-    def upload_audio_file(self, upload_url: str, file_path: str) -> int:
-        """音声ファイルをアップロード"""
+    def _upload_time_limit(self, file_size: int) -> float:
+        """ファイルサイズと実測帯域からアップロード全体の制限時間（秒）を算出"""
+        expected = file_size / max(MocoVoiceClient._upload_bandwidth, 1)
+        return max(self.UPLOAD_MIN_TIMEOUT, expected * 2)
+
+    def upload_audio_file(self, upload_url: str, file_path: str,
+                          progress_callback: Optional[Callable[[int, int, float], None]] = None) -> int:
+        """音声ファイルをブロック単位でストリーミングアップロード"""
         mime_type = self.get_mime_type(file_path)
         headers = {'Content-Type': mime_type}
-        
-        with open(file_path, 'rb') as f:
-            response = self._make_request('PUT', upload_url, headers=headers, data=f)
+
+        def send() -> requests.Response:
+            # 署名付きURLへの単一PUTのため途中からの再開はできない。
+            # 失敗時はジョブを作り直さず、ファイルを先頭からストリームし直す
+            stream = UploadStream(file_path, progress_callback)
+            stream.time_limit = self._upload_time_limit(stream.total_size)
+            try:
+                # 読み取りタイムアウトは転送が途切れたことの検知にだけ使う
+                return self.session.put(
+                    upload_url,
+                    headers=headers,
+                    data=stream,
+                    timeout=(10, self.UPLOAD_STALL_TIMEOUT)
+                )
+            except UploadTimeoutError as e:
+                # タイムアウトとしてリトライ方針に渡す（次の試行は実測帯域で制限時間を算出し直す）
+                raise requests.exceptions.Timeout(str(e))
+            finally:
+                # 途中まで送れた場合も実測帯域を次回のタイムアウト算出に反映
+                if stream.bytes_per_sec() > 0:
+                    MocoVoiceClient._upload_bandwidth = stream.bytes_per_sec()
+
+        try:
+            response = self.upload_policy.call(send, idempotent=True)
+        except CircuitOpenError as e:
+            raise MocoVoiceError(str(e), retry_after=e.retry_after, circuit_open=True)
+        except requests.exceptions.RequestException as e:
+            raise MocoVoiceError(f"アップロード中の通信エラー: {str(e)}", retryable=True)
+
+        if response.status_code >= 400:
+            raise MocoVoiceError(
+                f"アップロードエラー (ステータスコード: {response.status_code})",
+                retryable=RetryPolicy.is_retryable_status(response.status_code, True)
+            )
         return response.status_code
 
     def start_transcription(self, transcription_id: str) -> Dict:
         """文字起こしを開始"""
         # /api/v1/transcriptions/<id>/transcribe に変更
         url = f'{self.base_url}/transcriptions/{transcription_id}/transcribe'
-        try:
-            # 空データを送るなら json={} または data=json.dumps({})
-            response = requests.post(url, headers=self.headers, json={}, timeout=30)
-            
-            print(f"Start transcription response: Status={response.status_code}")
-            if response.status_code != 200:
-                print(f"Response content: {response.text}")
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Start transcription error: {str(e)}")
-            raise MocoVoiceError(f"書き起こし開始エラー: {str(e)}")
+        # 同じIDへの開始要求は何度送っても結果が同じため冪等として扱う
+        response = self._make_request('POST', url, idempotent=True, headers=self.headers, json={})
+        return response.json()
 
-    def get_transcription_status(self, transcription_id: str) -> Dict:
+    def get_transcription_status(self, transcription_id: str, max_attempts: Optional[int] = None) -> Dict:
         """文字起こしの状態を取得"""
         # /api/v1/transcriptions/<id>
         url = f'{self.base_url}/transcriptions/{transcription_id}'
-        response = self._make_request('GET', url, headers=self.headers)
+        response = self._make_request('GET', url, max_attempts=max_attempts, headers=self.headers)
         return response.json()
 
     def get_transcription_result(self, transcription_path: str) -> str:
@@ -1,7 +1,12 @@
 import json
-from typing import List, Dict
+from difflib import SequenceMatcher
+from typing import List, Dict, Optional, Set, Tuple
 
 class TranscriptionMerger:
+    TIME_OVERLAP_RATIO = 0.5  # 短い方の発話の長さに対して必要な時間の重なり
+    TIME_TOLERANCE = 1.0  # 同じ発話とみなす中心時刻のずれ（秒）
+    TEXT_SIMILARITY = 0.6  # 同じ発話とみなす文字列の類似度
+
     @staticmethod
     def merge_results(results: List[str], include_speaker: bool = False) -> str:
         """複数の文字起こし結果を統合"""
@@ -29,8 +34,106 @@ class TranscriptionMerger:
         return "\n".join(merged_texts)
 
     @staticmethod
-    def merge_json_results(results: List[str]) -> str:
-        """複数のJSON形式の文字起こし結果を統合"""
+    def _has_times(entry: Dict) -> bool:
+        """発話に数値の開始・終了時刻があるか"""
+        return (isinstance(entry.get('start'), (int, float)) and
+                isinstance(entry.get('end'), (int, float)))
+
+    @staticmethod
+    def _is_duplicate(a: Dict, b: Dict) -> bool:
+        """重複区間の2つの発話が同じ内容か（時間の重なりと文字列の類似度で判定）"""
+        if not (TranscriptionMerger._has_times(a) and TranscriptionMerger._has_times(b)):
+            return False
+        overlap = min(a['end'], b['end']) - max(a['start'], b['start'])
+        shortest = min(a['end'] - a['start'], b['end'] - b['start'])
+        mid_gap = abs((a['start'] + a['end']) - (b['start'] + b['end'])) / 2
+        if overlap < shortest * TranscriptionMerger.TIME_OVERLAP_RATIO and mid_gap > TranscriptionMerger.TIME_TOLERANCE:
+            return False
+
+        text_a = a.get('text', '').strip()
+        text_b = b.get('text', '').strip()
+        if not text_a or not text_b:
+            return False
+        # チャンクの端で途切れた発話は、もう一方の一部になっている
+        if text_a in text_b or text_b in text_a:
+            return True
+        matcher = SequenceMatcher(None, text_a, text_b)
+        if matcher.quick_ratio() < TranscriptionMerger.TEXT_SIMILARITY:
+            return False
+        return matcher.ratio() >= TranscriptionMerger.TEXT_SIMILARITY
+
+    @staticmethod
+    def _reconcile_overlap(merged: List[Dict], entries: List[Dict], overlap_start: float, overlap_end: float) -> List[Dict]:
+        """重複区間の発話を照合し、重複を除いた次のチャンクの発話を返す
+
+        merged の末尾（前のチャンクの重複区間部分）はその場で取り除く。
+        どちらの発話を残すかは重複区間の中央を境に、チャンクの端から遠い側を優先する。
+        時刻のない発話は照合できないため、比較せずにそのまま残す。
+        """
+        boundary = (overlap_start + overlap_end) / 2
+        has_times = TranscriptionMerger._has_times
+
+        # 前のチャンクのうち重複区間にかかる末尾の発話（時間順に並んでいる前提）
+        tail_start = len(merged)
+        while tail_start > 0:
+            entry = merged[tail_start - 1]
+            if has_times(entry) and entry['end'] <= overlap_start:
+                break
+            tail_start -= 1
+        tail = merged[tail_start:]
+
+        # 次のチャンクのうち重複区間にかかる先頭の発話
+        head_end = 0
+        while head_end < len(entries):
+            entry = entries[head_end]
+            if has_times(entry) and entry['start'] >= overlap_end:
+                break
+            head_end += 1
+        head = entries[:head_end]
+
+        keep_tail = [not has_times(entry) or (entry['start'] + entry['end']) / 2 < boundary for entry in tail]
+        keep_head = [not has_times(entry) or (entry['start'] + entry['end']) / 2 >= boundary for entry in head]
+
+        # 2つのポインタで時間の近い発話同士だけを比較（区間内の発話数に比例）
+        timed_tail = [k for k, entry in enumerate(tail) if has_times(entry)]
+        j = 0
+        for h, head_entry in enumerate(head):
+            if not has_times(head_entry):
+                continue
+            while j < len(timed_tail) and tail[timed_tail[j]]['end'] < head_entry['start'] - TranscriptionMerger.TIME_TOLERANCE:
+                j += 1
+            for k in timed_tail[j:]:
+                if tail[k]['start'] > head_entry['end'] + TranscriptionMerger.TIME_TOLERANCE:
+                    break
+                if TranscriptionMerger._is_duplicate(tail[k], head_entry):
+                    # 同じ発話はどちらか一方だけ残す
+                    tail_mid = (tail[k]['start'] + tail[k]['end']) / 2
+                    keep_tail[k] = tail_mid < boundary
+                    keep_head[h] = not keep_tail[k]
+                    break
+
+        del merged[tail_start:]
+        merged.extend(entry for entry, keep in zip(tail, keep_tail) if keep)
+        return [entry for entry, keep in zip(head, keep_head) if keep] + entries[head_end:]
+
+    @staticmethod
+    def merge_json_results(results: List[str], chunk_ranges: Optional[List[Tuple[float, float]]] = None) -> str:
+        """複数のJSON形式の文字起こし結果を統合
+
+        chunk_ranges に各チャンクの元音声上の範囲（開始秒, 終了秒）を渡すと、
+        開始時刻でオフセットし、隣接チャンクが重なる区間の重複した発話を取り除く。
+        """
+        if chunk_ranges:
+            merger = IncrementalMerger(chunk_ranges)
+            merged_entries = []
+            for index, result in enumerate(results):
+                if result:
+                    merged_entries.extend(merger.add_chunk(index, result))
+                else:
+                    merged_entries.extend(merger.mark_missing(index))
+            merged_entries.extend(merger.finish())
+            return json.dumps(merged_entries, ensure_ascii=False, indent=2)
+
         merged_entries = []
         current_time_offset = 0.0
         
@@ -53,3 +156,118 @@ class TranscriptionMerger:
                 continue
 
         return json.dumps(merged_entries, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def jsonl_to_json(jsonl_path: str, json_path: str):
+        """JSONLファイルを1行ずつ読みながらJSON配列のファイルに変換
+
+        出力は json.dumps(entries, indent=2) と同じ形式にする。
+        """
+        with open(jsonl_path, 'r', encoding='utf-8') as src, open(json_path, 'w', encoding='utf-8') as dst:
+            dst.write('[')
+            first = True
+            for line in src:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.dumps(json.loads(line), ensure_ascii=False, indent=2)
+                dst.write('\n  ' if first else ',\n  ')
+                dst.write(entry.replace('\n', '\n  '))
+                first = False
+            dst.write(']' if first else '\n]')
+
+class IncrementalMerger:
+    """完了順に届くチャンクの結果を統合し、先頭から揃った部分を逐次出力するクラス"""
+
+    def __init__(self, chunk_ranges: List[Tuple[float, float]], output_path: Optional[str] = None):
+        self.chunk_ranges = chunk_ranges
+        self._pending: Dict[int, List[Dict]] = {}
+        self._next_index = 0
+        # 次のチャンクとの重複区間にかかるため出力を保留している発話
+        self._tail: List[Dict] = []
+        # 結果が得られなかったチャンクの番号
+        self._missing: Set[int] = set()
+        self._output = open(output_path, 'w', encoding='utf-8') if output_path else None
+
+    @staticmethod
+    def _parse(result: str) -> List[Dict]:
+        try:
+            entries = json.loads(result)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(entries, list):
+            return []
+        return [entry for entry in entries if isinstance(entry, dict)]
+
+    def add_chunk(self, index: int, result: str) -> List[Dict]:
+        """チャンクの結果を追加し、新たに確定した発話を返す"""
+        self._pending[index] = self._parse(result)
+        return self._advance()
+
+    def mark_missing(self, index: int) -> List[Dict]:
+        """結果が得られなかったチャンクを記録し、新たに確定した発話を返す
+
+        欠けたチャンクの前後は重複の照合をせず、そのまま後続のチャンクへ進む。
+        """
+        self._missing.add(index)
+        self._pending[index] = []
+        return self._advance()
+
+    def finish(self) -> List[Dict]:
+        """残りの発話を全て確定して返す（届かなかったチャンクは欠けたものとして扱う）"""
+        for index in range(self._next_index, len(self.chunk_ranges)):
+            if index not in self._pending:
+                self._missing.add(index)
+                self._pending[index] = []
+        # 最後のチャンクの処理で保留中の発話も全て確定する
+        emitted = self._advance()
+        if self._output:
+            self._output.close()
+            self._output = None
+        return emitted
+
+    def _advance(self) -> List[Dict]:
+        """先頭から揃ったチャンクを処理し、確定した発話を書き出して返す"""
+        emitted = []
+        while self._next_index in self._pending:
+            emitted.extend(self._process(self._next_index, self._pending.pop(self._next_index)))
+            self._next_index += 1
+        self._write(emitted)
+        return emitted
+
+    def _process(self, index: int, entries: List[Dict]) -> List[Dict]:
+        """チャンクの開始時刻でオフセットし、前のチャンクとの重複を除いて確定分を返す"""
+        start = self.chunk_ranges[index][0]
+        for entry in entries:
+            if 'start' in entry:
+                entry['start'] = entry['start'] + start
+            if 'end' in entry:
+                entry['end'] = entry['end'] + start
+
+        # 欠けたチャンクとの間には照合する相手がないため、重複の除去をしない
+        if index > 0 and index not in self._missing and index - 1 not in self._missing:
+            previous_end = self.chunk_ranges[index - 1][1]
+            if previous_end > start:
+                entries = TranscriptionMerger._reconcile_overlap(self._tail, entries, start, previous_end)
+
+        combined = self._tail + entries
+        if index in self._missing or index + 1 in self._missing or index + 1 >= len(self.chunk_ranges):
+            self._tail = []
+            return combined
+
+        # 次のチャンクの開始位置より後まで続く発話は、重複の照合が済むまで保留
+        next_start = self.chunk_ranges[index + 1][0]
+        split = len(combined)
+        while split > 0 and combined[split - 1].get('end', 0) > next_start:
+            split -= 1
+        self._tail = combined[split:]
+        return combined[:split]
+
+    def _write(self, entries: List[Dict]):
+        """確定した発話をJSONLとして追記"""
+        if not self._output or not entries:
+            return
+        for entry in entries:
+            self._output.write(json.dumps(entry, ensure_ascii=False))
+            self._output.write('\n')
+        self._output.flush()
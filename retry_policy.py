@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+import requests
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# 一時的な障害を表し、再試行で成功しうるステータス
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# サーバーがリクエストを処理していないことが明らかなため、
+# 冪等でないリクエストでも再試行してよいステータス
+SAFE_RETRY_STATUS_CODES = {429, 503}
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため送信を中止した"""
+    def __init__(self, retry_after: float, half_open: bool = False):
+        if half_open:
+            message = "APIが応答しないため一時的に送信を停止しています（復旧を確認中）"
+        else:
+            message = f"APIが応答しないため一時的に送信を停止しています（約{retry_after:.0f}秒後に再開）"
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.half_open = half_open  # 復旧確認の試行の結果待ちで遮断しているか
+
+class CircuitBreaker:
+    """連続した障害を検知して一定時間リクエストを遮断するサーキットブレーカー"""
+    FAILURE_THRESHOLD = 5  # 連続失敗がこの回数に達したら遮断
+    RESET_TIMEOUT = 60.0  # 遮断してから試行を再開するまでの秒数
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or self.FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or self.RESET_TIMEOUT
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """リクエストを送信してよいか判定"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # 半開状態では試行を1つだけ通す
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def remaining(self) -> float:
+        """遮断が解除されるまでの残り秒数"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def record_success(self):
+        """成功を記録"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """障害とも成功とも判断できない結果のとき、半開状態の試行枠を戻す"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """一時的な障害を記録"""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class RetryPolicy:
+    """全てのAPI呼び出しで共通のリトライ・バックオフ方針"""
+    MAX_ATTEMPTS = 5
+    BASE_DELAY = 1.0  # 秒
+    MAX_DELAY = 60.0  # 秒
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, breaker: Optional[CircuitBreaker] = None):
+        self.max_attempts = max_attempts or self.MAX_ATTEMPTS
+        self.base_delay = base_delay or self.BASE_DELAY
+        self.max_delay = max_delay or self.MAX_DELAY
+        self.breaker = breaker or CircuitBreaker()
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-Afterヘッダー（秒数またはHTTP日付）を秒数に変換"""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(retry_at.timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt回目の失敗後の待ち時間（指数バックオフ + フルジッター）"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        cap = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def is_retryable_status(status_code: int, idempotent: bool) -> bool:
+        """ステータスコードが再試行の対象か判定"""
+        if idempotent:
+            return status_code in RETRYABLE_STATUS_CODES
+        return status_code in SAFE_RETRY_STATUS_CODES
+
+    @staticmethod
+    def is_retryable_exception(error: requests.exceptions.RequestException, idempotent: bool) -> bool:
+        """通信エラーが再試行の対象か判定"""
+        # 接続確立前の失敗はサーバーに届いていないため常に再試行できる
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            return idempotent
+        return False
+
+    def call(self, send: Callable[[], requests.Response], idempotent: bool = True,
+             max_attempts: Optional[int] = None) -> requests.Response:
+        """方針に従ってリクエストを送信する
+
+        再試行の対象外となったレスポンス、または最後の試行のレスポンスを返す。
+        再試行できない通信エラーと最後の試行の通信エラーはそのまま送出する。
+        """
+        attempts = max_attempts or self.max_attempts
+        for attempt in range(1, attempts + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(self.breaker.remaining(), self.breaker.state == CircuitBreaker.HALF_OPEN)
+
+            retry_after = None
+            try:
+                response = send()
+            except requests.exceptions.RequestException as e:
+                retryable = self.is_retryable_exception(e, idempotent)
+                if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release()
+                if not retryable or attempt == attempts:
+                    raise
+                reason = str(e)
+            except BaseException:
+                # ファイルの読み込みや進捗コールバックの失敗でも試行枠を返す
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code < 500 and response.status_code != 429:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+                if not self.is_retryable_status(response.status_code, idempotent) or attempt == attempts:
+                    return response
+                retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+                reason = f"ステータスコード {response.status_code}"
+
+            delay = self.compute_delay(attempt, retry_after)
+            print(f"リトライ {attempt}/{attempts - 1}: {reason}（{delay:.1f}秒後）")
+            time.sleep(delay)
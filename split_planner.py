@@ -0,0 +1,93 @@
+import subprocess
+from typing import List, Optional, Tuple
+import numpy as np
+
+class SplitPlanner:
+    """無音に近い位置を分割点として選ぶプランナー"""
+    SAMPLE_RATE = 8000  # 解析用にダウンサンプリングするレート（Hz）
+    FRAME_SECONDS = 0.05  # エネルギーを計算するフレーム長（秒）
+    SMOOTHING_SECONDS = 0.3  # 短い途切れを無音と誤認しないための平滑化幅（秒）
+    BLOCK_SECONDS = 60  # 一度に読み込むPCMの長さ（秒）
+    TOLERANCE_RATIO = 0.1  # 目標の分割位置からずらしてよい範囲（チャンク長に対する割合）
+    MAX_TOLERANCE_SECONDS = 120.0
+
+    @staticmethod
+    def compute_energy_envelope(ffmpeg: str, file_path: str) -> np.ndarray:
+        """音声をブロック単位で読み込み、フレームごとのRMSエネルギーを計算"""
+        frame_len = int(SplitPlanner.SAMPLE_RATE * SplitPlanner.FRAME_SECONDS)
+        block_bytes = SplitPlanner.SAMPLE_RATE * SplitPlanner.BLOCK_SECONDS * 2  # 16bit
+
+        # モノラル・低サンプルレートのPCMとしてパイプで受け取る（全体はメモリに載せない）
+        process = subprocess.Popen([
+            ffmpeg,
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-i', file_path,
+            '-vn',
+            '-ac', '1',
+            '-ar', str(SplitPlanner.SAMPLE_RATE),
+            '-f', 's16le',
+            '-'
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        envelopes = []
+        remainder = np.empty(0, dtype=np.float32)
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype=np.int16).astype(np.float32)
+                samples = np.concatenate((remainder, samples))
+                usable = len(samples) - len(samples) % frame_len
+                frames = samples[:usable].reshape(-1, frame_len)
+                envelopes.append(np.sqrt(np.mean(frames * frames, axis=1)))
+                remainder = samples[usable:]
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+        if not envelopes:
+            return np.empty(0, dtype=np.float32)
+
+        envelope = np.concatenate(envelopes)
+        width = max(int(SplitPlanner.SMOOTHING_SECONDS / SplitPlanner.FRAME_SECONDS), 1)
+        return np.convolve(envelope, np.ones(width, dtype=np.float32) / width, mode='same')
+
+    @staticmethod
+    def plan_from_envelope(envelope: np.ndarray, total_seconds: float, target_seconds: float,
+                           max_seconds: float, tolerance_seconds: Optional[float] = None) -> List[Tuple[float, float]]:
+        """エネルギー包絡から、各目標位置の前後で最も静かな点を分割点に選ぶ"""
+        if tolerance_seconds is None:
+            tolerance_seconds = min(target_seconds * SplitPlanner.TOLERANCE_RATIO,
+                                    SplitPlanner.MAX_TOLERANCE_SECONDS)
+        frame = SplitPlanner.FRAME_SECONDS
+
+        # 残りがこの長さ以下なら分割しない（末尾に短すぎるチャンクを作らない）
+        last_chunk_limit = min(target_seconds + tolerance_seconds, max_seconds)
+
+        plan = []
+        start = 0.0
+        while total_seconds - start > last_chunk_limit:
+            # 前の分割点からの相対位置で探索範囲を決め、最大長を超えないようにする
+            window_start = start + target_seconds - tolerance_seconds
+            window_end = min(start + target_seconds + tolerance_seconds, start + max_seconds)
+            first = int(window_start / frame)
+            last = min(int(window_end / frame), len(envelope))
+            if first < last:
+                cut = (first + int(np.argmin(envelope[first:last]))) * frame
+            else:
+                cut = min(start + target_seconds, start + max_seconds)
+            plan.append((start, cut))
+            start = cut
+        plan.append((start, total_seconds))
+        return plan
+
+    @staticmethod
+    def plan(ffmpeg: str, file_path: str, total_seconds: float, target_seconds: float,
+             max_seconds: float) -> List[Tuple[float, float]]:
+        """ファイルを解析して分割位置（開始秒, 終了秒）のリストを作成"""
+        envelope = SplitPlanner.compute_energy_envelope(ffmpeg, file_path)
+        return SplitPlanner.plan_from_envelope(envelope, total_seconds, target_seconds, max_seconds)
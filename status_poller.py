@@ -0,0 +1,193 @@
+import heapq
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from moco_client import MocoVoiceClient, MocoVoiceError
+
+TERMINAL_STATUSES = ('COMPLETED', 'FAILED', 'CANCELLED')
+
+class AdaptivePollScheduler:
+    """音声の長さと実測の処理速度からポーリング間隔を決めるスケジューラ"""
+    MIN_INTERVAL = 1.0  # 秒
+    MAX_INTERVAL = 30.0  # 秒
+    BASE_OVERHEAD = 5.0  # ジョブ開始までの待ち時間の見込み（秒）
+    INITIAL_REALTIME_FACTOR = 0.2  # 処理時間 / 音声の長さ の初期推定値
+    NEAR_COMPLETION = 3.0  # 残り時間の推定がこれ以下なら即座にポーリング（秒）
+    BACKOFF_FACTOR = 1.5
+    JITTER = 0.2  # ±20%
+    SMOOTHING = 0.3  # 処理速度の指数移動平均の重み
+
+    def __init__(self):
+        self.realtime_factor = self.INITIAL_REALTIME_FACTOR
+        self._lock = threading.Lock()
+
+    def estimate_total(self, audio_seconds: float) -> float:
+        """ジョブ完了までの所要時間を推定（秒）"""
+        with self._lock:
+            factor = self.realtime_factor
+        return self.BASE_OVERHEAD + audio_seconds * factor
+
+    def next_delay(self, audio_seconds: float, elapsed: float, overdue_polls: int) -> float:
+        """次のポーリングまでの待ち時間を計算（秒）"""
+        remaining = self.estimate_total(audio_seconds) - elapsed
+        if remaining > self.NEAR_COMPLETION:
+            # 完了見込みまでは間隔を空ける（状態表示のため上限あり）
+            delay = min(remaining - self.NEAR_COMPLETION / 2, self.MAX_INTERVAL)
+        elif overdue_polls == 0:
+            # 完了間近と推定されたら即座に確認
+            return max(remaining, 0.0)
+        else:
+            # 推定を過ぎた後は指数バックオフ
+            delay = min(self.MIN_INTERVAL * self.BACKOFF_FACTOR ** (overdue_polls - 1), self.MAX_INTERVAL)
+        delay *= random.uniform(1 - self.JITTER, 1 + self.JITTER)
+        return max(delay, self.MIN_INTERVAL)
+
+    def record_completion(self, audio_seconds: float, elapsed: float):
+        """完了したジョブの実測値から処理速度の推定を更新"""
+        if audio_seconds <= 0:
+            return
+        observed = max(elapsed - self.BASE_OVERHEAD, 0.0) / audio_seconds
+        with self._lock:
+            self.realtime_factor += self.SMOOTHING * (observed - self.realtime_factor)
+
+class _PollJob:
+    """ポーリング対象のジョブ"""
+    __slots__ = ('transcription_id', 'audio_seconds', 'on_status', 'started_at',
+                 'overdue_polls', 'error_count', 'result', 'error', 'done')
+
+    def __init__(self, transcription_id: str, audio_seconds: float,
+                 on_status: Optional[Callable[[str], None]]):
+        self.transcription_id = transcription_id
+        self.audio_seconds = audio_seconds
+        self.on_status = on_status
+        self.started_at = time.monotonic()
+        self.overdue_polls = 0
+        self.error_count = 0
+        self.result: Optional[Dict] = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+class StatusPoller:
+    """複数の文字起こしジョブの状態確認を1つのループでまとめて行うポーラー"""
+
+    def __init__(self, client: MocoVoiceClient, scheduler: Optional[AdaptivePollScheduler] = None):
+        self.client = client
+        self.scheduler = scheduler or AdaptivePollScheduler()
+        self._jobs: Dict[str, _PollJob] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._counter = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self):
+        """ポーリングループを開始"""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='StatusPoller', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """ポーリングループを停止"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _schedule(self, job: _PollJob, delay: float):
+        """次のポーリング時刻をキューに登録（ロック取得済みで呼ぶ）"""
+        self._counter += 1
+        heapq.heappush(self._queue, (time.monotonic() + delay, self._counter, job.transcription_id))
+        self._condition.notify_all()
+
+    def wait(self, transcription_id: str, audio_seconds: float,
+             on_status: Optional[Callable[[str], None]] = None,
+             is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[Dict]:
+        """ジョブが終了状態になるまで待機し、最後のステータスを返す（キャンセル時はNone）"""
+        job = _PollJob(transcription_id, audio_seconds, on_status)
+        with self._condition:
+            self._jobs[transcription_id] = job
+            self._schedule(job, self.scheduler.MIN_INTERVAL)
+        self.start()
+
+        try:
+            while not job.done.wait(0.5):
+                if is_cancelled and is_cancelled():
+                    return None
+        finally:
+            with self._condition:
+                self._jobs.pop(transcription_id, None)
+
+        if job.error:
+            raise job.error
+        return job.result
+
+    def _run(self):
+        """ポーリングループ"""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._queue:
+                        wait_time = self._queue[0][0] - time.monotonic()
+                        if wait_time <= 0:
+                            break
+                        self._condition.wait(wait_time)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+                _, _, transcription_id = heapq.heappop(self._queue)
+                job = self._jobs.get(transcription_id)
+            if job is None or job.done.is_set():
+                continue
+            try:
+                self._poll(job)
+            except Exception as e:
+                # 想定外のエラーは待機側に伝えてループは継続
+                job.error = e
+                job.done.set()
+
+    def _poll(self, job: _PollJob):
+        """1つのジョブの状態を確認し、次回のポーリングを登録"""
+        # 待機中に他のジョブのポーリングを止めないよう、再試行はループ側で予約する
+        policy = self.client.retry_policy
+        try:
+            result = self.client.get_transcription_status(job.transcription_id, max_attempts=1)
+            job.error_count = 0
+        except MocoVoiceError as e:
+            if e.circuit_open:
+                # 遮断中はリクエストを送っていないため失敗に数えず、解除を待って確認を続ける
+                with self._condition:
+                    self._schedule(job, max(e.retry_after or 0.0, self.scheduler.MIN_INTERVAL))
+                return
+            job.error_count += 1
+            if not e.retryable or job.error_count >= policy.max_attempts:
+                job.error = e
+                job.done.set()
+                return
+            with self._condition:
+                self._schedule(job, policy.compute_delay(job.error_count, e.retry_after))
+            return
+
+        status = result['status']
+        if job.on_status:
+            job.on_status(status)
+
+        elapsed = time.monotonic() - job.started_at
+        if status in TERMINAL_STATUSES:
+            if status == 'COMPLETED':
+                self.scheduler.record_completion(job.audio_seconds, elapsed)
+            job.result = result
+            job.done.set()
+            return
+
+        delay = self.scheduler.next_delay(job.audio_seconds, elapsed, job.overdue_polls)
+        if self.scheduler.estimate_total(job.audio_seconds) - elapsed <= self.scheduler.NEAR_COMPLETION:
+            job.overdue_polls += 1
+        with self._condition:
+            self._schedule(job, delay)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# テストはリポジトリ直下のモジュールをそのままimportする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """GUIのテストで使うQApplication（画面のない環境ではoffscreenで動かす）"""
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
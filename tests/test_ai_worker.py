@@ -0,0 +1,106 @@
+import threading
+import time
+import types
+
+import pytest
+
+from gpt_processor import GPTProcessor
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+ai_worker = pytest.importorskip("gui.ai_worker", exc_type=ImportError)
+
+
+def chunk(text):
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+
+
+class FakeStream:
+    """断片を一定間隔で返し、閉じると受信待ちが打ち切られるストリーム"""
+
+    def __init__(self, parts, delay=0.0, first_delay=0.0):
+        self.parts = parts
+        self.delay = delay
+        self.first_delay = first_delay
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        if self.closed.wait(self.first_delay):
+            raise ConnectionError("stream closed")
+        for part in self.parts:
+            if self.closed.wait(self.delay):
+                raise ConnectionError("stream closed")
+            yield chunk(part)
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeProcessor(GPTProcessor):
+    def __init__(self, stream, timeout=5.0):
+        self.stream = stream
+        self.timeout = timeout
+        self.prompt = "prompt"
+
+    def open_stream(self, text, prompt=None):
+        return self.stream
+
+
+def run_worker(qapp, processor, cancel_after=None, timeout=5.0):
+    """ワーカーを実行し、通知されたシグナルを返す"""
+    worker = ai_worker.AIProcessingWorker(processor, "prompt", "text")
+    events = {'partials': []}
+    worker.result_ready.connect(lambda text: events.setdefault('finished', text))
+    worker.error.connect(lambda message: events.setdefault('error', message))
+    worker.cancelled.connect(lambda: events.setdefault('cancelled', True))
+    worker.partial_result.connect(events['partials'].append)
+
+    started = time.monotonic()
+    worker.start()
+    cancelled = False
+    while not {'finished', 'error', 'cancelled'} & events.keys():
+        elapsed = time.monotonic() - started
+        assert elapsed < timeout, "worker did not finish"
+        if cancel_after is not None and not cancelled and elapsed > cancel_after:
+            worker.cancel()
+            cancelled = True
+        qapp.processEvents()
+        time.sleep(0.005)
+    worker.wait()
+    events['elapsed'] = time.monotonic() - started
+    return events
+
+
+def test_streams_partial_results(qapp, monkeypatch):
+    monkeypatch.setattr(ai_worker.AIProcessingWorker, 'PARTIAL_INTERVAL', 0.02)
+    stream = FakeStream(list("こんにちは世界 "), delay=0.03)
+    events = run_worker(qapp, FakeProcessor(stream))
+    assert events['finished'] == "こんにちは世界"
+    assert events['partials'] and all("こんにちは世界 ".startswith(p) for p in events['partials'])
+    assert stream.closed.is_set()
+
+
+def test_cancel_interrupts_waiting_for_response(qapp):
+    # 最初の断片が届く前でも、ストリームを閉じてすぐに中止できる
+    stream = FakeStream(list("abc"), first_delay=30.0)
+    events = run_worker(qapp, FakeProcessor(stream), cancel_after=0.1)
+    assert events.get('cancelled')
+    assert 'finished' not in events and 'error' not in events
+    assert events['elapsed'] < 2.0
+
+
+def test_stream_exceeding_time_limit_is_an_error(qapp):
+    # 断片が届き続けても、全体の制限時間を超えたら打ち切る
+    stream = FakeStream(["a"] * 1000, delay=0.01)
+    events = run_worker(qapp, FakeProcessor(stream, timeout=0.2))
+    assert events['error'] == 'ChatGPT API エラー: 応答が0秒以内にありませんでした'
+    assert events['elapsed'] < 2.0
+    assert stream.closed.is_set()
+
+
+def test_open_stream_error_is_reported(qapp):
+    class FailingProcessor(FakeProcessor):
+        def open_stream(self, text, prompt=None):
+            raise ValueError("boom")
+
+    events = run_worker(qapp, FailingProcessor(None))
+    assert events['error'] == 'ChatGPT API エラー: boom'
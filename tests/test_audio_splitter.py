@@ -0,0 +1,56 @@
+import struct
+
+import pytest
+
+from audio_splitter import AudioSplitter
+
+
+def write_wav(path, seconds, sample_rate=8000, extra_chunk=False):
+    """16bitモノラルのWAVを書き出す"""
+    data = b'\x00\x00' * int(seconds * sample_rate)
+    fmt = struct.pack('<HHIIHH', 1, 1, sample_rate, sample_rate * 2, 2, 16)
+    chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    if extra_chunk:
+        # 長さが奇数のチャンクはパディングされる
+        chunks += b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+    chunks += b'data' + struct.pack('<I', len(data)) + data
+    path.write_bytes(b'RIFF' + struct.pack('<I', 4 + len(chunks)) + b'WAVE' + chunks)
+    return str(path)
+
+
+def test_wav_header_duration(tmp_path):
+    path = write_wav(tmp_path / 'a.wav', 2.5, extra_chunk=True)
+    assert AudioSplitter._probe_wav_header(path) == pytest.approx(2.5)
+
+
+def test_wav_header_rejects_other_files(tmp_path):
+    path = tmp_path / 'a.mp3'
+    path.write_bytes(b'ID3' + b'\x00' * 64)
+    assert AudioSplitter._probe_wav_header(str(path)) is None
+
+
+def test_probe_duration_is_cached_until_file_changes(tmp_path, monkeypatch):
+    path = write_wav(tmp_path / 'cached.wav', 1.0)
+    assert AudioSplitter.probe_duration(path) == pytest.approx(1.0)
+
+    # 同じファイルは解析し直さない
+    monkeypatch.setattr(AudioSplitter, '_probe_wav_header', staticmethod(lambda _: pytest.fail('probed again')))
+    monkeypatch.setattr('audio_splitter.File', lambda _: pytest.fail('probed again'))
+    assert AudioSplitter.probe_duration(path) == pytest.approx(1.0)
+    monkeypatch.undo()
+
+    write_wav(tmp_path / 'cached.wav', 3.0)
+    assert AudioSplitter.probe_duration(path) == pytest.approx(3.0)
+    assert AudioSplitter.get_audio_duration(path) == pytest.approx(3.0 / 60)
+
+
+def test_probe_duration_raises_for_unknown_file(tmp_path, monkeypatch):
+    path = tmp_path / 'noise.bin'
+    path.write_bytes(b'not audio')
+    monkeypatch.setattr(AudioSplitter, 'find_ffprobe', staticmethod(lambda: None))
+    with pytest.raises(ValueError):
+        AudioSplitter.probe_duration(str(path))
+
+
+def test_plan_chunks_covers_whole_file():
+    assert AudioSplitter.plan_chunks(250.0, 100.0) == [(0.0, 100.0), (100.0, 200.0), (200.0, 250.0)]
@@ -0,0 +1,86 @@
+import csv
+import json
+import os
+
+import pytest
+
+from batch_analysis import FILE_COLUMNS, BatchAnalysis, main
+
+ENTRIES = [
+    {'start': 0.0, 'end': 10.0, 'speaker': 'A', 'text': 'あ' * 10},
+    {'start': 5.0, 'end': 8.0, 'speaker': 'B', 'text': 'はい'},
+    {'start': 11.0, 'end': 13.0, 'speaker': 'B', 'text': 'そうですね'},
+]
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    folder = tmp_path / 'in'
+    (folder / 'sub').mkdir(parents=True)
+    (folder / 'a.json').write_text(json.dumps(ENTRIES, ensure_ascii=False), encoding='utf-8')
+    (folder / 'sub' / 'b_transcript.txt').write_text(json.dumps(ENTRIES[:1]), encoding='utf-8')
+    (folder / 'broken.json').write_text('{', encoding='utf-8')
+    (folder / 'notes.txt').write_text('ignored', encoding='utf-8')
+    return folder
+
+
+def test_find_files_patterns_and_globs(inputs):
+    found = BatchAnalysis.find_files([str(inputs)])
+    assert [os.path.relpath(path, inputs) for path in found] == \
+        ['a.json', 'broken.json', os.path.join('sub', 'b_transcript.txt')]
+    assert BatchAnalysis.find_files([str(inputs / '**' / '*.txt')]) == \
+        [str(inputs / 'notes.txt'), str(inputs / 'sub' / 'b_transcript.txt')]
+    # 重複は除く
+    assert BatchAnalysis.find_files([str(inputs), str(inputs / 'a.json')]) == found
+
+
+def test_find_files_excludes_output_directory(inputs):
+    reports = inputs / 'reports'
+    reports.mkdir()
+    (reports / 'analysis.json').write_text('{}', encoding='utf-8')
+    found = BatchAnalysis.find_files([str(inputs)], exclude=[str(reports)])
+    assert str(reports / 'analysis.json') not in found
+    found = BatchAnalysis.find_files([str(inputs / '*' / '*.json')], exclude=[str(reports)])
+    assert found == []
+    # 入力フォルダ自体が出力先の場合は、出力ファイルだけを除く
+    found = BatchAnalysis.find_files([str(reports)], exclude=[str(reports), str(reports / 'files.csv')])
+    assert found == [str(reports / 'analysis.json')]
+
+
+def test_analyze_file_rows(inputs):
+    file_row, speaker_rows = BatchAnalysis.analyze_file(str(inputs / 'a.json'))
+    assert file_row['utterances'] == 3
+    assert file_row['speakers'] == 2
+    assert file_row['speech_seconds'] == 12.0
+    assert file_row['overlap_seconds'] == 3.0
+    assert file_row['backchannels'] == 1
+    assert file_row['error'] == ''
+    assert [row['speaker'] for row in speaker_rows] == ['A', 'B']
+    assert speaker_rows[1]['speaking_seconds'] == 5.0
+    assert speaker_rows[1]['characters'] == 7
+
+
+def test_analyze_file_records_errors(inputs):
+    file_row, speaker_rows = BatchAnalysis.analyze_file(str(inputs / 'broken.json'))
+    assert set(file_row) == set(FILE_COLUMNS)
+    assert file_row['error']
+    assert speaker_rows == []
+
+
+def test_parallel_output_matches_serial(inputs):
+    paths = BatchAnalysis.find_files([str(inputs)])
+    assert BatchAnalysis.run(paths, jobs=2, progress=False) == BatchAnalysis.run(paths, jobs=1, progress=False)
+
+
+def test_main_writes_csv_and_skips_previous_output(inputs):
+    output_dir = inputs / 'reports'
+    assert main([str(inputs), '-o', str(output_dir), '-q', '-j', '1']) == 2  # broken.json は失敗
+    with open(output_dir / 'files.csv', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+
+    main([str(inputs), '-o', str(output_dir), '--format', 'json', '-q', '-j', '1'])
+    main([str(inputs), '-o', str(output_dir), '--format', 'json', '-q', '-j', '1'])
+    with open(output_dir / 'analysis.json', encoding='utf-8') as f:
+        result = json.load(f)
+    assert len(result['files']) == 3
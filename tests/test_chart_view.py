@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+chart_view = pytest.importorskip("gui.widgets.result.chart_view", exc_type=ImportError)
+
+import plotly.graph_objects as go
+
+ROWS = [[("timeline", "発話量")], [("total", "総発話量"), ("turns", "遷移")]]
+
+
+def test_plotly_js_is_loaded_from_package():
+    assert os.path.isfile(os.path.join(chart_view.PLOTLY_JS_DIR, 'plotly.min.js'))
+    page = chart_view.PlotlyChartView._build_page(ROWS)
+    assert '<script src="plotly.min.js"></script>' in page
+    assert 'cdn' not in page
+
+
+def test_build_page_places_charts_in_rows():
+    page = chart_view.PlotlyChartView._build_page(ROWS)
+    assert page.count('class="row"') == 2
+    for chart_id in ("timeline", "total", "turns"):
+        assert f'id="{chart_id}"' in page
+    assert page.index('id="total"') < page.index('id="turns"')
+
+
+def test_serialize_returns_page_json():
+    figure = go.Figure(go.Bar(x=["A", "B"], y=[1.0, 2.0]))
+    figure_json, pyramid_json = chart_view.PlotlyChartView.serialize(figure)
+    assert json.loads(figure_json)["data"][0]["y"] == [1.0, 2.0]
+    assert pyramid_json == "null"
+    pyramid = {"levels": [5.0, 15.0], "data": [[[1.0]], [[1.0]]]}
+    _, pyramid_json = chart_view.PlotlyChartView.serialize(figure, pyramid)
+    assert json.loads(pyramid_json) == pyramid
+
+
+def test_scripts_wait_until_page_is_loaded(qapp):
+    view = chart_view.PlotlyChartView(ROWS)
+    view.set_figure_json("timeline", '{"data": [], "layout": {}}')
+    view.set_figure_json("timeline", '{"data": [1], "layout": {}}')
+    view.clear()
+    # 読み込み前はグラフごとに最後のスクリプトだけを保留する
+    assert set(view.pending) == {"timeline", "total", "turns"}
+    assert view.pending["timeline"] == "clearFigure('timeline');"
+    view.on_load_finished(True)
+    assert view.loaded and view.pending == {}
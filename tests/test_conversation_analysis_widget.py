@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from transcript_model import Transcript
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+conversation_analyzer = pytest.importorskip("gui.widgets.result.conversation_analyzer", exc_type=ImportError)
+
+ENTRIES = [{'start': i * 3.0, 'end': i * 3.0 + 2.0, 'speaker': 'AB'[i % 2], 'text': f'発話{i}'} for i in range(40)]
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    """条件が満たされるまでイベントを処理する"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        qapp.processEvents()
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def widget(qapp, monkeypatch):
+    monkeypatch.setattr(conversation_analyzer.ConversationAnalysisWidget, 'UPDATE_DELAY_MS', 30)
+    runs = []
+    run = conversation_analyzer.AnalysisWorker.run
+
+    def counting_run(self):
+        runs.append(self.version)
+        run(self)
+
+    monkeypatch.setattr(conversation_analyzer.AnalysisWorker, 'run', counting_run)
+    widget = conversation_analyzer.ConversationAnalysisWidget()
+    widget.set_backend("native")
+    widget.runs = runs
+    yield widget
+    widget.cleanup()
+
+
+def test_hidden_tab_does_not_analyze(qapp, widget):
+    widget.set_transcript(Transcript.from_entries(ENTRIES))
+    wait_until(qapp, lambda: False, timeout=0.1)
+    assert widget.runs == []
+    widget.set_active(True)
+    assert wait_until(qapp, widget.is_up_to_date)
+    assert len(widget.runs) == 1
+    assert not widget.summary_label.isHidden()
+
+
+def test_rapid_edits_are_analyzed_once(qapp, widget):
+    transcript = Transcript.from_entries(ENTRIES)
+    widget.set_transcript(transcript)
+    widget.set_active(True)
+    assert wait_until(qapp, widget.is_up_to_date)
+    widget.runs.clear()
+
+    for i in range(5):
+        transcript.set_entry(i, dict(ENTRIES[i], speaker='C'))
+        widget.set_transcript(transcript)
+    assert wait_until(qapp, lambda: widget.runs and widget.is_up_to_date())
+    assert widget.runs == [transcript.version]
+    assert 'C' in widget.analyzer.speakers
+
+
+def test_analysis_error_is_shown(qapp, widget, monkeypatch):
+    def fail(self, transcript):
+        raise ValueError("壊れた発話")
+
+    monkeypatch.setattr(conversation_analyzer.ConversationAnalyzer, 'load_transcript', fail)
+    widget.set_active(True)
+    widget.set_transcript(Transcript.from_entries(ENTRIES))
+    assert wait_until(qapp, lambda: widget.worker is None and widget.runs)
+    assert wait_until(qapp, widget.is_up_to_date)
+    assert widget.summary_label.text() == "分析エラー: 壊れた発話"
+    assert not widget.summary_label.isHidden()
+
+
+def test_unknown_backend_is_reported(qapp, widget):
+    widget.set_backend("svg")
+    assert widget.backend == "native"
+    assert "svg" in widget.summary_label.text()
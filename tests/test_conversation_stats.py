@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from conversation_stats import ConversationStats
+
+
+def test_timeline_splits_utterances_across_slots():
+    # 話者0: 50〜130秒（3枠にまたがる）、話者1: 60〜60.5秒
+    timeline = ConversationStats.timeline(
+        np.array([50.0, 60.0]), np.array([130.0, 60.5]), np.array([0, 1]), 2, slot_seconds=60.0
+    )
+    np.testing.assert_allclose(timeline, [[10.0, 60.0, 10.0], [0.0, 0.5, 0.0]])
+
+
+def test_timeline_end_on_boundary_stays_in_previous_slot():
+    timeline = ConversationStats.timeline(np.array([0.0]), np.array([60.0]), np.array([0]), 1, slot_seconds=60.0)
+    np.testing.assert_allclose(timeline, [[60.0]])
+
+
+def test_pyramid_levels_sum_finest_level():
+    rng = np.random.default_rng(1)
+    starts = np.sort(rng.uniform(0, 3000, 200))
+    ends = starts + rng.uniform(0, 30, 200)
+    speakers = rng.integers(0, 3, 200)
+    pyramid = ConversationStats.timeline_pyramid(starts, ends, speakers, 3)
+    for level, grid in pyramid.items():
+        direct = ConversationStats.timeline(starts, ends, speakers, 3, slot_seconds=level)
+        np.testing.assert_allclose(grid[:, :direct.shape[1]], direct)
+        np.testing.assert_allclose(grid.sum(), (ends - starts).sum())
+
+
+def test_pyramid_of_empty_transcript_has_no_slots():
+    empty = np.empty(0)
+    pyramid = ConversationStats.timeline_pyramid(empty, empty, np.empty(0, dtype=np.int64), 0)
+    assert sorted(pyramid) == sorted(ConversationStats.PYRAMID_LEVELS)
+    for grid in pyramid.values():
+        assert grid.shape == (0, 0)
+
+
+def test_choose_level():
+    assert ConversationStats.choose_level(600.0) == 5.0
+    assert ConversationStats.choose_level(3600.0) == 15.0
+    assert ConversationStats.choose_level(10 ** 7) == 900.0
+
+
+def test_speaker_totals_and_transitions():
+    starts = np.array([0.0, 2.0, 5.0, 6.0])
+    ends = np.array([2.0, 4.0, 4.0, 9.0])  # 3つ目は終了が開始より前（0秒として扱う）
+    speakers = np.array([0, 1, 1, 0])
+    totals, counts = ConversationStats.speaker_totals(starts, ends, speakers, 2)
+    np.testing.assert_allclose(totals, [5.0, 2.0])
+    assert counts.tolist() == [2, 2]
+    assert ConversationStats.transition_matrix(speakers, 2).tolist() == [[0, 1], [1, 1]]
+    assert ConversationStats.transition_matrix(speakers[:1], 2).tolist() == [[0, 0], [0, 0]]
+
+
+def metrics(rows, n_speakers=2):
+    """(開始, 終了, 話者, 文字数) の行から interval_metrics を計算"""
+    starts, ends, speakers, lengths = (np.array(column) for column in zip(*rows))
+    return ConversationStats.interval_metrics(starts, ends, speakers, n_speakers, lengths)
+
+
+def test_interval_metrics_hand_computed():
+    result = metrics([
+        (0.0, 10.0, 0, 10),   # Aが話し始める
+        (5.0, 8.0, 1, 6),     # Aの発言中にBが相槌（Aより先に終わる）
+        (9.0, 14.0, 1, 10),   # Aの発言中にBが割り込む（Aより後まで話す）
+        (15.0, 20.0, 0, 5),   # Bの1秒後にAが応答
+    ])
+    assert result['speech_seconds'] == pytest.approx(19.0)
+    assert result['overlap_seconds'] == pytest.approx(4.0)
+    assert result['interruptions'].tolist() == [[0, 0], [1, 0]]
+    assert result['backchannels'].tolist() == [[0, 0], [1, 0]]
+    np.testing.assert_allclose(result['overlap_pairs'], [[0.0, 0.0], [4.0, 0.0]])
+    np.testing.assert_allclose(result['latencies'], [-1.0, 1.0])
+    assert result['latency_speakers'].tolist() == [1, 0]
+    np.testing.assert_allclose(result['median_latency'], [1.0, -1.0])
+    np.testing.assert_allclose(result['speech_rate'], [1.0, 2.0])
+
+    histogram = result['latency_histogram']
+    edges = result['latency_edges']
+    assert histogram.sum() == 2
+    assert histogram[1, np.searchsorted(edges, -1.0)] == 1
+    assert histogram[0, np.searchsorted(edges, 1.0)] == 1
+
+
+def test_interval_metrics_same_speaker_and_touching():
+    result = metrics([
+        (0.0, 5.0, 0, 5),
+        (3.0, 6.0, 0, 3),    # 同じ話者の重なりは割り込みではない
+        (6.0, 8.0, 1, 2),    # 接しているだけで重なりではない
+        (9.0, 10.0, 0, 1),
+        (13.0, 14.0, 1, 1),
+    ])
+    assert result['speech_seconds'] == pytest.approx(10.0)
+    assert result['overlap_seconds'] == pytest.approx(2.0)
+    assert result['interruptions'].sum() == 0
+    assert result['backchannels'].sum() == 0
+    np.testing.assert_allclose(result['latencies'], [0.0, 1.0, 3.0])
+    # 話者ごとの中央値（Bは 0秒 と 3秒 の平均）
+    np.testing.assert_allclose(result['median_latency'], [1.0, 1.5])
+
+
+def test_interval_metrics_unsorted_input_matches_sorted():
+    rows = [(9.0, 14.0, 1, 10), (0.0, 10.0, 0, 10), (15.0, 20.0, 0, 5), (5.0, 8.0, 1, 6)]
+    shuffled = metrics(rows)
+    ordered = metrics(sorted(rows))
+    for key in ('interruptions', 'backchannels', 'latencies', 'median_latency', 'speech_rate'):
+        np.testing.assert_allclose(shuffled[key], ordered[key])
+
+
+def test_interval_metrics_empty_and_silent_speaker():
+    empty = ConversationStats.interval_metrics(np.empty(0), np.empty(0), np.empty(0, dtype=np.int64), 2, np.empty(0))
+    assert empty['speech_seconds'] == 0.0 and empty['overlap_seconds'] == 0.0
+    assert len(empty['latencies']) == 0
+    assert np.isnan(empty['median_latency']).all()
+
+    single = metrics([(0.0, 2.0, 0, 4)])
+    np.testing.assert_allclose(single['speech_rate'], [2.0, 0.0])
+    assert np.isnan(single['median_latency'][1])
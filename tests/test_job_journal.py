@@ -0,0 +1,75 @@
+import os
+
+from job_journal import CHUNK_COMPLETED, CHUNK_STARTED, CHUNK_UPLOADED, JobJournal
+
+OPTIONS = {'timestamp': True, 'speaker_diarization': True, 'chunk_minutes': 30}
+
+
+def make_audio(tmp_path, name='a.wav', content=b'audio'):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_resume_after_interruption(tmp_path):
+    audio = make_audio(tmp_path)
+    journal_dir = str(tmp_path / 'jobs')
+
+    journal = JobJournal.open(audio, OPTIONS, journal_dir)
+    journal.set_total_chunks(3)
+    journal.complete_chunk(0, '[{"text": "0"}]')
+    journal.update_chunk(1, CHUNK_UPLOADED, transcription_id='t1')
+    journal.update_chunk(1, CHUNK_STARTED)
+
+    # 異常終了した後に開き直すと、前回の記録が残っている
+    pending = JobJournal.list_pending(journal_dir)
+    assert [p.file_path for p in pending] == [os.path.abspath(audio)]
+
+    resumed = JobJournal.open(audio, OPTIONS, journal_dir)
+    resumed.set_total_chunks(3)
+    assert resumed.count_completed() == 1
+    assert resumed.load_result(0) == '[{"text": "0"}]'
+    assert resumed.get_chunk(1) == {'state': CHUNK_STARTED, 'transcription_id': 't1'}
+    assert resumed.get_chunk(2) == {}
+
+
+def test_changed_options_start_over(tmp_path):
+    audio = make_audio(tmp_path)
+    journal_dir = str(tmp_path / 'jobs')
+    journal = JobJournal.open(audio, OPTIONS, journal_dir)
+    journal.set_total_chunks(2)
+    journal.complete_chunk(0, 'result')
+
+    reopened = JobJournal.open(audio, dict(OPTIONS, chunk_minutes=10), journal_dir)
+    assert reopened.count_completed() == 0
+    assert reopened.load_result(0) is None
+
+
+def test_changed_chunk_count_drops_chunks(tmp_path):
+    audio = make_audio(tmp_path)
+    journal = JobJournal.open(audio, OPTIONS, str(tmp_path / 'jobs'))
+    journal.set_total_chunks(2)
+    journal.complete_chunk(0, 'result')
+    journal.set_total_chunks(3)
+    assert journal.count_completed() == 0
+    assert journal.load_result(0) is None
+
+
+def test_modified_file_is_not_pending(tmp_path):
+    audio = make_audio(tmp_path)
+    journal_dir = str(tmp_path / 'jobs')
+    JobJournal.open(audio, OPTIONS, journal_dir)
+    make_audio(tmp_path, content=b'changed audio')
+    assert JobJournal.list_pending(journal_dir) == []
+
+
+def test_discard_removes_journal_and_results(tmp_path):
+    audio = make_audio(tmp_path)
+    journal_dir = str(tmp_path / 'jobs')
+    journal = JobJournal.open(audio, OPTIONS, journal_dir)
+    journal.set_total_chunks(1)
+    journal.complete_chunk(0, 'result')
+    assert journal.get_chunk(0)['state'] == CHUNK_COMPLETED
+    journal.discard()
+    assert os.listdir(journal_dir) == []
+    assert JobJournal.list_pending(journal_dir) == []
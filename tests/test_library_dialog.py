@@ -0,0 +1,17 @@
+import pytest
+
+from transcript_library import TranscriptLibrary
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+library_dialog = pytest.importorskip("gui.widgets.library_dialog", exc_type=ImportError)
+
+
+def test_import_summary_lists_every_count(qapp, tmp_path):
+    library = TranscriptLibrary(str(tmp_path / 'library.db'))
+    dialog = library_dialog.LibraryDialog(library)
+    dialog.on_import_finished({'imported': 1, 'skipped': 2, 'ignored': 3, 'failed': 4, 'removed': 5})
+    text = dialog.status_label.text()
+    assert '追加・更新 1件' in text and '変更なし 2件' in text
+    assert '対象外 3件' in text
+    assert '失敗 4件' in text and '削除 5件' in text
+    library.close()
@@ -0,0 +1,121 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import moco_client
+from moco_client import MocoVoiceClient, UploadStream, UploadTimeoutError
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.uploads.append((self.headers['Content-Type'], body))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # ローカルのサーバーにはプロキシを通さずに接続する
+    for name in ('HTTP_PROXY', 'http_proxy', 'ALL_PROXY', 'all_proxy'):
+        monkeypatch.delenv(name, raising=False)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.uploads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_with_same_pool_settings_share_session():
+    a = MocoVoiceClient('key-a', pool_connections=3, pool_maxsize=5)
+    b = MocoVoiceClient('key-b', pool_connections=3, pool_maxsize=5)
+    c = MocoVoiceClient('key-c', pool_connections=3, pool_maxsize=6)
+    assert a.session is b.session
+    assert a.session is not c.session
+
+
+def test_connection_stats_count_reused_connections(server):
+    client = MocoVoiceClient('key', pool_connections=2, pool_maxsize=2)
+    start = client.get_connection_stats()
+    for _ in range(3):
+        assert client.session.get(f'{server.url}/status').status_code == 200
+    stats = client.get_connection_stats(since=start)
+    assert stats == {'requests': 3, 'new_connections': 1, 'reused_connections': 2}
+
+
+def test_connection_stats_survive_pool_eviction(server):
+    # プールを1つしか持てないため、別のホスト名で接続すると最初のプールは破棄される
+    client = MocoVoiceClient('key', pool_connections=1, pool_maxsize=1)
+    start = client.get_connection_stats()
+    client.session.get(f'{server.url}/a')
+    client.session.get(f'{server.url}/b')
+    client.session.get(server.url.replace('127.0.0.1', 'localhost') + '/c')
+    assert len(client.session.get_adapter(server.url).poolmanager.pools) == 1
+    stats = client.get_connection_stats(since=start)
+    assert stats == {'requests': 3, 'new_connections': 2, 'reused_connections': 1}
+
+
+def test_upload_stream_reads_blocks_and_reports_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadStream, 'BLOCK_SIZE', 4)
+    path = tmp_path / 'audio.wav'
+    path.write_bytes(b'0123456789')
+    reports = []
+    stream = UploadStream(str(path), lambda sent, total, rate: reports.append((sent, total)))
+    assert len(stream) == 10
+    assert list(stream) == [b'0123', b'4567', b'89']
+    assert reports == [(4, 10), (8, 10), (10, 10)]
+    # 再試行時は先頭から読み直す
+    assert b''.join(stream) == b'0123456789'
+
+
+def test_upload_stream_stops_after_time_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(UploadStream, 'BLOCK_SIZE', 4)
+    path = tmp_path / 'audio.wav'
+    path.write_bytes(b'0123456789')
+    clock = iter(range(100))
+    monkeypatch.setattr(moco_client.time, 'monotonic', lambda: next(clock))
+    stream = UploadStream(str(path), time_limit=2.5)
+    blocks = iter(stream)
+    assert next(blocks) == b'0123'
+    with pytest.raises(UploadTimeoutError):
+        list(blocks)
+
+
+def test_upload_time_limit_follows_measured_bandwidth(monkeypatch):
+    client = MocoVoiceClient('key')
+    monkeypatch.setattr(MocoVoiceClient, '_upload_bandwidth', 1000)
+    assert client._upload_time_limit(100) == client.UPLOAD_MIN_TIMEOUT
+    assert client._upload_time_limit(1000 * 60) == 120
+
+
+def test_upload_audio_file_streams_whole_file(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(MocoVoiceClient, '_upload_bandwidth', MocoVoiceClient.INITIAL_UPLOAD_BANDWIDTH)
+    path = tmp_path / 'audio.mp3'
+    data = bytes(range(256)) * 4000
+    path.write_bytes(data)
+    reports = []
+    client = MocoVoiceClient('key')
+    status = client.upload_audio_file(f'{server.url}/upload', str(path),
+                                      progress_callback=lambda sent, total, rate: reports.append(sent))
+    assert status == 200
+    assert server.uploads == [('audio/mpeg', data)]
+    assert reports[-1] == len(data)
+    assert reports == sorted(reports)
@@ -0,0 +1,60 @@
+import pytest
+
+from transcript_model import Transcript
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+mode_manager = pytest.importorskip("gui.widgets.result.mode_manager", exc_type=ImportError)
+
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPushButton
+
+ENTRIES = [{'start': float(i), 'end': i + 1.0, 'speaker': 'A', 'text': f't{i}'} for i in range(3)]
+
+
+@pytest.fixture
+def manager(qapp):
+    manager = mode_manager.TranscriptModeManager()
+    manager.set_mode_button(QPushButton())
+    manager.set_transcript(Transcript.from_entries(ENTRIES))
+    manager.set_raw_json_mode(True)
+    manager.show_editor()
+    return manager
+
+
+def replace_line(editor, old, new):
+    """old を含む行を new に置き換える"""
+    document = editor.document()
+    for number in range(document.blockCount()):
+        block = document.findBlockByNumber(number)
+        if old in block.text():
+            cursor = QTextCursor(block)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(block.text().replace(old, new))
+            return
+    raise AssertionError(f"{old} が見つかりません")
+
+
+def test_changed_entries_are_applied(manager):
+    replace_line(manager.editor, '"t1"', '"変更"')
+    transcript = manager.get_transcript()
+    assert transcript.texts == ['t0', '変更', 't2']
+
+
+def test_bad_edit_in_batch_leaves_transcript_untouched(manager):
+    transcript = manager.transcript
+    version = transcript.version
+    replace_line(manager.editor, '"t0"', '"変更0"')
+    replace_line(manager.editor, '"start": 1.0', '"start": "x"')
+    replace_line(manager.editor, '"t2"', '"変更2"')
+    assert manager.editor.changed_entries() == [0, 1, 2]
+
+    with pytest.raises(ValueError):
+        manager._apply_changed_entries()
+    assert transcript.to_entries() == ENTRIES
+    assert transcript.version == version
+
+    # 全体の解析でも不正なため、結果は編集前のまま残る
+    with pytest.raises(ValueError):
+        manager.get_transcript()
+    assert manager.transcript is transcript
+    assert transcript.to_entries() == ENTRIES
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from conversation_stats import ConversationStats
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+native_charts = pytest.importorskip("gui.widgets.result.native_charts", exc_type=ImportError)
+
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QColor
+
+
+def test_nice_ticks_cover_max_value():
+    assert native_charts.nice_ticks(0.0) == [0.0]
+    assert native_charts.nice_ticks(9.0) == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    assert native_charts.nice_ticks(130.0)[-1] >= 130.0
+
+
+def test_range_ticks_stay_inside_range():
+    assert native_charts.range_ticks(1.2, 9.7) == [2.0, 4.0, 6.0, 8.0]
+    assert native_charts.range_ticks(5.0, 5.0) == []
+
+
+def test_to_qcolor_parses_plotly_colors():
+    color = native_charts.to_qcolor("rgba(10, 20, 30, 0.5)")
+    assert (color.red(), color.green(), color.blue()) == (10, 20, 30)
+    assert color.alphaF() == pytest.approx(0.5, abs=0.01)
+    assert native_charts.to_qcolor("#ff0000") == QColor(255, 0, 0)
+
+
+def make_timeline(qapp):
+    chart = native_charts.StackedAreaChart()
+    chart.resize(800, 400)
+    starts = np.arange(0.0, 3600.0, 30.0)
+    speakers = np.arange(len(starts)) % 2
+    pyramid = ConversationStats.timeline_pyramid(starts, starts + 20.0, speakers, 2)
+    chart.set_data([("A", QColor("red")), ("B", QColor("blue"))], pyramid)
+    return chart
+
+
+def test_timeline_chooses_level_for_visible_span(qapp):
+    chart = make_timeline(qapp)
+    chart.build_layout()
+    assert chart.level == ConversationStats.choose_level(chart.total_seconds)
+    whole_level = chart.level
+    chart.set_view(600.0, 300.0)
+    chart.build_layout()
+    assert chart.level < whole_level
+    assert chart.values.shape[0] == 2
+    assert chart.values.shape[1] <= ConversationStats.MAX_VISIBLE_SLOTS + 2
+    # 表示範囲は記録の範囲内に収める
+    chart.set_view(-100.0, 10 ** 6)
+    assert (chart.view_start, chart.view_end) == (0.0, chart.total_seconds)
+
+
+def test_timeline_tooltip_reports_slot_values(qapp):
+    chart = make_timeline(qapp)
+    chart.build_layout()
+    text = chart.hit_test(QPointF(chart.xs[0] + 0.1, chart.plot_rect().center().y()))
+    assert text.startswith("時間: 0.00分")
+    assert "A: " in text and "B: " in text
+    assert chart.hit_test(QPointF(0.0, 0.0)) is None
+
+
+def test_bar_chart_hit_test(qapp):
+    chart = native_charts.BarChart()
+    chart.resize(400, 300)
+    chart.set_data(["A", "B"], [QColor("red"), QColor("blue")], [10.0, 20.0])
+    chart.build_layout()
+    bar = chart.bars[1]
+    assert chart.hit_test(bar.center()) == "話者: B\n発話量: 20.00秒"
+    assert chart.hit_test(QPointF(bar.left() - 1, bar.bottom() - 1)) is None
@@ -0,0 +1,123 @@
+import json
+
+from result_merger import IncrementalMerger, TranscriptionMerger
+
+
+def entry(start, end, text, speaker='A'):
+    return {'start': start, 'end': end, 'speaker': speaker, 'text': text}
+
+
+def test_duplicate_needs_time_and_text_match():
+    a = entry(10.0, 12.0, '今日はいい天気ですね')
+    assert TranscriptionMerger._is_duplicate(a, entry(10.1, 12.1, '今日はいい天気ですね'))
+    # チャンクの端で途切れた発話はもう一方の一部になる
+    assert TranscriptionMerger._is_duplicate(a, entry(10.5, 12.0, 'いい天気ですね'))
+    assert not TranscriptionMerger._is_duplicate(a, entry(10.0, 12.0, '全く別の話題です'))
+    assert not TranscriptionMerger._is_duplicate(a, entry(30.0, 32.0, '今日はいい天気ですね'))
+
+
+def test_duplicate_ignores_untimed_entries():
+    a = entry(10.0, 12.0, 'こんにちは')
+    assert not TranscriptionMerger._is_duplicate(a, {'text': 'こんにちは'})
+    assert not TranscriptionMerger._is_duplicate({'start': 10.0, 'text': 'こんにちは'}, a)
+
+
+def test_reconcile_overlap_drops_duplicates():
+    # 重複区間は 100〜110秒、境界は105秒
+    merged = [entry(90.0, 95.0, '前半の発話'), entry(101.0, 103.0, '重複区間の発話'), entry(106.0, 110.0, 'ここで途切')]
+    entries = [entry(101.1, 103.0, '重複区間の発話'), entry(106.0, 109.0, 'ここで途切れた発話'), entry(111.0, 115.0, '後半の発話')]
+    rest = TranscriptionMerger._reconcile_overlap(merged, entries, 100.0, 110.0)
+    texts = [e['text'] for e in merged + rest]
+    assert texts == ['前半の発話', '重複区間の発話', 'ここで途切れた発話', '後半の発話']
+
+
+def test_reconcile_overlap_keeps_untimed_entries():
+    merged = [entry(90.0, 95.0, '前半'), {'text': '時刻なし（前）'}, entry(101.0, 103.0, '同じ発話')]
+    entries = [{'speaker': 'B', 'text': '時刻なし（後）'}, entry(101.0, 103.0, '同じ発話'), entry(111.0, 112.0, '後半')]
+    rest = TranscriptionMerger._reconcile_overlap(merged, entries, 100.0, 110.0)
+    texts = [e['text'] for e in merged + rest]
+    assert texts.count('同じ発話') == 1
+    assert '時刻なし（前）' in texts and '時刻なし（後）' in texts
+    assert texts[0] == '前半' and texts[-1] == '後半'
+
+
+def test_merge_json_results_offsets_and_dedups():
+    chunk1 = json.dumps([entry(0.0, 5.0, '一つ目'), entry(96.0, 99.0, '重なる発話')])
+    chunk2 = json.dumps([entry(1.0, 4.0, '重なる発話'), entry(20.0, 25.0, '二つ目')])
+    merged = json.loads(TranscriptionMerger.merge_json_results([chunk1, chunk2], [(0.0, 100.0), (95.0, 200.0)]))
+    assert [(e['start'], e['text']) for e in merged] == [(0.0, '一つ目'), (96.0, '重なる発話'), (115.0, '二つ目')]
+
+
+def test_incremental_merger_is_order_tolerant(tmp_path):
+    ranges = [(0.0, 100.0), (95.0, 200.0), (195.0, 300.0)]
+    results = [
+        json.dumps([entry(0.0, 5.0, 'a'), entry(96.0, 99.0, 'overlap1')]),
+        json.dumps([entry(1.0, 4.0, 'overlap1'), entry(50.0, 55.0, 'b'), entry(101.0, 104.0, 'overlap2')]),
+        json.dumps([entry(1.0, 4.0, 'overlap2'), entry(50.0, 55.0, 'c')]),
+    ]
+    expected = json.loads(TranscriptionMerger.merge_json_results(results, ranges))
+    assert [e['text'] for e in expected] == ['a', 'overlap1', 'b', 'overlap2', 'c']
+
+    output = tmp_path / 'merged.jsonl'
+    merger = IncrementalMerger(ranges, output_path=str(output))
+    # 後のチャンクが先に届いても、先頭から揃うまでは出力しない
+    assert merger.add_chunk(2, results[2]) == []
+    emitted = merger.add_chunk(0, results[0])
+    emitted += merger.add_chunk(1, results[1])
+    emitted += merger.finish()
+    assert emitted == expected
+
+    json_path = tmp_path / 'merged.json'
+    TranscriptionMerger.jsonl_to_json(str(output), str(json_path))
+    assert json_path.read_text(encoding='utf-8') == json.dumps(expected, ensure_ascii=False, indent=2)
+
+
+def test_incremental_merger_skips_missing_and_invalid_chunks():
+    merger = IncrementalMerger([(0.0, 100.0), (100.0, 200.0), (200.0, 300.0)])
+    assert merger.add_chunk(0, 'not json') == []
+    assert merger.add_chunk(2, json.dumps([entry(0.0, 1.0, 'last'), 'stray'])) == []
+    assert [e['start'] for e in merger.finish()] == [200.0]
+
+
+RANGES = [(0.0, 100.0), (95.0, 200.0), (195.0, 300.0), (295.0, 400.0)]
+
+
+def test_incremental_merger_continues_past_missing_chunk():
+    merger = IncrementalMerger(RANGES)
+    emitted = merger.add_chunk(0, json.dumps([entry(10.0, 20.0, 'a'), entry(96.0, 99.0, 'tail0')]))
+    assert [e['text'] for e in emitted] == ['a']
+    assert merger.add_chunk(2, json.dumps([entry(1.0, 3.0, 'head2'), entry(101.0, 104.0, 'tail2')])) == []
+
+    # 欠けたチャンクを記録すると、保留していた発話と次のチャンクが確定する
+    emitted = merger.mark_missing(1)
+    assert [e['text'] for e in emitted] == ['tail0', 'head2']
+
+    # 欠けたチャンクより後は、これまでどおり重複を取り除く
+    emitted = merger.add_chunk(3, json.dumps([entry(1.0, 4.0, 'tail2'), entry(50.0, 55.0, 'b')]))
+    assert [e['text'] for e in emitted] == ['tail2', 'b']
+    assert merger.finish() == []
+
+
+def test_incremental_merger_finish_treats_absent_chunks_as_missing(tmp_path):
+    output = tmp_path / 'merged.jsonl'
+    merger = IncrementalMerger(RANGES[:3], output_path=str(output))
+    merger.add_chunk(0, json.dumps([entry(96.0, 99.0, 'tail0')]))
+    merger.add_chunk(2, json.dumps([entry(1.0, 3.0, 'head2')]))
+    emitted = merger.finish()
+    assert [(e['start'], e['text']) for e in emitted] == [(96.0, 'tail0'), (196.0, 'head2')]
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['text'] for line in lines] == ['tail0', 'head2']
+
+
+def test_merge_json_results_skips_empty_chunk_results():
+    results = [json.dumps([entry(96.0, 99.0, 'tail0')]), '', json.dumps([entry(1.0, 3.0, 'head2')])]
+    merged = json.loads(TranscriptionMerger.merge_json_results(results, RANGES[:3]))
+    assert [e['text'] for e in merged] == ['tail0', 'head2']
+
+
+def test_jsonl_to_json_empty(tmp_path):
+    source = tmp_path / 'empty.jsonl'
+    source.write_text('', encoding='utf-8')
+    target = tmp_path / 'empty.json'
+    TranscriptionMerger.jsonl_to_json(str(source), str(target))
+    assert json.loads(target.read_text(encoding='utf-8')) == []
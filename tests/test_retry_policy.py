@@ -0,0 +1,178 @@
+import pytest
+import requests
+
+import retry_policy
+from moco_client import MocoVoiceError
+from retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy
+from status_poller import AdaptivePollScheduler, StatusPoller
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(retry_policy.time, 'sleep', lambda seconds: None)
+
+
+def expire(breaker):
+    """遮断してから reset_timeout が経過した状態にする"""
+    breaker.opened_at -= breaker.reset_timeout + 1
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.remaining() <= 60
+
+
+def test_breaker_half_open_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.remaining() == 0.0
+    # 試行の結果が出るまで他のリクエストは通さない
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_success_closes():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_breaker_half_open_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    for _ in range(5):
+        breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_release_returns_trial_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expire(breaker)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_circuit_open_error_messages():
+    assert '約30秒後に再開' in str(CircuitOpenError(30.0))
+    half_open = CircuitOpenError(0.0, half_open=True)
+    assert half_open.half_open
+    assert '復旧を確認中' in str(half_open)
+    assert '秒後' not in str(half_open)
+
+
+def test_parse_retry_after():
+    assert RetryPolicy.parse_retry_after('5') == 5.0
+    assert RetryPolicy.parse_retry_after('-1') == 0.0
+    assert RetryPolicy.parse_retry_after(None) is None
+    assert RetryPolicy.parse_retry_after('garbage') is None
+    assert RetryPolicy.parse_retry_after('Thu, 01 Jan 1970 00:00:00 GMT') == 0.0
+
+
+def test_compute_delay_respects_retry_after_and_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+    assert policy.compute_delay(1, retry_after=3.0) == 3.0
+    assert policy.compute_delay(1, retry_after=100.0) == 10.0
+    for attempt in range(1, 8):
+        assert 0.0 <= policy.compute_delay(attempt) <= min(2 ** (attempt - 1), 10.0)
+
+
+def test_retryable_statuses_depend_on_idempotency():
+    assert RetryPolicy.is_retryable_status(500, idempotent=True)
+    assert not RetryPolicy.is_retryable_status(500, idempotent=False)
+    assert RetryPolicy.is_retryable_status(503, idempotent=False)
+    assert not RetryPolicy.is_retryable_status(404, idempotent=True)
+
+
+def test_call_retries_then_returns_success():
+    policy = RetryPolicy(max_attempts=3, breaker=CircuitBreaker())
+    responses = [FakeResponse(503), FakeResponse(200)]
+    response = policy.call(lambda: responses.pop(0))
+    assert response.status_code == 200
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_call_does_not_retry_non_idempotent_timeout():
+    policy = RetryPolicy(max_attempts=3, breaker=CircuitBreaker())
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise requests.exceptions.ReadTimeout()
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        policy.call(send, idempotent=False)
+    assert len(calls) == 1
+
+
+def test_call_raises_when_breaker_open():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    policy = RetryPolicy(max_attempts=5, breaker=breaker)
+    with pytest.raises(CircuitOpenError) as info:
+        policy.call(lambda: FakeResponse(500))
+    assert not info.value.half_open
+    assert info.value.retry_after > 0
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_call_releases_trial_on_non_request_error():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    expire(breaker)
+    policy = RetryPolicy(max_attempts=3, breaker=breaker)
+
+    def send():
+        raise OSError("ファイルを開けません")
+
+    with pytest.raises(OSError):
+        policy.call(send)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    response = policy.call(lambda: FakeResponse(200))
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_poller_keeps_polling_while_breaker_open():
+    class Client:
+        retry_policy = RetryPolicy(max_attempts=2)
+        calls = 0
+
+        def get_transcription_status(self, transcription_id, max_attempts=None):
+            Client.calls += 1
+            # 失敗の上限回数より多く遮断が続いても、解除後の確認で完了を受け取る
+            if Client.calls <= 5:
+                raise MocoVoiceError('open', retry_after=0.0, circuit_open=True)
+            return {'status': 'COMPLETED'}
+
+    scheduler = AdaptivePollScheduler()
+    scheduler.MIN_INTERVAL = 0.01
+    poller = StatusPoller(Client(), scheduler)
+    try:
+        assert poller.wait('job', 1.0) == {'status': 'COMPLETED'}
+    finally:
+        poller.stop()
+    assert Client.calls == 6
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from split_planner import SplitPlanner
+
+FRAME = SplitPlanner.FRAME_SECONDS
+
+
+def envelope_with_quiet(total_seconds, quiet_seconds):
+    """指定した時刻だけ静かなエネルギー包絡"""
+    envelope = np.ones(int(total_seconds / FRAME), dtype=np.float32)
+    for seconds in quiet_seconds:
+        envelope[int(round(seconds / FRAME))] = 0.0
+    return envelope
+
+
+def test_cuts_at_quietest_point_near_target():
+    envelope = envelope_with_quiet(300, [95.0, 200.0])
+    plan = SplitPlanner.plan_from_envelope(envelope, 300.0, 100.0, 150.0, tolerance_seconds=10.0)
+    assert [start for start, _ in plan] == pytest.approx([0.0, 95.0, 200.0])
+    assert plan[-1][1] == 300.0
+
+
+def test_chunks_are_contiguous_and_within_max():
+    rng = np.random.default_rng(0)
+    envelope = rng.random(int(1000 / FRAME)).astype(np.float32)
+    plan = SplitPlanner.plan_from_envelope(envelope, 1000.0, 100.0, 110.0)
+    assert plan[0][0] == 0.0 and plan[-1][1] == 1000.0
+    for (_, end), (start, _) in zip(plan, plan[1:]):
+        assert end == start
+    assert all(end - start <= 110.0 + 1e-9 for start, end in plan)
+
+
+def test_short_remainder_is_not_split():
+    envelope = envelope_with_quiet(105, [])
+    plan = SplitPlanner.plan_from_envelope(envelope, 105.0, 100.0, 150.0, tolerance_seconds=10.0)
+    assert plan == [(0.0, 105.0)]
+
+
+def test_falls_back_to_target_without_envelope():
+    plan = SplitPlanner.plan_from_envelope(np.empty(0, dtype=np.float32), 250.0, 100.0, 150.0,
+                                           tolerance_seconds=10.0)
+    assert plan == [(0.0, 100.0), (100.0, 200.0), (200.0, 250.0)]
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from moco_client import MocoVoiceError
+from retry_policy import RetryPolicy
+from status_poller import AdaptivePollScheduler, StatusPoller
+
+
+class FakeClient:
+    """状態確認の応答を順に返すクライアント"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_transcription_status(self, transcription_id, max_attempts=None):
+        with self._lock:
+            self.calls += 1
+            response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return {'status': response}
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = AdaptivePollScheduler()
+    scheduler.MIN_INTERVAL = 0.01
+    scheduler.BASE_OVERHEAD = 0.0
+    scheduler.INITIAL_REALTIME_FACTOR = 0.0
+    scheduler.realtime_factor = 0.0
+    return scheduler
+
+
+def test_next_delay_waits_until_expected_completion():
+    scheduler = AdaptivePollScheduler()
+    scheduler.JITTER = 0.0
+    # 推定完了まで十分に残っている間は上限の間隔で待つ
+    assert scheduler.next_delay(600.0, 0.0, 0) == scheduler.MAX_INTERVAL
+    # 推定完了の直前は残り時間だけ待って確認する
+    assert scheduler.next_delay(60.0, scheduler.estimate_total(60.0) - 1.0, 0) == pytest.approx(1.0)
+
+
+def test_next_delay_backs_off_after_estimate():
+    scheduler = AdaptivePollScheduler()
+    scheduler.JITTER = 0.0
+    elapsed = scheduler.estimate_total(60.0) + 10.0
+    delays = [scheduler.next_delay(60.0, elapsed, polls) for polls in range(1, 6)]
+    assert delays == sorted(delays)
+    assert delays[0] == scheduler.MIN_INTERVAL
+    assert all(delay <= scheduler.MAX_INTERVAL for delay in delays)
+
+
+def test_record_completion_moves_factor_towards_observed():
+    scheduler = AdaptivePollScheduler()
+    before = scheduler.realtime_factor
+    scheduler.record_completion(100.0, scheduler.BASE_OVERHEAD + 100.0)
+    assert before < scheduler.realtime_factor < 1.0
+
+
+def test_wait_returns_terminal_status(scheduler):
+    client = FakeClient(['IN_PROGRESS', 'IN_PROGRESS', 'COMPLETED'])
+    poller = StatusPoller(client, scheduler)
+    statuses = []
+    try:
+        result = poller.wait('job', 1.0, on_status=statuses.append)
+    finally:
+        poller.stop()
+    assert result == {'status': 'COMPLETED'}
+    assert statuses == ['IN_PROGRESS', 'IN_PROGRESS', 'COMPLETED']
+
+
+def test_wait_multiplexes_jobs(scheduler):
+    client = FakeClient(['COMPLETED'])
+    poller = StatusPoller(client, scheduler)
+    results = {}
+
+    def wait(job_id):
+        results[job_id] = poller.wait(job_id, 1.0)
+
+    threads = [threading.Thread(target=wait, args=(f'job{i}',)) for i in range(3)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+    finally:
+        poller.stop()
+    assert results == {f'job{i}': {'status': 'COMPLETED'} for i in range(3)}
+
+
+def test_retryable_errors_are_retried_until_limit(scheduler):
+    client = FakeClient([MocoVoiceError('busy', retryable=True)])
+    poller = StatusPoller(client, scheduler)
+    try:
+        with pytest.raises(MocoVoiceError):
+            poller.wait('job', 1.0)
+    finally:
+        poller.stop()
+    assert client.calls == client.retry_policy.max_attempts
+
+
+def test_non_retryable_error_fails_at_once(scheduler):
+    client = FakeClient([MocoVoiceError('bad request')])
+    poller = StatusPoller(client, scheduler)
+    try:
+        with pytest.raises(MocoVoiceError):
+            poller.wait('job', 1.0)
+    finally:
+        poller.stop()
+    assert client.calls == 1
+
+
+def test_wait_returns_none_when_cancelled(scheduler):
+    client = FakeClient(['IN_PROGRESS'])
+    poller = StatusPoller(client, scheduler)
+    try:
+        assert poller.wait('job', 1.0, is_cancelled=lambda: True) is None
+    finally:
+        poller.stop()
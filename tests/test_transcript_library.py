@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+from transcript_library import TranscriptLibrary
+
+
+def write_transcript(path, entries):
+    path.write_text(json.dumps(entries, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = TranscriptLibrary(str(tmp_path / 'db' / 'library.db'))
+    yield library
+    library.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    folder = tmp_path / 'archive'
+    (folder / 'sub').mkdir(parents=True)
+    write_transcript(folder / 'meeting_transcript.txt', [
+        {'start': 0.0, 'end': 2.0, 'speaker': 'A', 'text': '来週の会議の議題を決めましょう'},
+        {'start': 2.0, 'end': 4.0, 'speaker': 'B', 'text': '予算の件を先に話したいです'},
+    ])
+    write_transcript(folder / 'sub' / 'interview.json', [
+        {'start': 5.0, 'end': 8.0, 'speaker': 'C', 'text': '会議の予定は未定です'},
+    ])
+    (folder / 'meeting.mp3').write_bytes(b'audio')
+    (folder / 'package.json').write_text('{"name": "not a transcript"}', encoding='utf-8')
+    return folder
+
+
+def test_import_directory_counts(library, archive):
+    counts = library.import_directory(str(archive))
+    assert counts == {'imported': 2, 'skipped': 0, 'ignored': 1, 'failed': 0, 'removed': 0}
+    assert library.stats() == {'sources': 2, 'utterances': 3}
+
+    # 変更のないファイルは取り込み直さない
+    counts = library.import_directory(str(archive))
+    assert counts['imported'] == 0 and counts['skipped'] == 2
+
+
+def test_search_phrase_and_short_terms(library, archive):
+    library.import_directory(str(archive))
+    results = library.search('会議の')
+    assert {result['text'] for result in results} == {'来週の会議の議題を決めましょう', '会議の予定は未定です'}
+
+    # 索引で引けない短い語も部分一致で探す
+    results = library.search('予算')
+    assert [result['speaker'] for result in results] == ['B']
+    assert results[0]['start'] == 2.0
+    assert results[0]['audio_path'] == os.path.join(str(archive), 'meeting.mp3')
+
+    assert library.search('会議 予定') == [r for r in library.search('予定') if '会議' in r['text']]
+    assert library.search('存在しない語句') == []
+    assert library.search('   ') == []
+
+
+def test_modified_and_deleted_files_are_reindexed(library, archive):
+    library.import_directory(str(archive))
+    path = archive / 'sub' / 'interview.json'
+    write_transcript(path, [{'start': 0.0, 'end': 1.0, 'speaker': 'C', 'text': '差し替えた発話です'}])
+    os.utime(path, ns=(0, 1))
+    assert library.import_file(str(path))
+    assert library.search('会議の予定') == []
+    assert len(library.search('差し替えた')) == 1
+
+    os.remove(archive / 'meeting_transcript.txt')
+    counts = library.import_directory(str(archive))
+    assert counts['removed'] == 1
+    assert library.stats() == {'sources': 1, 'utterances': 1}
+
+
+def test_find_audio_file(tmp_path):
+    (tmp_path / 'talk.m4a').write_bytes(b'')
+    assert TranscriptLibrary.find_audio_file(str(tmp_path / 'talk_transcript.txt')) == str(tmp_path / 'talk.m4a')
+    assert TranscriptLibrary.find_audio_file(str(tmp_path / 'other.json')) is None
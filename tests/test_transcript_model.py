@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from transcript_model import DEFAULT_SPEAKER, Transcript
+
+ENTRIES = [
+    {'start': 0.0, 'end': 1.5, 'speaker': 'A', 'text': 'こんにちは', 'confidence': 0.9, 'words': [{'w': 'こんにちは'}]},
+    {'start': 1.5, 'end': 3.0, 'speaker': 'B', 'text': 'どうも'},
+    {'start': 3.0, 'end': 4.0, 'speaker': 'A', 'text': 'では', 'language': 'ja'},
+]
+
+
+def test_json_round_trip_keeps_extra_keys():
+    transcript = Transcript.from_json(json.dumps(ENTRIES, ensure_ascii=False))
+    assert transcript.to_entries() == ENTRIES
+    assert list(transcript) == ENTRIES
+    assert json.loads(transcript.to_json()) == ENTRIES
+    # 列以外のキーがない発話は辞書を持たない
+    assert transcript.extras[1] is None
+
+
+def test_columns_and_speakers():
+    transcript = Transcript.from_entries(ENTRIES)
+    assert len(transcript) == 3
+    assert transcript.starts.tolist() == [0.0, 1.5, 3.0]
+    assert transcript.speaker_names == ['A', 'B']
+    assert transcript.speaker_ids.tolist() == [0, 1, 0]
+    assert transcript.speakers == ['A', 'B']
+    assert transcript.total_duration == 4.0
+
+
+def test_missing_speaker_uses_default():
+    transcript = Transcript.from_entries([{'start': 0, 'end': 1, 'text': 'x'}])
+    assert transcript.entry(0) == {'start': 0.0, 'end': 1.0, 'speaker': DEFAULT_SPEAKER, 'text': 'x'}
+
+
+@pytest.mark.parametrize('text', [
+    '{"start": 0}',
+    '[{"end": 1, "text": "x"}]',
+    '[{"start": "0", "end": 1, "text": "x"}]',
+    '[{"start": true, "end": 1, "text": "x"}]',
+    '[{"start": 0, "end": 1, "text": 1}]',
+    '["x"]',
+    'not json',
+])
+def test_invalid_json_raises_value_error(text):
+    with pytest.raises(ValueError):
+        Transcript.from_json(text)
+
+
+def test_extend_is_atomic():
+    transcript = Transcript.from_entries(ENTRIES[:1])
+    version = transcript.version
+    with pytest.raises(ValueError):
+        transcript.extend([ENTRIES[1], {'start': 0}])
+    assert len(transcript) == 1
+    assert transcript.version == version
+
+
+def test_set_entry_replaces_extras_and_bumps_version():
+    transcript = Transcript.from_entries(ENTRIES)
+    version = transcript.version
+    transcript.set_entry(0, {'start': 0.0, 'end': 1.0, 'speaker': 'C', 'text': '変更', 'note': 'edited'})
+    assert transcript.entry(0) == {'start': 0.0, 'end': 1.0, 'speaker': 'C', 'text': '変更', 'note': 'edited'}
+    assert transcript.version > version
+    transcript.set_entry(0, {'start': 0.0, 'end': 1.0, 'speaker': 'C', 'text': '変更'})
+    assert 'note' not in transcript.entry(0)
+
+
+def test_set_entries_validates_all_before_applying():
+    transcript = Transcript.from_entries(ENTRIES)
+    version = transcript.version
+    with pytest.raises(ValueError):
+        transcript.set_entries([
+            (0, {'start': 0.0, 'end': 1.0, 'speaker': 'C', 'text': '変更'}),
+            (1, {'start': 'x', 'end': 1.0, 'text': '不正'}),
+            (2, {'start': 3.0, 'end': 4.0, 'speaker': 'D', 'text': '変更'}),
+        ])
+    assert transcript.to_entries() == ENTRIES
+    assert transcript.speakers == ['A', 'B']
+    assert transcript.version == version
+
+
+def test_copy_is_independent():
+    transcript = Transcript.from_entries(ENTRIES)
+    snapshot = transcript.copy()
+    transcript.set_entry(1, {'start': 9.0, 'end': 10.0, 'speaker': 'Z', 'text': '後から'})
+    transcript.rename_speaker('A', 'Alice')
+    assert snapshot.to_entries() == ENTRIES
+
+
+def test_merge_and_rename_speakers():
+    transcript = Transcript.from_entries(ENTRIES)
+    assert transcript.merge_speakers(['A', 'B'], 'Host') == 3
+    assert transcript.speakers == ['Host']
+    assert transcript.rename_speaker('missing', 'X') == 0
+    assert transcript.to_entries()[0]['confidence'] == 0.9
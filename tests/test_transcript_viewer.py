@@ -0,0 +1,74 @@
+import pytest
+
+from transcript_model import Transcript
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+transcript_viewer = pytest.importorskip("gui.widgets.result.transcript_viewer", exc_type=ImportError)
+
+
+def make_transcript(count):
+    return Transcript.from_entries([
+        {'start': i * 5.0, 'end': i * 5.0 + 4.0, 'speaker': 'AB'[i // 3 % 2], 'text': '発話 ' * (i % 7 + 1)}
+        for i in range(count)
+    ])
+
+
+def test_model_appends_rows_of_same_transcript(qapp):
+    model = transcript_viewer.TranscriptListModel()
+    transcript = make_transcript(3)
+    model.set_transcript(transcript)
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.modelReset.connect(lambda: inserted.append('reset'))
+    transcript.extend([{'start': 20.0, 'end': 21.0, 'speaker': 'A', 'text': '追加'}])
+    model.set_transcript(transcript)
+    assert inserted == [(3, 3)]
+    assert model.rowCount() == 4
+
+
+def test_model_update_rows_also_refreshes_next_row(qapp):
+    model = transcript_viewer.TranscriptListModel()
+    transcript = make_transcript(4)
+    model.set_transcript(transcript)
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+    model.update_rows(transcript, [1, 3])
+    assert changed == [1, 2, 3]
+
+
+def test_row_at_time(qapp):
+    model = transcript_viewer.TranscriptListModel()
+    model.set_transcript(make_transcript(10))
+    assert model.row_at_time(-1.0) == 0
+    assert model.row_at_time(12.0) == 2
+    assert model.row_at_time(1000.0) == 9
+
+
+def test_scroll_to_row_measures_only_visible_rows(qapp, monkeypatch):
+    measured = []
+    size_hint = transcript_viewer.UtteranceDelegate.sizeHint
+
+    def counting_size_hint(self, option, index):
+        measured.append(index.row())
+        return size_hint(self, option, index)
+
+    monkeypatch.setattr(transcript_viewer.UtteranceDelegate, 'sizeHint', counting_size_hint)
+    widget = transcript_viewer.TranscriptViewWidget()
+    widget.resize(500, 400)
+    widget.show()
+    widget.set_transcript(make_transcript(20000))
+    view = widget.list_view
+    view.setCurrentIndex(widget.model.index(0))
+    qapp.processEvents()
+
+    # 開始時刻が50000秒の発話（10000行目）へ、途中の行の高さを求めずに移動する
+    widget.scroll_to_time(50002.0)
+    qapp.processEvents()
+    assert view.currentIndex().row() == 10000
+    assert view.indexAt(view.viewport().rect().topLeft()).row() == 10000
+    widget.scroll_to_time(25000.0)
+    qapp.processEvents()
+    assert view.indexAt(view.viewport().rect().topLeft()).row() == 5000
+    assert view.selectionModel().selectedRows() == [widget.model.index(5000)]
+    assert len(set(measured)) < 200
+    widget.close()
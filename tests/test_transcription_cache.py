@@ -0,0 +1,63 @@
+import os
+
+from transcription_cache import TranscriptionCache
+
+
+def write_audio(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    return str(path)
+
+
+def set_last_used(cache, key, timestamp):
+    os.utime(cache._entry_path(key), (timestamp, timestamp))
+
+
+def test_key_depends_on_content_and_result_options(tmp_path):
+    a = write_audio(tmp_path / 'a.wav', b'audio')
+    b = write_audio(tmp_path / 'b.wav', b'audio')
+    c = write_audio(tmp_path / 'c.wav', b'other')
+    options = {'speaker_diarization': True, 'timestamp': True}
+    assert TranscriptionCache.make_key(a, options) == TranscriptionCache.make_key(b, options)
+    assert TranscriptionCache.make_key(a, options) != TranscriptionCache.make_key(c, options)
+    assert TranscriptionCache.make_key(a, options) != TranscriptionCache.make_key(a, {'timestamp': True})
+    # 結果に影響しないオプションと既定の言語はキーを変えない
+    assert TranscriptionCache.make_key(a, dict(options, use_cache=True, language='ja')) == \
+        TranscriptionCache.make_key(a, options)
+
+
+def test_put_and_get(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache'))
+    assert cache.get('missing') is None
+    cache.put('key', '[{"text": "こんにちは"}]', source='a.wav')
+    assert cache.get('key') == '[{"text": "こんにちは"}]'
+    assert cache.stats()['entries'] == 1
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache'))
+    for i, key in enumerate(['old', 'used', 'new']):
+        cache.put(key, 'x' * 100)
+        set_last_used(cache, key, 1000 + i)
+    # 古いエントリを読むと最終利用時刻が更新される
+    assert cache.get('old') is not None
+    set_last_used(cache, 'old', 2000)
+
+    # 3件分は収まり4件目で上限を超える大きさ（作成時刻の桁数でサイズが多少変わる）
+    entry_size = os.path.getsize(cache._entry_path('new'))
+    cache.max_size = entry_size * 3 + entry_size // 2
+    cache.put('newest', 'x' * 100)
+
+    assert cache.get('used') is None
+    assert cache.get('old') is not None
+    assert cache.get('new') is not None
+    assert cache.get('newest') is not None
+    assert cache.stats()['total_size'] <= cache.max_size
+
+
+def test_clear(tmp_path):
+    cache = TranscriptionCache(str(tmp_path / 'cache'))
+    cache.put('a', 'x')
+    cache.put('b', 'y')
+    cache.clear()
+    assert cache.stats()['entries'] == 0
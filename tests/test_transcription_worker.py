@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+
+import pytest
+
+from audio_splitter import AudioSplitter
+from job_journal import JobJournal
+from retry_policy import RetryPolicy
+from status_poller import AdaptivePollScheduler, StatusPoller
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+transcription_worker = pytest.importorskip("gui.transcription_worker", exc_type=ImportError)
+
+CHUNK_SECONDS = 60.0
+
+
+class FakeClient:
+    """ジョブの同時実行数を記録し、チャンクごとに1発話の結果を返すクライアント"""
+
+    def __init__(self):
+        self.retry_policy = RetryPolicy(max_attempts=1)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_mime_type(self, file_path):
+        return 'audio/wav'
+
+    def get_connection_stats(self, since=None):
+        return {'requests': 0, 'new_connections': 0, 'reused_connections': 0}
+
+    def create_transcription_job(self, filename, options):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # 他のチャンクと重なるよう少し待つ
+        time.sleep(0.05)
+        return {'transcription_id': filename, 'audio_upload_url': f'https://upload/{filename}'}
+
+    def upload_audio_file(self, upload_url, file_path, progress_callback=None):
+        return 200
+
+    def start_transcription(self, transcription_id):
+        pass
+
+    def get_transcription_status(self, transcription_id, max_attempts=None):
+        return {'status': 'COMPLETED', 'transcription_path': transcription_id}
+
+    def get_transcription_result(self, transcription_path):
+        with self._lock:
+            self.active -= 1
+        return json.dumps([{'start': 1.0, 'end': 2.0, 'speaker': 'A', 'text': transcription_path}])
+
+
+@pytest.fixture
+def make_worker(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(JobJournal, 'DEFAULT_DIR', str(tmp_path / 'jobs'))
+    source = tmp_path / 'meeting.wav'
+    source.write_bytes(b'audio')
+
+    def make(chunk_count, options):
+        chunks = []
+        for i in range(chunk_count):
+            path = tmp_path / f'chunk_{i}.wav'
+            path.write_bytes(b'chunk')
+            chunks.append((str(path), i * CHUNK_SECONDS, (i + 1) * CHUNK_SECONDS))
+        monkeypatch.setattr(AudioSplitter, 'get_audio_duration', staticmethod(lambda path: chunk_count))
+        monkeypatch.setattr(AudioSplitter, 'split_audio_ranges', staticmethod(lambda *args, **kwargs: chunks))
+
+        client = FakeClient()
+        worker = transcription_worker.TranscriptionWorker(client, str(source), options)
+        scheduler = AdaptivePollScheduler()
+        scheduler.MIN_INTERVAL = 0.01
+        worker.poller = StatusPoller(client, scheduler)
+        return worker, client
+
+    return make
+
+
+def collect(worker):
+    """ワーカーのシグナルを記録する"""
+    signals = {'partial': [], 'finished': [], 'error': []}
+    worker.partial_result.connect(lambda text: signals['partial'].extend(json.loads(text)))
+    worker.finished.connect(signals['finished'].append)
+    worker.error.connect(signals['error'].append)
+    return signals
+
+
+def test_chunks_run_concurrently_up_to_limit(make_worker, tmp_path):
+    worker, client = make_worker(5, {'max_concurrent_chunks': 2})
+    signals = collect(worker)
+    worker.run()
+    assert signals['error'] == []
+    assert client.peak == 2
+    # 完了順に関係なく元の順序で統合する
+    text = (tmp_path / 'meeting_transcript.txt').read_text(encoding='utf-8')
+    assert text.split('\n') == [f'chunk_{i}.wav' for i in range(5)]
+
+
+def test_partial_results_stream_in_order_past_missing_chunk(make_worker, tmp_path):
+    worker, client = make_worker(4, {'timestamp': True, 'max_concurrent_chunks': 4})
+    process_chunk = worker.process_chunk
+
+    def process_chunk_without_second(index, chunk_path, chunk_duration):
+        result = process_chunk(index, chunk_path, chunk_duration)
+        return None if index == 1 else result
+
+    worker.process_chunk = process_chunk_without_second
+    signals = collect(worker)
+    worker.run()
+    assert signals['error'] == []
+    assert signals['finished'] == ['']
+    assert [(entry['start'], entry['text']) for entry in signals['partial']] == [
+        (1.0, 'chunk_0.wav'), (121.0, 'chunk_2.wav'), (181.0, 'chunk_3.wav'),
+    ]
+    saved = json.loads((tmp_path / 'meeting_transcript.txt').read_text(encoding='utf-8'))
+    assert saved == signals['partial']
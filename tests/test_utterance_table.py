@@ -0,0 +1,55 @@
+import pytest
+
+from transcript_model import Transcript
+
+# gui パッケージの読み込みには PyQt6 と Qt WebEngine などが必要
+utterance_table = pytest.importorskip("gui.widgets.result.utterance_table", exc_type=ImportError)
+
+from PyQt6.QtCore import QModelIndex
+
+ENTRIES = [{'start': i * 2.0, 'end': i * 2.0 + 1.5, 'speaker': 'AB'[i % 2], 'text': f'発話{i}'} for i in range(5)]
+
+
+@pytest.fixture
+def model(qapp, monkeypatch):
+    monkeypatch.setattr(utterance_table.UtteranceTableModel, 'FETCH_SIZE', 2)
+    model = utterance_table.UtteranceTableModel()
+    model.set_transcript(Transcript.from_entries(ENTRIES))
+    return model
+
+
+def test_rows_are_fetched_in_batches(model):
+    assert model.rowCount() == 2
+    assert model.canFetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 5
+    assert not model.canFetchMore(QModelIndex())
+    # 同じ文字起こし結果に追加された発話は次の読み込みで表示する
+    model.transcript.extend([{'start': 10.0, 'end': 11.0, 'speaker': 'A', 'text': '追加'}])
+    model.set_transcript(model.transcript)
+    assert model.rowCount() == 5
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 6
+
+
+def test_set_data_updates_transcript_and_reports_row(model):
+    edited = []
+    model.rows_edited.connect(edited.append)
+    assert model.setData(model.index(1, utterance_table.COLUMN_TEXT), '変更')
+    assert model.setData(model.index(1, utterance_table.COLUMN_SPEAKER), '  C  ')
+    assert model.transcript.entry(1) == {'start': 2.0, 'end': 3.5, 'speaker': 'C', 'text': '変更'}
+    assert edited == [[1], [1]]
+    # 変更のない値は反映しない
+    assert not model.setData(model.index(1, utterance_table.COLUMN_TEXT), '変更')
+
+
+def test_set_data_rejects_invalid_values(model):
+    version = model.transcript.version
+    assert not model.setData(model.index(0, utterance_table.COLUMN_SPEAKER), '   ')
+    assert not model.setData(model.index(0, utterance_table.COLUMN_START), 5.0)
+    assert not model.setData(model.index(0, utterance_table.COLUMN_END), -1.0)
+    assert model.transcript.to_entries() == ENTRIES
+    assert model.transcript.version == version
+    assert model.setData(model.index(0, utterance_table.COLUMN_END), 1.0)
+    assert model.transcript.ends[0] == 1.0
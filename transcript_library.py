@@ -0,0 +1,268 @@
+import os
+import time
+import fnmatch
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional
+from moco_client import MIME_TYPES
+from transcript_model import Transcript
+
+# 取り込み対象とするファイル名のパターン
+TRANSCRIPT_PATTERNS = ('*_transcript.txt', '*.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    file_size INTEGER NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    audio_path TEXT,
+    audio_size INTEGER,
+    audio_mtime REAL,
+    duration REAL NOT NULL,
+    utterance_count INTEGER NOT NULL,
+    imported REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS speakers (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    name TEXT NOT NULL,
+    UNIQUE (source_id, name)
+);
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    position INTEGER NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    speaker_id INTEGER NOT NULL REFERENCES speakers(id),
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS utterances_source ON utterances (source_id, position);
+CREATE TRIGGER IF NOT EXISTS utterances_ai AFTER INSERT ON utterances BEGIN
+    INSERT INTO utterances_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS utterances_ad AFTER DELETE ON utterances BEGIN
+    INSERT INTO utterances_fts (utterances_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS utterances_au AFTER UPDATE ON utterances BEGIN
+    INSERT INTO utterances_fts (utterances_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO utterances_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+class TranscriptLibrary:
+    """文字起こし結果をSQLiteに取り込み、全文検索できるようにするライブラリ"""
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.mocovoice', 'library.db')
+    # trigramは3文字単位で索引を作るため、分かち書きのない日本語でも部分一致で検索できる
+    MIN_MATCH_LENGTH = 3
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or self.DEFAULT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self._init_schema()
+
+    def _init_schema(self):
+        """テーブルと全文検索インデックスを作成"""
+        with self.conn:
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5("
+                    "text, content='utterances', content_rowid='id', tokenize='trigram')"
+                )
+                self.trigram = True
+            except sqlite3.OperationalError:
+                # trigramに対応していない古いSQLiteでは空白区切りの索引で代用
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5("
+                    "text, content='utterances', content_rowid='id')"
+                )
+                self.trigram = False
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """データベースを閉じる"""
+        self.conn.close()
+
+    @staticmethod
+    def find_audio_file(transcript_path: str) -> Optional[str]:
+        """文字起こし結果と同じ名前の音声ファイルを探す"""
+        base = os.path.splitext(transcript_path)[0]
+        if base.endswith('_transcript'):
+            base = base[:-len('_transcript')]
+        for ext in MIME_TYPES:
+            candidate = base + ext
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _delete_source(self, source_id: int):
+        """取り込み済みの内容を削除（トランザクション内で呼ぶ）"""
+        self.conn.execute('DELETE FROM utterances WHERE source_id = ?', (source_id,))
+        self.conn.execute('DELETE FROM speakers WHERE source_id = ?', (source_id,))
+        self.conn.execute('DELETE FROM sources WHERE id = ?', (source_id,))
+
+    def import_file(self, path: str, transcript: Optional[Transcript] = None) -> bool:
+        """文字起こし結果を取り込む（前回から変更がなければ何もせずFalse）
+
+        JSONの形式が不正な場合はValueErrorを送出する。
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        row = self.conn.execute(
+            'SELECT id, file_size, file_mtime_ns FROM sources WHERE path = ?', (path,)
+        ).fetchone()
+        if row and row['file_size'] == stat.st_size and row['file_mtime_ns'] == stat.st_mtime_ns:
+            return False
+
+        if transcript is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                transcript = Transcript.from_json(f.read())
+
+        audio_path = self.find_audio_file(path)
+        audio_stat = os.stat(audio_path) if audio_path else None
+
+        with self.conn:
+            if row:
+                self._delete_source(row['id'])
+            source_id = self.conn.execute(
+                'INSERT INTO sources (path, file_size, file_mtime_ns, audio_path, audio_size, audio_mtime, '
+                'duration, utterance_count, imported) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (path, stat.st_size, stat.st_mtime_ns, audio_path,
+                 audio_stat.st_size if audio_stat else None,
+                 audio_stat.st_mtime if audio_stat else None,
+                 transcript.total_duration, len(transcript), time.time())
+            ).lastrowid
+
+            # 話者IDは文字起こし結果の話者IDから変換
+            speaker_ids = {}
+            for index, name in enumerate(transcript.speaker_names):
+                speaker_ids[index] = self.conn.execute(
+                    'INSERT INTO speakers (source_id, name) VALUES (?, ?)', (source_id, name)
+                ).lastrowid
+
+            self.conn.executemany(
+                'INSERT INTO utterances (source_id, position, start_time, end_time, speaker_id, text) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    (source_id, position, start, end, speaker_ids[speaker_id], text)
+                    for position, (start, end, speaker_id, text) in enumerate(zip(
+                        transcript.starts.tolist(), transcript.ends.tolist(),
+                        transcript.speaker_ids.tolist(), transcript.texts
+                    ))
+                )
+            )
+        return True
+
+    def import_paths(self, paths: Iterable[str],
+                     progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """複数のファイルを取り込み、件数を返す
+
+        パターンに一致しても文字起こし結果の形式でないファイル（他の用途のJSONなど）は
+        失敗に数えず ignored として数える。
+        """
+        paths = list(paths)
+        counts = {'imported': 0, 'skipped': 0, 'ignored': 0, 'failed': 0}
+        for i, path in enumerate(paths):
+            try:
+                counts['imported' if self.import_file(path) else 'skipped'] += 1
+            except ValueError:
+                counts['ignored'] += 1
+            except OSError as e:
+                counts['failed'] += 1
+                print(f"取り込みエラー: {path}: {str(e)}")
+            if progress_callback:
+                progress_callback(i + 1, len(paths), path)
+        return counts
+
+    @staticmethod
+    def find_transcripts(directory: str, patterns: Iterable[str] = TRANSCRIPT_PATTERNS) -> List[str]:
+        """フォルダ以下の文字起こし結果のファイルを探す"""
+        patterns = tuple(patterns)
+        found = []
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                    found.append(os.path.join(root, name))
+        return sorted(found)
+
+    def import_directory(self, directory: str,
+                         progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """フォルダ以下の文字起こし結果を取り込む（変更されたファイルのみ再索引）"""
+        counts = self.import_paths(self.find_transcripts(directory), progress_callback)
+        counts['removed'] = self.prune_missing()
+        return counts
+
+    def prune_missing(self) -> int:
+        """元のファイルが削除されたものをライブラリから削除"""
+        removed = 0
+        rows = self.conn.execute('SELECT id, path FROM sources').fetchall()
+        with self.conn:
+            for row in rows:
+                if not os.path.exists(row['path']):
+                    self._delete_source(row['id'])
+                    removed += 1
+        return removed
+
+    def search(self, query: str, limit: int = 200) -> List[Dict]:
+        """フレーズを含む発話を検索"""
+        terms = query.split()
+        if not terms:
+            return []
+
+        # 索引で引ける語はMATCH、短すぎる語はLIKEで絞り込む
+        min_length = self.MIN_MATCH_LENGTH if self.trigram else 1
+        match_terms = [term for term in terms if len(term) >= min_length]
+        like_terms = [term for term in terms if len(term) < min_length]
+
+        conditions = []
+        params: List = []
+        if match_terms:
+            conditions.append('utterances_fts MATCH ?')
+            params.append(' AND '.join('"{}"'.format(term.replace('"', '""')) for term in match_terms))
+        for term in like_terms:
+            conditions.append("u.text LIKE ? ESCAPE '\\'")
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f'%{escaped}%')
+
+        if match_terms:
+            sql = (
+                'SELECT u.start_time, u.end_time, u.position, u.text, sp.name AS speaker, '
+                's.path, s.audio_path FROM utterances_fts '
+                'JOIN utterances u ON u.id = utterances_fts.rowid '
+            )
+            order = 'ORDER BY bm25(utterances_fts)'
+        else:
+            sql = (
+                'SELECT u.start_time, u.end_time, u.position, u.text, sp.name AS speaker, '
+                's.path, s.audio_path FROM utterances u '
+            )
+            order = 'ORDER BY s.path, u.position'
+        sql += (
+            'JOIN speakers sp ON sp.id = u.speaker_id '
+            'JOIN sources s ON s.id = u.source_id '
+            f'WHERE {" AND ".join(conditions)} {order} LIMIT ?'
+        )
+        params.append(limit)
+
+        return [
+            {
+                'path': row['path'],
+                'audio_path': row['audio_path'],
+                'position': row['position'],
+                'start': row['start_time'],
+                'end': row['end_time'],
+                'speaker': row['speaker'],
+                'text': row['text']
+            }
+            for row in self.conn.execute(sql, params)
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """取り込み済みのファイル数と発話数を取得"""
+        row = self.conn.execute(
+            'SELECT COUNT(*) AS sources, COALESCE(SUM(utterance_count), 0) AS utterances FROM sources'
+        ).fetchone()
+        return {'sources': row['sources'], 'utterances': row['utterances']}
@@ -0,0 +1,192 @@
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+DEFAULT_SPEAKER = 'SPEAKER_01'
+ENTRY_KEYS = ('start', 'end', 'speaker', 'text')  # 列として保持するキー
+
+class Transcript:
+    """文字起こし結果を列ごとに保持するモデル
+
+    開始・終了時刻は数値配列、話者は小さな整数IDに置き換えて保持し、
+    発話のテキストだけを1つのリストに持つ。JSONの解析は読み込み時の1回だけにして、
+    表示・編集・分析の各ウィジェットはこのオブジェクトを共有する。
+    それ以外のキー（confidence など）は発話ごとの辞書に残し、書き出す時に元に戻す。
+    """
+    __slots__ = ('starts', 'ends', 'speaker_ids', 'texts', 'extras', 'speaker_names', '_speaker_index', 'version')
+
+    def __init__(self):
+        self.starts = np.empty(0, dtype=np.float64)
+        self.ends = np.empty(0, dtype=np.float64)
+        self.speaker_ids = np.empty(0, dtype=np.int32)
+        self.texts: List[str] = []
+        self.extras: List[Optional[Dict]] = []  # 列以外のキー（ない場合はNone）
+        self.speaker_names: List[str] = []  # 話者ID → 話者名
+        self._speaker_index: Dict[str, int] = {}  # 話者名 → 話者ID
+        self.version = 0  # 内容が変わるたびに増える
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Transcript':
+        """JSON文字列から作成（形式が不正な場合はValueError）"""
+        data = json.loads(text)
+        if not isinstance(data, list):
+            raise ValueError("文字起こし結果のJSONは発話の配列である必要があります")
+        return cls.from_entries(data)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict]) -> 'Transcript':
+        """発話の辞書のリストから作成"""
+        transcript = cls()
+        transcript.extend(entries)
+        return transcript
+
+    def copy(self) -> 'Transcript':
+        """複製を作成（テキストの文字列自体は共有）"""
+        transcript = Transcript()
+        transcript.starts = self.starts.copy()
+        transcript.ends = self.ends.copy()
+        transcript.speaker_ids = self.speaker_ids.copy()
+        transcript.texts = list(self.texts)
+        transcript.extras = list(self.extras)
+        transcript.speaker_names = list(self.speaker_names)
+        transcript._speaker_index = dict(self._speaker_index)
+        transcript.version = self.version
+        return transcript
+
+    def intern_speaker(self, speaker: str) -> int:
+        """話者名に対応するIDを取得（未登録なら追加）"""
+        speaker_id = self._speaker_index.get(speaker)
+        if speaker_id is None:
+            speaker_id = len(self.speaker_names)
+            self.speaker_names.append(speaker)
+            self._speaker_index[speaker] = speaker_id
+        return speaker_id
+
+    @staticmethod
+    def _validate_entry(item, position: int) -> Tuple[float, float, str, str, Optional[Dict]]:
+        """発話の辞書を検証して (開始, 終了, 話者, テキスト, その他のキー) を返す（不正な場合はValueError）"""
+        if not isinstance(item, dict):
+            raise ValueError(f"{position}番目の発話がオブジェクトではありません")
+        try:
+            start, end, text = item["start"], item["end"], item["text"]
+        except KeyError as e:
+            raise ValueError(f"{position}番目の発話に {e} がありません")
+        if isinstance(start, bool) or not isinstance(start, (int, float)):
+            raise ValueError(f"{position}番目の発話の start が数値ではありません")
+        if isinstance(end, bool) or not isinstance(end, (int, float)):
+            raise ValueError(f"{position}番目の発話の end が数値ではありません")
+        if not isinstance(text, str):
+            raise ValueError(f"{position}番目の発話の text が文字列ではありません")
+        extra = None
+        # 列のキーしかない発話（大半）は辞書を作らない
+        if len(item) > 3 + ("speaker" in item):
+            extra = {key: value for key, value in item.items() if key not in ENTRY_KEYS}
+        return start, end, str(item.get("speaker", DEFAULT_SPEAKER)), text, extra
+
+    def extend(self, entries: Iterable[Dict]):
+        """発話を末尾に追加（形式が不正な場合はValueError）"""
+        starts, ends, speaker_ids, texts, extras = [], [], [], [], []
+        offset = len(self.texts)
+        for i, item in enumerate(entries):
+            start, end, speaker, text, extra = self._validate_entry(item, offset + i + 1)
+            starts.append(start)
+            ends.append(end)
+            speaker_ids.append(self.intern_speaker(speaker))
+            texts.append(text)
+            extras.append(extra)
+
+        if not texts:
+            return
+        self.starts = np.concatenate((self.starts, np.asarray(starts, dtype=np.float64)))
+        self.ends = np.concatenate((self.ends, np.asarray(ends, dtype=np.float64)))
+        self.speaker_ids = np.concatenate((self.speaker_ids, np.asarray(speaker_ids, dtype=np.int32)))
+        self.texts.extend(texts)
+        self.extras.extend(extras)
+        self.version += 1
+
+    def set_entry(self, index: int, item: Dict):
+        """1つの発話を置き換える（形式が不正な場合はValueError）"""
+        self.set_entries([(index, item)])
+
+    def set_entries(self, items: Iterable[Tuple[int, Dict]]):
+        """(番号, 発話) の組で複数の発話を置き換える
+
+        すべての発話を検証してから反映するため、1つでも形式が不正な場合は
+        どの発話も変更せずにValueErrorを送出する。
+        """
+        validated = [(index, self._validate_entry(item, index + 1)) for index, item in items]
+        for index, (start, end, speaker, text, extra) in validated:
+            self.starts[index] = start
+            self.ends[index] = end
+            self.speaker_ids[index] = self.intern_speaker(speaker)
+            self.texts[index] = text
+            self.extras[index] = extra
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def speaker(self, index: int) -> str:
+        """発話の話者名を取得"""
+        return self.speaker_names[self.speaker_ids[index]]
+
+    def entry(self, index: int) -> Dict:
+        """発話を辞書として取得"""
+        entry = {
+            "start": float(self.starts[index]),
+            "end": float(self.ends[index]),
+            "speaker": self.speaker(index),
+            "text": self.texts[index]
+        }
+        if self.extras[index]:
+            entry.update(self.extras[index])
+        return entry
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self.texts)):
+            yield self.entry(index)
+
+    def to_entries(self) -> List[Dict]:
+        """発話の辞書のリストに変換"""
+        starts = self.starts.tolist()
+        ends = self.ends.tolist()
+        names = self.speaker_names
+        entries = [
+            {"start": start, "end": end, "speaker": names[speaker_id], "text": text}
+            for start, end, speaker_id, text in zip(starts, ends, self.speaker_ids.tolist(), self.texts)
+        ]
+        for entry, extra in zip(entries, self.extras):
+            if extra:
+                entry.update(extra)
+        return entries
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """JSON文字列に変換"""
+        return json.dumps(self.to_entries(), ensure_ascii=False, indent=indent)
+
+    @property
+    def speakers(self) -> List[str]:
+        """発話に登場する話者名（名前順）"""
+        used = np.unique(self.speaker_ids).tolist()
+        return sorted(self.speaker_names[speaker_id] for speaker_id in used)
+
+    @property
+    def total_duration(self) -> float:
+        """最後の発話の終了時刻（秒）"""
+        return float(self.ends.max()) if len(self.texts) else 0.0
+
+    def merge_speakers(self, old_names: Iterable[str], new_name: str) -> int:
+        """指定した話者の発話を新しい話者名にまとめ、変更した発話数を返す"""
+        old_ids = [self._speaker_index[name] for name in old_names if name in self._speaker_index]
+        if not old_ids:
+            return 0
+        mask = np.isin(self.speaker_ids, old_ids)
+        count = int(mask.sum())
+        if count:
+            self.speaker_ids[mask] = self.intern_speaker(new_name)
+            self.version += 1
+        return count
+
+    def rename_speaker(self, old_name: str, new_name: str) -> int:
+        """話者名を置換し、変更した発話数を返す"""
+        return self.merge_speakers([old_name], new_name)
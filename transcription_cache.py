@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+# 結果に影響するオプション（これ以外はキャッシュキーに含めない）
+CACHE_KEY_OPTIONS = ('language', 'speaker_diarization', 'timestamp', 'punctuation')
+
+class TranscriptionCache:
+    """音声の内容とオプションをキーにした文字起こし結果のディスクキャッシュ"""
+    DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.mocovoice', 'cache')
+    DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # 512MB
+    HASH_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        self.cache_dir = cache_dir or self.DEFAULT_DIR
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def make_key(cls, file_path: str, options: Optional[Dict] = None) -> str:
+        """音声ファイルの内容ハッシュとオプションからキーを生成"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(cls.HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+
+        options = options or {}
+        key_options = {name: options.get(name) for name in CACHE_KEY_OPTIONS}
+        key_options['language'] = key_options['language'] or 'ja'
+        digest.update(json.dumps(key_options, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def get(self, key: str) -> Optional[str]:
+        """キャッシュされた結果を取得（なければNone）"""
+        path = self._entry_path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            # 最終利用時刻を更新（LRUの判定に使用）
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+        return entry.get('result')
+
+    def put(self, key: str, result: str, source: str = ''):
+        """結果を保存し、上限を超えた分を古いものから削除"""
+        entry = {
+            'source': source,
+            'created': time.time(),
+            'result': result
+        }
+        path = self._entry_path(key)
+        temp_path = f'{path}.tmp'
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self._evict()
+
+    def list_entries(self) -> List[Dict]:
+        """キャッシュの一覧を最終利用が新しい順に取得"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append({
+                'key': name[:-len('.json')],
+                'size': stat.st_size,
+                'last_used': stat.st_mtime
+            })
+        entries.sort(key=lambda entry: entry['last_used'], reverse=True)
+        return entries
+
+    def stats(self) -> Dict[str, int]:
+        """件数と合計サイズを取得"""
+        entries = self.list_entries()
+        return {
+            'entries': len(entries),
+            'total_size': sum(entry['size'] for entry in entries),
+            'max_size': self.max_size
+        }
+
+    def _evict(self):
+        """合計サイズが上限を超えていれば最終利用が古いものから削除（ロック取得済みで呼ぶ）"""
+        entries = self.list_entries()
+        total_size = sum(entry['size'] for entry in entries)
+        while entries and total_size > self.max_size:
+            oldest = entries.pop()
+            try:
+                os.remove(self._entry_path(oldest['key']))
+            except OSError:
+                pass
+            total_size -= oldest['size']
+
+    def clear(self):
+        """キャッシュを全て削除"""
+        with self._lock:
+            for entry in self.list_entries():
+                try:
+                    os.remove(self._entry_path(entry['key']))
+                except OSError:
+                    pass